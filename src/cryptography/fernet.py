@@ -14,9 +14,10 @@ import six
 
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.backends.interfaces import CBCHMACBackend
 from cryptography.hazmat.primitives import hashes, padding
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from cryptography.hazmat.primitives.hmac import HMAC
+from cryptography.hazmat.primitives.hmac import HMACKey
 
 
 class InvalidToken(Exception):
@@ -40,6 +41,13 @@ class Fernet(object):
         self._signing_key = key[:16]
         self._encryption_key = key[16:]
         self._backend = backend
+        self._hmac_key = HMACKey(self._signing_key, hashes.SHA256(), backend)
+        self._cbc_hmac = (
+            isinstance(backend, CBCHMACBackend) and
+            backend.cbc_hmac_supported(
+                algorithms.AES(self._encryption_key), hashes.SHA256()
+            )
+        )
 
     @classmethod
     def generate_key(cls):
@@ -54,6 +62,17 @@ class Fernet(object):
         if not isinstance(data, bytes):
             raise TypeError("data must be bytes.")
 
+        if self._cbc_hmac:
+            # Pad, encrypt and MAC in one pass over a single buffer.
+            return base64.urlsafe_b64encode(self._backend.cbc_hmac_encrypt(
+                algorithms.AES(self._encryption_key),
+                iv,
+                self._signing_key,
+                hashes.SHA256(),
+                b"\x80" + struct.pack(">Q", current_time) + iv,
+                data
+            ))
+
         padder = padding.PKCS7(algorithms.AES.block_size).padder()
         padded_data = padder.update(data) + padder.finalize()
         encryptor = Cipher(
@@ -65,9 +84,7 @@ class Fernet(object):
             b"\x80" + struct.pack(">Q", current_time) + iv + ciphertext
         )
 
-        h = HMAC(self._signing_key, hashes.SHA256(), backend=self._backend)
-        h.update(basic_parts)
-        hmac = h.finalize()
+        hmac = self._hmac_key.mac(basic_parts)
         return base64.urlsafe_b64encode(basic_parts + hmac)
 
     def decrypt(self, token, ttl=None):
@@ -93,10 +110,8 @@ class Fernet(object):
                 raise InvalidToken
         if current_time + _MAX_CLOCK_SKEW < timestamp:
             raise InvalidToken
-        h = HMAC(self._signing_key, hashes.SHA256(), backend=self._backend)
-        h.update(data[:-32])
         try:
-            h.verify(data[-32:])
+            self._hmac_key.verify(data[:-32], data[-32:])
         except InvalidSignature:
             raise InvalidToken
 
@@ -74,16 +74,32 @@ class _CipherContext(object):
         self._ctx = ctx
 
     def update(self, data):
-        # Count bytes processed to handle block alignment.
-        self._bytes_processed += len(data)
+        in_buf = utils._from_buffer(self._backend._ffi, data)
         buf = self._backend._ffi.new(
-            "unsigned char[]", len(data) + self._byte_block_size - 1)
+            "unsigned char[]", len(in_buf) + self._byte_block_size - 1)
+        outlen = self._cryptor_update(in_buf, buf, len(buf))
+        return self._backend._ffi.buffer(buf)[:outlen]
+
+    def update_into(self, data, buf):
+        in_buf = utils._from_buffer(self._backend._ffi, data)
+        buf = utils._from_writable_buffer(self._backend._ffi, buf)
+        if len(buf) < len(in_buf) + self._byte_block_size - 1:
+            raise ValueError(
+                "buffer must be at least {0} bytes for this payload".format(
+                    len(in_buf) + self._byte_block_size - 1
+                )
+            )
+
+        return self._cryptor_update(in_buf, buf, len(buf))
+
+    def _cryptor_update(self, in_buf, buf, buf_len):
+        # Count bytes processed to handle block alignment.
+        self._bytes_processed += len(in_buf)
         outlen = self._backend._ffi.new("size_t *")
         res = self._backend._lib.CCCryptorUpdate(
-            self._ctx[0], data, len(data), buf,
-            len(data) + self._byte_block_size - 1, outlen)
+            self._ctx[0], in_buf, len(in_buf), buf, buf_len, outlen)
         self._backend._check_cipher_response(res)
-        return self._backend._ffi.buffer(buf)[:outlen[0]]
+        return outlen[0]
 
     def finalize(self):
         # Raise error if block alignment is wrong.
@@ -150,15 +166,32 @@ class _GCMCipherContext(object):
         self.authenticate_additional_data(b"")
 
     def update(self, data):
-        buf = self._backend._ffi.new("unsigned char[]", len(data))
-        args = (self._ctx[0], data, len(data), buf)
+        in_buf = utils._from_buffer(self._backend._ffi, data)
+        buf = self._backend._ffi.new("unsigned char[]", len(in_buf))
+        self._gcm_update(in_buf, buf)
+        return self._backend._ffi.buffer(buf)[:]
+
+    def update_into(self, data, buf):
+        in_buf = utils._from_buffer(self._backend._ffi, data)
+        buf = utils._from_writable_buffer(self._backend._ffi, buf)
+        if len(buf) < len(in_buf):
+            raise ValueError(
+                "buffer must be at least {0} bytes for this payload".format(
+                    len(in_buf)
+                )
+            )
+
+        self._gcm_update(in_buf, buf)
+        return len(in_buf)
+
+    def _gcm_update(self, in_buf, buf):
+        args = (self._ctx[0], in_buf, len(in_buf), buf)
         if self._operation == self._backend._lib.kCCEncrypt:
             res = self._backend._lib.CCCryptorGCMEncrypt(*args)
         else:
             res = self._backend._lib.CCCryptorGCMDecrypt(*args)
 
         self._backend._check_cipher_response(res)
-        return self._backend._ffi.buffer(buf)[:]
 
     def finalize(self):
         # CommonCrypto has a yet another bug where you must make at least one
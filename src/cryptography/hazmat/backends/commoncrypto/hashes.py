@@ -32,6 +32,11 @@ class _HashContext(object):
 
     algorithm = utils.read_only_property("_algorithm")
 
+    def reset(self):
+        methods = self._backend._hash_mapping[self.algorithm.name]
+        res = methods.hash_init(self._ctx)
+        assert res == 1
+
     def copy(self):
         methods = self._backend._hash_mapping[self.algorithm.name]
         new_ctx = self._backend._ffi.new(methods.ctx)
@@ -43,6 +48,8 @@ class _HashContext(object):
 
     def update(self, data):
         methods = self._backend._hash_mapping[self.algorithm.name]
+        if not isinstance(data, bytes):
+            data = utils._from_buffer(self._backend._ffi, data)
         res = methods.hash_update(self._ctx, data, len(data))
         assert res == 1
 
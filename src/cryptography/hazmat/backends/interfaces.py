@@ -30,6 +30,41 @@ class CipherBackend(object):
         """
 
 
+@six.add_metaclass(abc.ABCMeta)
+class AEADBackend(object):
+    @abc.abstractmethod
+    def aead_cipher_supported(self, cipher, mode):
+        """
+        Return True if the given cipher and mode class are supported for
+        one-shot authenticated encryption.
+        """
+
+    @abc.abstractmethod
+    def create_aead_ctx(self, cipher, mode):
+        """
+        Get an AEAD context keyed with the given cipher that can be reused to
+        encrypt and decrypt many messages.
+        """
+
+
+@six.add_metaclass(abc.ABCMeta)
+class CBCHMACBackend(object):
+    @abc.abstractmethod
+    def cbc_hmac_supported(self, cipher, algorithm):
+        """
+        Return True if the given block cipher and hash algorithm are supported
+        for combined CBC encryption and HMAC.
+        """
+
+    @abc.abstractmethod
+    def cbc_hmac_encrypt(self, cipher, iv, mac_key, algorithm,
+                         associated_data, data):
+        """
+        PKCS7 pad and encrypt data with cipher in CBC mode and return
+        associated_data, the ciphertext and the HMAC of both concatenated.
+        """
+
+
 @six.add_metaclass(abc.ABCMeta)
 class HashBackend(object):
     @abc.abstractmethod
@@ -45,6 +80,39 @@ class HashBackend(object):
         """
 
 
+@six.add_metaclass(abc.ABCMeta)
+class HashDigestBackend(object):
+    @abc.abstractmethod
+    def hash_digest(self, algorithm, data):
+        """
+        Return the digest of data in a single call, without creating a
+        HashContext.
+        """
+
+    @abc.abstractmethod
+    def hash_digest_many(self, algorithm, messages):
+        """
+        Return a list with the digest of each message in messages.
+        """
+
+
+@six.add_metaclass(abc.ABCMeta)
+class XOFBackend(object):
+    @abc.abstractmethod
+    def xof_supported(self, algorithm):
+        """
+        Return True if output of the extendable-output function can be
+        squeezed incrementally by this backend.
+        """
+
+    @abc.abstractmethod
+    def create_xof_ctx(self, algorithm):
+        """
+        Create an XOFContext for an extendable-output function that is
+        supported by xof_supported.
+        """
+
+
 @six.add_metaclass(abc.ABCMeta)
 class HMACBackend(object):
     @abc.abstractmethod
@@ -93,6 +161,16 @@ class PBKDF2HMACBackend(object):
         """
 
 
+@six.add_metaclass(abc.ABCMeta)
+class ScryptBackend(object):
+    @abc.abstractmethod
+    def derive_scrypt(self, key_material, salt, length, n, r, p, maxmem):
+        """
+        Return length bytes derived from provided scrypt parameters, using at
+        most maxmem bytes of memory.
+        """
+
+
 @six.add_metaclass(abc.ABCMeta)
 class RSABackend(object):
     @abc.abstractmethod
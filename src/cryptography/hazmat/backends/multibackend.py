@@ -9,25 +9,31 @@ import warnings
 from cryptography import utils
 from cryptography.exceptions import UnsupportedAlgorithm, _Reasons
 from cryptography.hazmat.backends.interfaces import (
-    CMACBackend, CipherBackend, DSABackend, EllipticCurveBackend, HMACBackend,
-    HashBackend, PBKDF2HMACBackend, PEMSerializationBackend,
-    PKCS8SerializationBackend, RSABackend,
-    TraditionalOpenSSLSerializationBackend, X509Backend
+    AEADBackend, CBCHMACBackend, CMACBackend, CipherBackend, DSABackend,
+    EllipticCurveBackend, HMACBackend, HashBackend, HashDigestBackend,
+    PBKDF2HMACBackend, PEMSerializationBackend, PKCS8SerializationBackend,
+    RSABackend, ScryptBackend, TraditionalOpenSSLSerializationBackend,
+    X509Backend, XOFBackend
 )
 
 
+@utils.register_interface(AEADBackend)
+@utils.register_interface(CBCHMACBackend)
 @utils.register_interface(CMACBackend)
 @utils.register_interface(CipherBackend)
 @utils.register_interface(HashBackend)
+@utils.register_interface(HashDigestBackend)
 @utils.register_interface(HMACBackend)
 @utils.register_interface(PBKDF2HMACBackend)
 @utils.register_interface(PKCS8SerializationBackend)
 @utils.register_interface(RSABackend)
+@utils.register_interface(ScryptBackend)
 @utils.register_interface(TraditionalOpenSSLSerializationBackend)
 @utils.register_interface(DSABackend)
 @utils.register_interface(EllipticCurveBackend)
 @utils.register_interface(PEMSerializationBackend)
 @utils.register_interface(X509Backend)
+@utils.register_interface(XOFBackend)
 class MultiBackend(object):
     name = "multibackend"
 
@@ -69,6 +75,45 @@ class MultiBackend(object):
             _Reasons.UNSUPPORTED_CIPHER
         )
 
+    def aead_cipher_supported(self, cipher, mode):
+        return any(
+            b.aead_cipher_supported(cipher, mode)
+            for b in self._filtered_backends(AEADBackend)
+        )
+
+    def create_aead_ctx(self, cipher, mode):
+        for b in self._filtered_backends(AEADBackend):
+            try:
+                return b.create_aead_ctx(cipher, mode)
+            except UnsupportedAlgorithm:
+                pass
+        raise UnsupportedAlgorithm(
+            "cipher {0} in {1} mode is not supported by this backend.".format(
+                cipher.name, mode.name if mode else mode),
+            _Reasons.UNSUPPORTED_CIPHER
+        )
+
+    def cbc_hmac_supported(self, cipher, algorithm):
+        return any(
+            b.cbc_hmac_supported(cipher, algorithm)
+            for b in self._filtered_backends(CBCHMACBackend)
+        )
+
+    def cbc_hmac_encrypt(self, cipher, iv, mac_key, algorithm,
+                         associated_data, data):
+        for b in self._filtered_backends(CBCHMACBackend):
+            try:
+                return b.cbc_hmac_encrypt(
+                    cipher, iv, mac_key, algorithm, associated_data, data
+                )
+            except UnsupportedAlgorithm:
+                pass
+        raise UnsupportedAlgorithm(
+            "{0} in CBC mode with HMAC-{1} is not supported by this "
+            "backend.".format(cipher.name, algorithm.name),
+            _Reasons.UNSUPPORTED_CIPHER
+        )
+
     def hash_supported(self, algorithm):
         return any(
             b.hash_supported(algorithm)
@@ -87,12 +132,63 @@ class MultiBackend(object):
             _Reasons.UNSUPPORTED_HASH
         )
 
+    def hash_digest(self, algorithm, data):
+        for b in self._filtered_backends(HashBackend):
+            if not b.hash_supported(algorithm):
+                continue
+            if isinstance(b, HashDigestBackend):
+                return b.hash_digest(algorithm, data)
+            ctx = b.create_hash_ctx(algorithm)
+            ctx.update(data)
+            return ctx.finalize()
+        raise UnsupportedAlgorithm(
+            "{0} is not a supported hash on this backend.".format(
+                algorithm.name),
+            _Reasons.UNSUPPORTED_HASH
+        )
+
+    def hash_digest_many(self, algorithm, messages):
+        for b in self._filtered_backends(HashBackend):
+            if not b.hash_supported(algorithm):
+                continue
+            if isinstance(b, HashDigestBackend):
+                return b.hash_digest_many(algorithm, messages)
+            digests = []
+            for message in messages:
+                ctx = b.create_hash_ctx(algorithm)
+                ctx.update(message)
+                digests.append(ctx.finalize())
+            return digests
+        raise UnsupportedAlgorithm(
+            "{0} is not a supported hash on this backend.".format(
+                algorithm.name),
+            _Reasons.UNSUPPORTED_HASH
+        )
+
     def hmac_supported(self, algorithm):
         return any(
             b.hmac_supported(algorithm)
             for b in self._filtered_backends(HMACBackend)
         )
 
+    def xof_supported(self, algorithm):
+        return any(
+            b.xof_supported(algorithm)
+            for b in self._filtered_backends(XOFBackend)
+        )
+
+    def create_xof_ctx(self, algorithm):
+        for b in self._filtered_backends(XOFBackend):
+            try:
+                return b.create_xof_ctx(algorithm)
+            except UnsupportedAlgorithm:
+                pass
+        raise UnsupportedAlgorithm(
+            "{0} is not a supported hash on this backend.".format(
+                algorithm.name),
+            _Reasons.UNSUPPORTED_HASH
+        )
+
     def create_hmac_ctx(self, key, algorithm):
         for b in self._filtered_backends(HMACBackend):
             try:
@@ -126,6 +222,17 @@ class MultiBackend(object):
             _Reasons.UNSUPPORTED_HASH
         )
 
+    def derive_scrypt(self, key_material, salt, length, n, r, p, maxmem):
+        for b in self._filtered_backends(ScryptBackend):
+            return b.derive_scrypt(
+                key_material, salt, length, n, r, p, maxmem
+            )
+
+        raise UnsupportedAlgorithm(
+            "This backend does not support scrypt.",
+            _Reasons.BACKEND_MISSING_INTERFACE
+        )
+
     def generate_rsa_private_key(self, public_exponent, key_size):
         for b in self._filtered_backends(RSABackend):
             return b.generate_rsa_private_key(public_exponent, key_size)
@@ -0,0 +1,148 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import threading
+
+from cryptography.exceptions import InvalidTag, UnsupportedAlgorithm, _Reasons
+
+
+class _AEADContext(object):
+    """
+    A keyed EVP_CIPHER_CTX for one-shot AEAD operations. The key schedule is
+    run once when the context is created; every message afterwards only sets
+    a new nonce on the same native context.
+    """
+    _ENCRYPT = 1
+    _DECRYPT = 0
+    _TAG_LENGTH = 16
+
+    def __init__(self, backend, cipher, mode):
+        self._backend = backend
+        self._cipher = cipher
+        self._mode = mode
+        self._nonce_length = None
+        self._lock = threading.Lock()
+
+        evp_cipher = self._backend._evp_cipher(cipher, mode)
+        if evp_cipher == self._backend._ffi.NULL:
+            raise UnsupportedAlgorithm(
+                "cipher {0} in {1} mode is not supported "
+                "by this backend.".format(
+                    cipher.name, mode.name if mode else mode),
+                _Reasons.UNSUPPORTED_CIPHER
+            )
+
+        ctx = self._backend._lib.EVP_CIPHER_CTX_new()
+        ctx = self._backend._ffi.gc(
+            ctx, self._backend._lib.EVP_CIPHER_CTX_free
+        )
+        res = self._backend._lib.EVP_CipherInit_ex(ctx, evp_cipher,
+                                                   self._backend._ffi.NULL,
+                                                   self._backend._ffi.NULL,
+                                                   self._backend._ffi.NULL,
+                                                   self._ENCRYPT)
+        assert res != 0
+        res = self._backend._lib.EVP_CIPHER_CTX_set_key_length(
+            ctx, len(cipher.key)
+        )
+        assert res != 0
+        res = self._backend._lib.EVP_CipherInit_ex(
+            ctx,
+            self._backend._ffi.NULL,
+            self._backend._ffi.NULL,
+            cipher.key,
+            self._backend._ffi.NULL,
+            self._ENCRYPT
+        )
+        assert res != 0
+        self._ctx = ctx
+
+    def encrypt(self, nonce, data, associated_data):
+        buf = self._backend._ffi.new(
+            "unsigned char[]", len(data) + self._TAG_LENGTH
+        )
+        outlen = self._backend._ffi.new("int *")
+        with self._lock:
+            self._set_nonce(nonce, self._ENCRYPT)
+            self._authenticate_additional_data(associated_data)
+            res = self._backend._lib.EVP_CipherUpdate(
+                self._ctx, buf, outlen, data, len(data)
+            )
+            assert res != 0
+            assert outlen[0] == len(data)
+            res = self._backend._lib.EVP_CipherFinal_ex(
+                self._ctx, buf + len(data), outlen
+            )
+            assert res != 0
+            assert outlen[0] == 0
+            res = self._backend._lib.EVP_CIPHER_CTX_ctrl(
+                self._ctx, self._backend._lib.EVP_CTRL_GCM_GET_TAG,
+                self._TAG_LENGTH, buf + len(data)
+            )
+            assert res != 0
+
+        return self._backend._ffi.buffer(buf)[:]
+
+    def decrypt(self, nonce, data, associated_data):
+        if len(data) < self._TAG_LENGTH:
+            raise InvalidTag
+
+        tag = data[-self._TAG_LENGTH:]
+        data = data[:-self._TAG_LENGTH]
+        buf = self._backend._ffi.new("unsigned char[]", len(data) + 1)
+        outlen = self._backend._ffi.new("int *")
+        with self._lock:
+            self._set_nonce(nonce, self._DECRYPT)
+            res = self._backend._lib.EVP_CIPHER_CTX_ctrl(
+                self._ctx, self._backend._lib.EVP_CTRL_GCM_SET_TAG,
+                len(tag), tag
+            )
+            assert res != 0
+            self._authenticate_additional_data(associated_data)
+            res = self._backend._lib.EVP_CipherUpdate(
+                self._ctx, buf, outlen, data, len(data)
+            )
+            assert res != 0
+            assert outlen[0] == len(data)
+            res = self._backend._lib.EVP_CipherFinal_ex(
+                self._ctx, buf + len(data), outlen
+            )
+            if res == 0:
+                self._backend._consume_errors()
+                raise InvalidTag
+
+        return self._backend._ffi.buffer(buf)[:len(data)]
+
+    def _set_nonce(self, nonce, operation):
+        # The GCM control codes have the same values as the generic
+        # EVP_CTRL_AEAD_* codes, which ChaCha20-Poly1305 uses as well.
+        if len(nonce) != self._nonce_length:
+            res = self._backend._lib.EVP_CIPHER_CTX_ctrl(
+                self._ctx, self._backend._lib.EVP_CTRL_GCM_SET_IVLEN,
+                len(nonce), self._backend._ffi.NULL
+            )
+            assert res != 0
+            self._nonce_length = len(nonce)
+
+        # Passing a NULL cipher and key keeps the existing key schedule and
+        # only resets the per-message state with the new nonce.
+        res = self._backend._lib.EVP_CipherInit_ex(
+            self._ctx,
+            self._backend._ffi.NULL,
+            self._backend._ffi.NULL,
+            self._backend._ffi.NULL,
+            nonce,
+            operation
+        )
+        assert res != 0
+
+    def _authenticate_additional_data(self, data):
+        if data:
+            outlen = self._backend._ffi.new("int *")
+            res = self._backend._lib.EVP_CipherUpdate(
+                self._ctx, self._backend._ffi.NULL, outlen, data, len(data)
+            )
+            assert res != 0
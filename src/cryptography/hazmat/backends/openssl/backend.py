@@ -16,13 +16,16 @@ from cryptography.exceptions import (
     InternalError, UnsupportedAlgorithm, _Reasons
 )
 from cryptography.hazmat.backends.interfaces import (
-    CMACBackend, CipherBackend, DSABackend, EllipticCurveBackend, HMACBackend,
-    HashBackend, PBKDF2HMACBackend, PEMSerializationBackend,
-    PKCS8SerializationBackend, RSABackend,
-    TraditionalOpenSSLSerializationBackend
+    AEADBackend, CBCHMACBackend, CMACBackend, CipherBackend, DSABackend,
+    EllipticCurveBackend, HMACBackend, HashBackend, HashDigestBackend,
+    PBKDF2HMACBackend, PEMSerializationBackend, PKCS8SerializationBackend,
+    RSABackend, ScryptBackend, TraditionalOpenSSLSerializationBackend,
+    XOFBackend
 )
+from cryptography.hazmat.backends.openssl.aead import _AEADContext
+from cryptography.hazmat.backends.openssl.cbc_hmac import _cbc_hmac_encrypt
 from cryptography.hazmat.backends.openssl.ciphers import (
-    _AESCTRCipherContext, _CipherContext
+    _AESCTRCipherContext, _CipherContext, _CipherContextPool
 )
 from cryptography.hazmat.backends.openssl.cmac import _CMACContext
 from cryptography.hazmat.backends.openssl.dsa import (
@@ -31,22 +34,27 @@ from cryptography.hazmat.backends.openssl.dsa import (
 from cryptography.hazmat.backends.openssl.ec import (
     _EllipticCurvePrivateKey, _EllipticCurvePublicKey
 )
-from cryptography.hazmat.backends.openssl.hashes import _HashContext
+from cryptography.hazmat.backends.openssl.hashes import (
+    _HashContext, _XOFContext, _digest_many
+)
 from cryptography.hazmat.backends.openssl.hmac import _HMACContext
 from cryptography.hazmat.backends.openssl.rsa import (
     _RSAPrivateKey, _RSAPublicKey
 )
 from cryptography.hazmat.bindings.openssl.binding import Binding
-from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives import hashes, interfaces
 from cryptography.hazmat.primitives.asymmetric import dsa, ec, rsa
 from cryptography.hazmat.primitives.asymmetric.padding import (
     MGF1, OAEP, PKCS1v15, PSS
 )
+from cryptography.hazmat.primitives.ciphers.aead import (
+    _ChaCha20Poly1305Algorithm
+)
 from cryptography.hazmat.primitives.ciphers.algorithms import (
     AES, ARC4, Blowfish, CAST5, Camellia, IDEA, SEED, TripleDES
 )
 from cryptography.hazmat.primitives.ciphers.modes import (
-    CBC, CFB, CFB8, CTR, ECB, GCM, OFB
+    CBC, CFB, CFB8, CTR, ECB, GCM, OFB, XTS
 )
 
 
@@ -54,18 +62,28 @@ _MemoryBIO = collections.namedtuple("_MemoryBIO", ["bio", "char_ptr"])
 _OpenSSLError = collections.namedtuple("_OpenSSLError",
                                        ["code", "lib", "func", "reason"])
 
+# PBKDF2 derivations with fewer iterations than this per output block run in
+# a single PKCS5_PBKDF2_HMAC call, where the cost of handing the blocks to the
+# thread pool would outweigh the gain.
+_PARALLEL_PBKDF2_MIN_ITERATIONS = 1000
+
 
+@utils.register_interface(AEADBackend)
+@utils.register_interface(CBCHMACBackend)
 @utils.register_interface(CipherBackend)
 @utils.register_interface(CMACBackend)
 @utils.register_interface(DSABackend)
 @utils.register_interface(EllipticCurveBackend)
 @utils.register_interface(HashBackend)
+@utils.register_interface(HashDigestBackend)
 @utils.register_interface(HMACBackend)
 @utils.register_interface(PBKDF2HMACBackend)
 @utils.register_interface(PKCS8SerializationBackend)
 @utils.register_interface(RSABackend)
+@utils.register_interface(ScryptBackend)
 @utils.register_interface(TraditionalOpenSSLSerializationBackend)
 @utils.register_interface(PEMSerializationBackend)
+@utils.register_interface(XOFBackend)
 class Backend(object):
     """
     OpenSSL API binding interfaces.
@@ -87,7 +105,10 @@ class Backend(object):
         self._lib.SSL_load_error_strings()
 
         self._cipher_registry = {}
+        self._evp_cipher_cache = {}
+        self._evp_md_cache = {}
         self._register_default_ciphers()
+        self._cipher_ctx_pool = _CipherContextPool()
         self.activate_osrandom_engine()
 
     def activate_builtin_random(self):
@@ -138,30 +159,136 @@ class Backend(object):
         return _HMACContext(self, key, algorithm)
 
     def hash_supported(self, algorithm):
-        digest = self._lib.EVP_get_digestbyname(algorithm.name.encode("ascii"))
-        return digest != self._ffi.NULL
+        return self._evp_md(algorithm) != self._ffi.NULL
+
+    def _evp_md(self, algorithm):
+        """
+        Returns the EVP_MD for a hash algorithm, or NULL if OpenSSL doesn't
+        know it. Successful lookups are cached so that the name table is only
+        searched once per algorithm.
+        """
+        if algorithm.name in ("blake2b", "blake2s"):
+            # OpenSSL names BLAKE2 digests by their output size in bits.
+            name = "{0}{1}".format(algorithm.name, algorithm.digest_size * 8)
+        else:
+            name = algorithm.name
+
+        try:
+            return self._evp_md_cache[name]
+        except KeyError:
+            pass
+
+        evp_md = self._lib.EVP_get_digestbyname(name.encode("ascii"))
+        if evp_md != self._ffi.NULL:
+            self._evp_md_cache[name] = evp_md
+        return evp_md
+
+    def _evp_cipher(self, cipher, mode):
+        """
+        Returns the EVP_CIPHER for a cipher and mode, or NULL if there is no
+        adapter for the combination or OpenSSL doesn't support it. ``mode``
+        may be a mode instance, a mode class or None. Successful lookups are
+        cached by cipher class, mode class and key size.
+        """
+        if isinstance(mode, type):
+            mode_cls = mode
+        else:
+            mode_cls = type(mode)
+
+        try:
+            adapter = self._cipher_registry[type(cipher), mode_cls]
+        except KeyError:
+            return self._ffi.NULL
+
+        cache_key = (type(cipher), mode_cls, cipher.key_size)
+        try:
+            return self._evp_cipher_cache[cache_key]
+        except KeyError:
+            pass
+
+        evp_cipher = adapter(self, cipher, mode)
+        if evp_cipher != self._ffi.NULL:
+            self._evp_cipher_cache[cache_key] = evp_cipher
+        return evp_cipher
+
+    def hash_digest(self, algorithm, data):
+        evp_md = self._evp_md_or_raise(algorithm)
+        if isinstance(algorithm, interfaces.ExtendableOutputFunction):
+            # EVP_Digest always produces the default output length.
+            ctx = _HashContext(self, algorithm)
+            ctx.update(data)
+            return ctx.finalize()
+
+        if not isinstance(data, bytes):
+            data = utils._from_buffer(self._ffi, data)
+        buf = self._ffi.new("unsigned char[]", algorithm.digest_size)
+        res = self._lib.EVP_Digest(
+            data, len(data), buf, self._ffi.NULL, evp_md, self._ffi.NULL
+        )
+        assert res != 0
+        return self._ffi.buffer(buf)[:]
+
+    def hash_digest_many(self, algorithm, messages):
+        evp_md = self._evp_md_or_raise(algorithm)
+        if isinstance(algorithm, interfaces.ExtendableOutputFunction):
+            return [self.hash_digest(algorithm, m) for m in messages]
+        return _digest_many(self, algorithm, evp_md, list(messages))
+
+    def _evp_md_or_raise(self, algorithm):
+        evp_md = self._evp_md(algorithm)
+        if evp_md == self._ffi.NULL:
+            raise UnsupportedAlgorithm(
+                "{0} is not a supported hash on this backend.".format(
+                    algorithm.name),
+                _Reasons.UNSUPPORTED_HASH
+            )
+        return evp_md
 
     def hmac_supported(self, algorithm):
+        if isinstance(algorithm, interfaces.ExtendableOutputFunction):
+            return False
         return self.hash_supported(algorithm)
 
     def create_hash_ctx(self, algorithm):
         return _HashContext(self, algorithm)
 
+    def xof_supported(self, algorithm):
+        # EVP_DigestFinalXOF can only be called once, so incremental output
+        # needs EVP_DigestSqueeze.
+        return (
+            self._lib.Cryptography_HAS_DIGEST_SQUEEZE == 1 and
+            isinstance(algorithm, interfaces.ExtendableOutputFunction) and
+            self.hash_supported(algorithm)
+        )
+
+    def create_xof_ctx(self, algorithm):
+        if not self.xof_supported(algorithm):
+            raise UnsupportedAlgorithm(
+                "{0} output cannot be squeezed incrementally by this "
+                "backend.".format(algorithm.name),
+                _Reasons.UNSUPPORTED_HASH
+            )
+        return _XOFContext(self, algorithm)
+
     def cipher_supported(self, cipher, mode):
-        if self._evp_cipher_supported(cipher, mode):
+        if isinstance(cipher, _ChaCha20Poly1305Algorithm):
+            return False
+        elif self._evp_cipher_supported(cipher, mode):
             return True
         elif isinstance(mode, CTR) and isinstance(cipher, AES):
             return True
         else:
             return False
 
+    def cipher_context_pool_info(self):
+        """
+        Returns a named tuple of (hits, misses, maxsize, currsize) describing
+        the pool of reusable cipher contexts.
+        """
+        return self._cipher_ctx_pool.info()
+
     def _evp_cipher_supported(self, cipher, mode):
-        try:
-            adapter = self._cipher_registry[type(cipher), type(mode)]
-        except KeyError:
-            return False
-        evp_cipher = adapter(self, cipher, mode)
-        return self._ffi.NULL != evp_cipher
+        return self._ffi.NULL != self._evp_cipher(cipher, mode)
 
     def register_cipher_adapter(self, cipher_cls, mode_cls, adapter):
         if (cipher_cls, mode_cls) in self._cipher_registry:
@@ -225,8 +352,16 @@ class Backend(object):
             GCM,
             GetCipherByName("{cipher.name}-{cipher.key_size}-{mode.name}")
         )
+        self.register_cipher_adapter(AES, XTS, _get_xts_cipher)
+        if self._lib.Cryptography_HAS_CHACHA20_POLY1305:
+            self.register_cipher_adapter(
+                _ChaCha20Poly1305Algorithm,
+                type(None),
+                _get_chacha20_poly1305_cipher
+            )
 
     def create_symmetric_encryption_ctx(self, cipher, mode):
+        self._check_not_aead_only(cipher)
         if (isinstance(mode, CTR) and isinstance(cipher, AES)
                 and not self._evp_cipher_supported(cipher, mode)):
             # This is needed to provide support for AES CTR mode in OpenSSL
@@ -237,6 +372,7 @@ class Backend(object):
             return _CipherContext(self, cipher, mode, _CipherContext._ENCRYPT)
 
     def create_symmetric_decryption_ctx(self, cipher, mode):
+        self._check_not_aead_only(cipher)
         if (isinstance(mode, CTR) and isinstance(cipher, AES)
                 and not self._evp_cipher_supported(cipher, mode)):
             # This is needed to provide support for AES CTR mode in OpenSSL
@@ -246,6 +382,53 @@ class Backend(object):
         else:
             return _CipherContext(self, cipher, mode, _CipherContext._DECRYPT)
 
+    def _check_not_aead_only(self, cipher):
+        # The ChaCha20Poly1305 adapter yields bare ChaCha20, which only
+        # _AEADContext pairs with the Poly1305 tag.
+        if isinstance(cipher, _ChaCha20Poly1305Algorithm):
+            raise UnsupportedAlgorithm(
+                "cipher {0} is only supported for one-shot AEAD.".format(
+                    cipher.name),
+                _Reasons.UNSUPPORTED_CIPHER
+            )
+
+    def aead_cipher_supported(self, cipher, mode):
+        if not (
+            (isinstance(cipher, AES) and mode is GCM) or
+            (isinstance(cipher, _ChaCha20Poly1305Algorithm) and mode is None)
+        ):
+            return False
+        return self._ffi.NULL != self._evp_cipher(cipher, mode)
+
+    def create_aead_ctx(self, cipher, mode):
+        if not self.aead_cipher_supported(cipher, mode):
+            raise UnsupportedAlgorithm(
+                "cipher {0} in {1} mode is not supported by this backend for "
+                "one-shot AEAD.".format(
+                    cipher.name, mode.name if mode else mode),
+                _Reasons.UNSUPPORTED_CIPHER
+            )
+        return _AEADContext(self, cipher, mode)
+
+    def cbc_hmac_supported(self, cipher, algorithm):
+        return (
+            isinstance(cipher, interfaces.BlockCipherAlgorithm) and
+            self._evp_cipher_supported(cipher, CBC) and
+            self.hmac_supported(algorithm)
+        )
+
+    def cbc_hmac_encrypt(self, cipher, iv, mac_key, algorithm,
+                         associated_data, data):
+        if not self.cbc_hmac_supported(cipher, algorithm):
+            raise UnsupportedAlgorithm(
+                "{0} in CBC mode with HMAC-{1} is not supported by this "
+                "backend.".format(cipher.name, algorithm.name),
+                _Reasons.UNSUPPORTED_CIPHER
+            )
+        return _cbc_hmac_encrypt(
+            self, cipher, iv, mac_key, algorithm, associated_data, data
+        )
+
     def pbkdf2_hmac_supported(self, algorithm):
         if self._lib.Cryptography_HAS_PBKDF2_HMAC:
             return self.hmac_supported(algorithm)
@@ -259,9 +442,18 @@ class Backend(object):
                            key_material):
         buf = self._ffi.new("char[]", length)
         if self._lib.Cryptography_HAS_PBKDF2_HMAC:
-            evp_md = self._lib.EVP_get_digestbyname(
-                algorithm.name.encode("ascii"))
+            evp_md = self._evp_md(algorithm)
             assert evp_md != self._ffi.NULL
+            blocks = -(-length // algorithm.digest_size)
+            # PKCS5_PBKDF2_HMAC is used unless the blocks can actually be
+            # derived on more than one thread.
+            if (blocks > 1 and
+                    iterations >= _PARALLEL_PBKDF2_MIN_ITERATIONS and
+                    utils._parallel_enabled()):
+                return self._derive_pbkdf2_hmac_blocks(
+                    evp_md, algorithm, length, salt, iterations,
+                    key_material, blocks
+                )
             res = self._lib.PKCS5_PBKDF2_HMAC(
                 key_material,
                 len(key_material),
@@ -293,6 +485,49 @@ class Backend(object):
 
         return self._ffi.buffer(buf)[:]
 
+    def _derive_pbkdf2_hmac_blocks(self, evp_md, algorithm, length, salt,
+                                   iterations, key_material, blocks):
+        # Each output block of PBKDF2 is computed independently of the
+        # others, so they are spread across the thread pool and written
+        # straight into their place in the output buffer.
+        digest_size = algorithm.digest_size
+        buf = self._ffi.new("unsigned char[]", blocks * digest_size)
+
+        def derive_block(i):
+            res = self._lib.Cryptography_PBKDF2_HMAC_block(
+                key_material,
+                len(key_material),
+                salt,
+                len(salt),
+                iterations,
+                evp_md,
+                i + 1,
+                buf + i * digest_size
+            )
+            assert res == 1
+
+        utils._parallel_map(derive_block, six.moves.range(blocks))
+        return self._ffi.buffer(buf)[:length]
+
+    def scrypt_supported(self):
+        return self._lib.Cryptography_HAS_SCRYPT == 1
+
+    def derive_scrypt(self, key_material, salt, length, n, r, p, maxmem):
+        if not self.scrypt_supported():
+            raise UnsupportedAlgorithm(
+                "This version of OpenSSL does not support scrypt."
+            )
+
+        buf = self._ffi.new("unsigned char[]", length)
+        res = self._lib.EVP_PBE_scrypt(
+            key_material, len(key_material), salt, len(salt), n, r, p,
+            maxmem, buf, length
+        )
+        if res != 1:
+            self._consume_errors()
+            raise MemoryError("Not enough memory to derive key.")
+        return self._ffi.buffer(buf)[:]
+
     def _err_string(self, code):
         err_buf = self._ffi.new("char[]", 256)
         self._lib.ERR_error_string_n(code, err_buf, 256)
@@ -1024,4 +1259,14 @@ class GetCipherByName(object):
         return backend._lib.EVP_get_cipherbyname(cipher_name.encode("ascii"))
 
 
+def _get_xts_cipher(backend, cipher, mode):
+    # XTS keys are two keys of the underlying cipher concatenated.
+    cipher_name = "aes-{0}-xts".format(cipher.key_size // 2)
+    return backend._lib.EVP_get_cipherbyname(cipher_name.encode("ascii"))
+
+
+def _get_chacha20_poly1305_cipher(backend, cipher, mode):
+    return backend._lib.EVP_chacha20_poly1305()
+
+
 backend = Backend()
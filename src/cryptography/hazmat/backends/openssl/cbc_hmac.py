@@ -0,0 +1,59 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import six
+
+from cryptography.hazmat.backends.openssl.ciphers import _CipherContext
+from cryptography.hazmat.backends.openssl.hmac import _HMACContext
+from cryptography.hazmat.primitives.ciphers.modes import CBC
+
+
+# The ciphertext is MACed in chunks of this size straight after they are
+# encrypted, while they are still in the CPU cache.
+_CHUNK_SIZE = 16 * 1024
+
+
+def _cbc_hmac_encrypt(backend, cipher, iv, mac_key, algorithm,
+                      associated_data, data):
+    """
+    Pads, encrypts and MACs data in a single output buffer. The plaintext is
+    copied in once and encrypted in place, so no intermediate padded,
+    ciphertext or concatenated byte strings are created.
+    """
+    block_size = cipher.block_size // 8
+    pad = block_size - len(data) % block_size
+    ad_len = len(associated_data)
+    ct_len = len(data) + pad
+    buf = backend._ffi.new(
+        "unsigned char[]", ad_len + ct_len + algorithm.digest_size
+    )
+    view = backend._ffi.buffer(buf)
+    view[0:ad_len] = associated_data
+    view[ad_len:ad_len + len(data)] = data
+    view[ad_len + len(data):ad_len + ct_len] = six.int2byte(pad) * pad
+
+    cipher_ctx = _CipherContext(
+        backend, cipher, CBC(iv), _CipherContext._ENCRYPT
+    )
+    hmac_ctx = _HMACContext(backend, mac_key, algorithm)
+    # The buffers below all point into buf, so each chunk is encrypted in
+    # place and MACed without being copied.
+    hmac_ctx.update(backend._ffi.buffer(buf, ad_len))
+
+    end = ad_len + ct_len
+    for start in six.moves.range(ad_len, end, _CHUNK_SIZE):
+        length = min(_CHUNK_SIZE, end - start)
+        chunk = backend._ffi.buffer(buf + start, length)
+        outlen = cipher_ctx.update_into(
+            chunk, backend._ffi.buffer(buf + start, len(view) - start)
+        )
+        assert outlen == length
+        hmac_ctx.update(chunk)
+
+    assert cipher_ctx.finalize() == b""
+
+    view[end:] = hmac_ctx.finalize()
+    return view[:]
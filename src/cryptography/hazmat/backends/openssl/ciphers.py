@@ -4,10 +4,108 @@
 
 from __future__ import absolute_import, division, print_function
 
+import binascii
+import collections
+import threading
+
 from cryptography import utils
 from cryptography.exceptions import InvalidTag, UnsupportedAlgorithm, _Reasons
 from cryptography.hazmat.primitives import interfaces
-from cryptography.hazmat.primitives.ciphers.modes import GCM
+from cryptography.hazmat.primitives.ciphers.modes import CTR, ECB, GCM, XTS
+
+
+_CipherContextPoolInfo = collections.namedtuple(
+    "CipherContextPoolInfo", ["hits", "misses", "maxsize", "currsize"]
+)
+
+
+class _CipherContextPool(object):
+    """
+    A bounded, thread-safe pool of keyed EVP_CIPHER_CTX objects.
+
+    Contexts are returned to the pool after a successful finalize and handed
+    out again for the same (cipher, mode, key, operation) combination, where
+    they only need to be re-IVed instead of going through the full key
+    schedule. When the pool is full the least recently used key is evicted.
+    """
+
+    def __init__(self, maxsize=64):
+        self._maxsize = maxsize
+        self._contexts = {}
+        self._last_used = {}
+        self._tick = 0
+        self._currsize = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(cipher, mode, operation):
+        """
+        Returns the pool key for a cipher context or None if contexts for
+        this combination must not be reused. Stream ciphers without an IV
+        (e.g. ARC4) can't be reset without redoing the key schedule.
+        """
+        if not isinstance(mode, (interfaces.ModeWithInitializationVector,
+                                 interfaces.ModeWithNonce,
+                                 interfaces.ModeWithTweak, ECB)):
+            return None
+
+        return (type(cipher), type(mode), cipher.key, operation)
+
+    def acquire(self, key):
+        with self._lock:
+            contexts = self._contexts.get(key)
+            if not contexts:
+                self._misses += 1
+                return None
+
+            self._hits += 1
+            self._currsize -= 1
+            ctx = contexts.pop()
+            if contexts:
+                self._touch(key)
+            else:
+                del self._contexts[key]
+                del self._last_used[key]
+            return ctx
+
+    def release(self, key, ctx):
+        with self._lock:
+            if self._maxsize <= 0:
+                return
+
+            if self._currsize >= self._maxsize:
+                self._evict()
+
+            self._contexts.setdefault(key, []).append(ctx)
+            self._currsize += 1
+            self._touch(key)
+
+    def clear(self):
+        with self._lock:
+            self._contexts.clear()
+            self._last_used.clear()
+            self._currsize = 0
+
+    def info(self):
+        with self._lock:
+            return _CipherContextPoolInfo(
+                self._hits, self._misses, self._maxsize, self._currsize
+            )
+
+    def _touch(self, key):
+        self._tick += 1
+        self._last_used[key] = self._tick
+
+    def _evict(self):
+        key = min(self._last_used, key=self._last_used.get)
+        contexts = self._contexts[key]
+        contexts.pop(0)
+        self._currsize -= 1
+        if not contexts:
+            del self._contexts[key]
+            del self._last_used[key]
 
 
 @utils.register_interface(interfaces.CipherContext)
@@ -16,6 +114,11 @@ from cryptography.hazmat.primitives.ciphers.modes import GCM
 class _CipherContext(object):
     _ENCRYPT = 1
     _DECRYPT = 0
+    # CTR updates at least this large are split into segments that are
+    # processed on a thread pool. Each segment is at least
+    # _PARALLEL_CTR_MIN_SEGMENT bytes.
+    _PARALLEL_CTR_THRESHOLD = 2 * 1024 * 1024
+    _PARALLEL_CTR_MIN_SEGMENT = 1024 * 1024
 
     def __init__(self, backend, cipher, mode, operation):
         self._backend = backend
@@ -23,29 +126,51 @@ class _CipherContext(object):
         self._mode = mode
         self._operation = operation
         self._tag = None
+        self._xts_updated = False
 
         if isinstance(self._cipher, interfaces.BlockCipherAlgorithm):
             self._block_size = self._cipher.block_size
+            self._block_size_bytes = self._cipher.block_size // 8
         else:
             self._block_size = 1
+            self._block_size_bytes = 1
+
+        if isinstance(mode, interfaces.ModeWithInitializationVector):
+            iv_nonce = mode.initialization_vector
+        elif isinstance(mode, interfaces.ModeWithNonce):
+            iv_nonce = mode.nonce
+        elif isinstance(mode, interfaces.ModeWithTweak):
+            iv_nonce = mode.tweak
+        else:
+            iv_nonce = self._backend._ffi.NULL
 
+        # The number of bytes processed so far. Only tracked for CTR mode
+        # with 128-bit block ciphers, which can be processed in parallel.
+        self._ctr_offset = None
+        if isinstance(mode, CTR) and self._block_size_bytes == 16:
+            self._ctr_offset = 0
+
+        pool = self._backend._cipher_ctx_pool
+        self._pool_key = pool.key_for(cipher, mode, operation)
+        ctx = None
+        if self._pool_key is not None:
+            ctx = pool.acquire(self._pool_key)
+
+        if ctx is not None:
+            self._ctx = self._reset_ctx(ctx, iv_nonce)
+        else:
+            self._ctx = self._create_ctx(iv_nonce)
+
+    def _create_ctx(self, iv_nonce):
+        cipher = self._cipher
+        mode = self._mode
+        operation = self._operation
         ctx = self._backend._lib.EVP_CIPHER_CTX_new()
         ctx = self._backend._ffi.gc(
             ctx, self._backend._lib.EVP_CIPHER_CTX_free
         )
 
-        registry = self._backend._cipher_registry
-        try:
-            adapter = registry[type(cipher), type(mode)]
-        except KeyError:
-            raise UnsupportedAlgorithm(
-                "cipher {0} in {1} mode is not supported "
-                "by this backend.".format(
-                    cipher.name, mode.name if mode else mode),
-                _Reasons.UNSUPPORTED_CIPHER
-            )
-
-        evp_cipher = adapter(self._backend, cipher, mode)
+        evp_cipher = self._backend._evp_cipher(cipher, mode)
         if evp_cipher == self._backend._ffi.NULL:
             raise UnsupportedAlgorithm(
                 "cipher {0} in {1} mode is not supported "
@@ -54,12 +179,6 @@ class _CipherContext(object):
                 _Reasons.UNSUPPORTED_CIPHER
             )
 
-        if isinstance(mode, interfaces.ModeWithInitializationVector):
-            iv_nonce = mode.initialization_vector
-        elif isinstance(mode, interfaces.ModeWithNonce):
-            iv_nonce = mode.nonce
-        else:
-            iv_nonce = self._backend._ffi.NULL
         # begin init with cipher and operation type
         res = self._backend._lib.EVP_CipherInit_ex(ctx, evp_cipher,
                                                    self._backend._ffi.NULL,
@@ -72,18 +191,7 @@ class _CipherContext(object):
             ctx, len(cipher.key)
         )
         assert res != 0
-        if isinstance(mode, GCM):
-            res = self._backend._lib.EVP_CIPHER_CTX_ctrl(
-                ctx, self._backend._lib.EVP_CTRL_GCM_SET_IVLEN,
-                len(iv_nonce), self._backend._ffi.NULL
-            )
-            assert res != 0
-            if operation == self._DECRYPT:
-                res = self._backend._lib.EVP_CIPHER_CTX_ctrl(
-                    ctx, self._backend._lib.EVP_CTRL_GCM_SET_TAG,
-                    len(mode.tag), mode.tag
-                )
-                assert res != 0
+        self._set_gcm_parameters(ctx, iv_nonce)
 
         # pass key/iv
         res = self._backend._lib.EVP_CipherInit_ex(
@@ -98,25 +206,166 @@ class _CipherContext(object):
         # We purposely disable padding here as it's handled higher up in the
         # API.
         self._backend._lib.EVP_CIPHER_CTX_set_padding(ctx, 0)
-        self._ctx = ctx
+        return ctx
+
+    def _reset_ctx(self, ctx, iv_nonce):
+        # A pooled context already holds the cipher, key schedule and padding
+        # setting. Initializing it with only an IV resets the per-message
+        # state (buffered data, counter position, GCM lengths).
+        self._set_gcm_parameters(ctx, iv_nonce)
+        res = self._backend._lib.EVP_CipherInit_ex(
+            ctx,
+            self._backend._ffi.NULL,
+            self._backend._ffi.NULL,
+            self._backend._ffi.NULL,
+            iv_nonce,
+            self._operation
+        )
+        assert res != 0
+        return ctx
+
+    def _set_gcm_parameters(self, ctx, iv_nonce):
+        if isinstance(self._mode, GCM):
+            res = self._backend._lib.EVP_CIPHER_CTX_ctrl(
+                ctx, self._backend._lib.EVP_CTRL_GCM_SET_IVLEN,
+                len(iv_nonce), self._backend._ffi.NULL
+            )
+            assert res != 0
+            if self._operation == self._DECRYPT:
+                res = self._backend._lib.EVP_CIPHER_CTX_ctrl(
+                    ctx, self._backend._lib.EVP_CTRL_GCM_SET_TAG,
+                    len(self._mode.tag), self._mode.tag
+                )
+                assert res != 0
 
     def update(self, data):
+        in_buf = utils._from_buffer(self._backend._ffi, data)
         # OpenSSL 0.9.8e has an assertion in its EVP code that causes it
         # to SIGABRT if you call update with an empty byte string. This can be
         # removed when we drop support for 0.9.8e (CentOS/RHEL 5). This branch
         # should be taken only when length is zero and mode is not GCM because
         # AES GCM can return improper tag values if you don't call update
-        # with empty plaintext when authenticating AAD for ...reasons.
-        if len(data) == 0 and not isinstance(self._mode, GCM):
+        # with empty plaintext when authenticating AAD for ...reasons. XTS
+        # also skips it so that _cipher_update rejects the empty data unit.
+        if len(in_buf) == 0 and not isinstance(self._mode, (GCM, XTS)):
             return b""
 
         buf = self._backend._ffi.new("unsigned char[]",
-                                     len(data) + self._block_size - 1)
+                                     len(in_buf) + self._block_size - 1)
+        outlen = self._cipher_update(in_buf, buf)
+        return self._backend._ffi.buffer(buf)[:outlen]
+
+    def update_into(self, data, buf):
+        in_buf = utils._from_buffer(self._backend._ffi, data)
+        # See update() for why empty input is special cased.
+        if len(in_buf) == 0 and not isinstance(self._mode, (GCM, XTS)):
+            return 0
+
+        buf = utils._from_writable_buffer(self._backend._ffi, buf)
+        if len(buf) < len(in_buf) + self._block_size_bytes - 1:
+            raise ValueError(
+                "buffer must be at least {0} bytes for this payload".format(
+                    len(in_buf) + self._block_size_bytes - 1
+                )
+            )
+
+        buf = self._backend._ffi.cast("unsigned char *", buf)
+        return self._cipher_update(in_buf, buf)
+
+    def _cipher_update(self, in_buf, buf):
+        length = len(in_buf)
+        if isinstance(self._mode, XTS):
+            self._check_xts_update(length)
+
+        if (self._ctr_offset is not None and
+                length >= self._PARALLEL_CTR_THRESHOLD and
+                utils._cpu_count() > 1):
+            return self._parallel_ctr_update(in_buf, length, buf)
+
+        outlen = self._update_pointers(self._ctx, in_buf, length, buf)
+        if self._ctr_offset is not None:
+            self._ctr_offset += outlen
+        return outlen
+
+    def _check_xts_update(self, length):
+        # OpenSSL applies the tweak from the start of every update call, so a
+        # data unit must be processed in one call and be at least one block.
+        if self._xts_updated:
+            raise ValueError(
+                "XTS mode requires each data unit to be passed in a single "
+                "update call."
+            )
+        if length < self._block_size_bytes:
+            raise ValueError(
+                "XTS mode requires at least {0} bytes of data.".format(
+                    self._block_size_bytes
+                )
+            )
+        self._xts_updated = True
+
+    def _update_pointers(self, ctx, in_ptr, in_len, out_ptr):
         outlen = self._backend._ffi.new("int *")
-        res = self._backend._lib.EVP_CipherUpdate(self._ctx, buf, outlen, data,
-                                                  len(data))
+        res = self._backend._lib.EVP_CipherUpdate(
+            ctx, out_ptr, outlen, in_ptr, in_len
+        )
         assert res != 0
-        return self._backend._ffi.buffer(buf)[:outlen[0]]
+        return outlen[0]
+
+    def _parallel_ctr_update(self, in_buf, length, buf):
+        in_ptr = self._backend._ffi.cast("unsigned char *", in_buf)
+
+        # Finish a partially consumed counter block on this context so that
+        # every segment starts on a block boundary.
+        head = -self._ctr_offset % 16
+        if head:
+            self._update_pointers(self._ctx, in_ptr, head, buf)
+
+        first_block = (self._ctr_offset + head) // 16
+        remaining = length - head
+        workers = max(1, min(
+            utils._cpu_count(), remaining // self._PARALLEL_CTR_MIN_SEGMENT
+        ))
+        segment_size = -(-remaining // workers)
+        segment_size += -segment_size % 16
+
+        def process(start):
+            seglen = min(segment_size, length - start)
+            ctx = _CipherContext(
+                self._backend,
+                self._cipher,
+                CTR(self._counter_block(first_block + (start - head) // 16)),
+                self._operation
+            )
+            ctx._update_pointers(ctx._ctx, in_ptr + start, seglen, buf + start)
+            ctx.finalize()
+
+        utils._parallel_map(process, range(head, length, segment_size))
+
+        self._ctr_offset += length
+        self._seek_ctr(self._ctr_offset)
+        return length
+
+    def _counter_block(self, blocks):
+        counter = int(binascii.hexlify(self._mode.nonce), 16)
+        counter = (counter + blocks) % (1 << 128)
+        return binascii.unhexlify("{0:032x}".format(counter).encode("ascii"))
+
+    def _seek_ctr(self, offset):
+        # Re-IV this context so it continues the keystream at offset. Bytes
+        # already consumed from the current counter block are discarded.
+        res = self._backend._lib.EVP_CipherInit_ex(
+            self._ctx,
+            self._backend._ffi.NULL,
+            self._backend._ffi.NULL,
+            self._backend._ffi.NULL,
+            self._counter_block(offset // 16),
+            self._operation
+        )
+        assert res != 0
+        skip = offset % 16
+        if skip:
+            scratch = self._backend._ffi.new("unsigned char[]", skip)
+            self._update_pointers(self._ctx, scratch, skip, scratch)
 
     def finalize(self):
         # OpenSSL 1.0.1 on Ubuntu 12.04 (and possibly other distributions)
@@ -167,8 +416,11 @@ class _CipherContext(object):
             assert res != 0
             self._tag = self._backend._ffi.buffer(tag_buf)[:]
 
-        res = self._backend._lib.EVP_CIPHER_CTX_cleanup(self._ctx)
-        assert res == 1
+        if self._pool_key is not None:
+            self._backend._cipher_ctx_pool.release(self._pool_key, self._ctx)
+        else:
+            res = self._backend._lib.EVP_CIPHER_CTX_cleanup(self._ctx)
+            assert res == 1
         return self._backend._ffi.buffer(buf)[:outlen[0]]
 
     def authenticate_additional_data(self, data):
@@ -201,13 +453,30 @@ class _AESCTRCipherContext(object):
         self._num = self._backend._ffi.new("unsigned int *", 0)
 
     def update(self, data):
-        buf = self._backend._ffi.new("unsigned char[]", len(data))
+        in_buf = utils._from_buffer(self._backend._ffi, data)
+        buf = self._backend._ffi.new("unsigned char[]", len(in_buf))
         self._backend._lib.AES_ctr128_encrypt(
-            data, buf, len(data), self._key, self._nonce,
+            in_buf, buf, len(in_buf), self._key, self._nonce,
             self._ecount, self._num
         )
         return self._backend._ffi.buffer(buf)[:]
 
+    def update_into(self, data, buf):
+        in_buf = utils._from_buffer(self._backend._ffi, data)
+        buf = utils._from_writable_buffer(self._backend._ffi, buf)
+        if len(buf) < len(in_buf):
+            raise ValueError(
+                "buffer must be at least {0} bytes for this payload".format(
+                    len(in_buf)
+                )
+            )
+
+        self._backend._lib.AES_ctr128_encrypt(
+            in_buf, self._backend._ffi.cast("unsigned char *", buf),
+            len(in_buf), self._key, self._nonce, self._ecount, self._num
+        )
+        return len(in_buf)
+
     def finalize(self):
         self._key = None
         self._ecount = None
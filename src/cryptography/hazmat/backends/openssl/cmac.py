@@ -9,6 +9,7 @@ from cryptography import utils
 from cryptography.exceptions import (
     InvalidSignature, UnsupportedAlgorithm, _Reasons
 )
+from cryptography.hazmat.backends.openssl.utils import _mac_many
 from cryptography.hazmat.primitives import constant_time, interfaces
 from cryptography.hazmat.primitives.ciphers.modes import CBC
 
@@ -26,10 +27,7 @@ class _CMACContext(object):
         self._output_length = algorithm.block_size // 8
 
         if ctx is None:
-            registry = self._backend._cipher_registry
-            adapter = registry[type(algorithm), CBC]
-
-            evp_cipher = adapter(self._backend, algorithm, CBC)
+            evp_cipher = self._backend._evp_cipher(algorithm, CBC)
 
             ctx = self._backend._lib.CMAC_CTX_new()
 
@@ -74,6 +72,21 @@ class _CMACContext(object):
             self._backend, self._algorithm, ctx=copied_ctx
         )
 
+    def mac(self, data):
+        return self.mac_many([data])[0]
+
+    def mac_many(self, messages):
+        return _mac_many(
+            self._backend, self._backend._lib.Cryptography_CMAC_CTX_mac_many,
+            self._ctx, self._output_length, messages
+        )
+
+    def verify_many(self, messages, signatures):
+        return _mac_many(
+            self._backend, self._backend._lib.Cryptography_CMAC_CTX_mac_many,
+            self._ctx, self._output_length, messages, signatures
+        )
+
     def verify(self, signature):
         digest = self.finalize()
         if not constant_time.bytes_eq(digest, signature):
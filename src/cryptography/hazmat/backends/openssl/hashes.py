@@ -21,8 +21,7 @@ class _HashContext(object):
             ctx = self._backend._lib.EVP_MD_CTX_create()
             ctx = self._backend._ffi.gc(ctx,
                                         self._backend._lib.EVP_MD_CTX_destroy)
-            evp_md = self._backend._lib.EVP_get_digestbyname(
-                algorithm.name.encode("ascii"))
+            evp_md = self._backend._evp_md(algorithm)
             if evp_md == self._backend._ffi.NULL:
                 raise UnsupportedAlgorithm(
                     "{0} is not a supported hash on this backend.".format(
@@ -35,6 +34,15 @@ class _HashContext(object):
 
         self._ctx = ctx
 
+    def reset(self):
+        # Initializing a context with the digest it already uses keeps its
+        # existing digest state allocation.
+        res = self._backend._lib.EVP_DigestInit_ex(
+            self._ctx, self._backend._evp_md(self.algorithm),
+            self._backend._ffi.NULL
+        )
+        assert res != 0
+
     algorithm = utils.read_only_property("_algorithm")
 
     def copy(self):
@@ -47,16 +55,108 @@ class _HashContext(object):
         return _HashContext(self._backend, self.algorithm, ctx=copied_ctx)
 
     def update(self, data):
+        if not isinstance(data, bytes):
+            data = utils._from_buffer(self._backend._ffi, data)
         res = self._backend._lib.EVP_DigestUpdate(self._ctx, data, len(data))
         assert res != 0
 
     def finalize(self):
+        if isinstance(self.algorithm, interfaces.ExtendableOutputFunction):
+            return self._finalize_xof()
+
         buf = self._backend._ffi.new("unsigned char[]",
                                      self._backend._lib.EVP_MAX_MD_SIZE)
         outlen = self._backend._ffi.new("unsigned int *")
         res = self._backend._lib.EVP_DigestFinal_ex(self._ctx, buf, outlen)
         assert res != 0
         assert outlen[0] == self.algorithm.digest_size
-        res = self._backend._lib.EVP_MD_CTX_cleanup(self._ctx)
-        assert res == 1
+        # EVP_DigestFinal_ex already scrubs the digest state. It is left
+        # allocated so that reset() can reuse it, and is released when the
+        # context is garbage collected.
         return self._backend._ffi.buffer(buf)[:outlen[0]]
+
+    def _finalize_xof(self):
+        buf = self._backend._ffi.new("unsigned char[]",
+                                     self.algorithm.digest_size)
+        res = self._backend._lib.EVP_DigestFinalXOF(
+            self._ctx, buf, self.algorithm.digest_size
+        )
+        assert res != 0
+        return self._backend._ffi.buffer(buf)[:]
+
+
+@utils.register_interface(interfaces.XOFContext)
+class _XOFContext(object):
+    def __init__(self, backend, algorithm, ctx=None):
+        self._algorithm = algorithm
+
+        self._backend = backend
+
+        if ctx is None:
+            ctx = _HashContext(backend, algorithm)
+
+        self._hash_ctx = ctx
+
+    algorithm = utils.read_only_property("_algorithm")
+
+    def update(self, data):
+        self._hash_ctx.update(data)
+
+    def copy(self):
+        return _XOFContext(self._backend, self.algorithm,
+                           ctx=self._hash_ctx.copy())
+
+    def squeeze_into(self, buf):
+        buf = utils._from_writable_buffer(self._backend._ffi, buf)
+        if len(buf) == 0:
+            return 0
+
+        res = self._backend._lib.EVP_DigestSqueeze(
+            self._hash_ctx._ctx,
+            self._backend._ffi.cast("unsigned char *", buf),
+            len(buf)
+        )
+        assert res != 0
+        return len(buf)
+
+
+# Batches with at least this many bytes in total are split across the
+# thread pool.
+_PARALLEL_DIGEST_THRESHOLD = 1024 * 1024
+
+
+def _digest_many(backend, algorithm, evp_md, messages):
+    workers = utils._cpu_count()
+    total = sum(len(message) for message in messages)
+    if total < _PARALLEL_DIGEST_THRESHOLD or workers <= 1:
+        return _digest_batch(backend, algorithm, evp_md, messages)
+
+    size = -(-len(messages) // workers)
+    batches = utils._parallel_map(
+        lambda batch: _digest_batch(backend, algorithm, evp_md, batch),
+        [messages[i:i + size] for i in range(0, len(messages), size)]
+    )
+    return [digest for batch in batches for digest in batch]
+
+
+def _digest_batch(backend, algorithm, evp_md, messages):
+    if not messages:
+        return []
+
+    ctx = backend._lib.EVP_MD_CTX_create()
+    ctx = backend._ffi.gc(ctx, backend._lib.EVP_MD_CTX_destroy)
+    # The buffers must stay referenced until the digests are computed.
+    buffers = [utils._from_buffer(backend._ffi, m) for m in messages]
+    data = backend._ffi.new("const void *[]", buffers)
+    lengths = backend._ffi.new("size_t[]", [len(b) for b in buffers])
+    digest_size = algorithm.digest_size
+    out = backend._ffi.new("unsigned char[]", len(messages) * digest_size)
+    res = backend._lib.Cryptography_EVP_Digest_many(
+        ctx, evp_md, data, lengths, len(messages), out
+    )
+    assert res != 0
+    digests = backend._ffi.buffer(out)[:]
+    return [
+        digests[i:i + digest_size]
+        for i in range(0, len(digests), digest_size)
+    ]
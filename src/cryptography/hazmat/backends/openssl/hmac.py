@@ -9,6 +9,7 @@ from cryptography import utils
 from cryptography.exceptions import (
     InvalidSignature, UnsupportedAlgorithm, _Reasons
 )
+from cryptography.hazmat.backends.openssl.utils import _mac_many
 from cryptography.hazmat.primitives import constant_time, interfaces
 
 
@@ -25,8 +26,7 @@ class _HMACContext(object):
             ctx = self._backend._ffi.gc(
                 ctx, self._backend._lib.HMAC_CTX_cleanup
             )
-            evp_md = self._backend._lib.EVP_get_digestbyname(
-                algorithm.name.encode('ascii'))
+            evp_md = self._backend._evp_md(algorithm)
             if evp_md == self._backend._ffi.NULL:
                 raise UnsupportedAlgorithm(
                     "{0} is not a supported hash on this backend.".format(
@@ -58,8 +58,9 @@ class _HMACContext(object):
         )
 
     def update(self, data):
+        in_buf = utils._from_buffer(self._backend._ffi, data)
         res = self._backend._lib.Cryptography_HMAC_Update(
-            self._ctx, data, len(data)
+            self._ctx, in_buf, len(in_buf)
         )
         assert res != 0
 
@@ -75,6 +76,31 @@ class _HMACContext(object):
         self._backend._lib.HMAC_CTX_cleanup(self._ctx)
         return self._backend._ffi.buffer(buf)[:outlen[0]]
 
+    def mac(self, data):
+        # Copies this context onto the C stack, MACs data with the copy and
+        # leaves this context untouched, so it can serve as a keyed template.
+        buf = self._backend._ffi.new("unsigned char[]",
+                                     self._backend._lib.EVP_MAX_MD_SIZE)
+        outlen = self._backend._ffi.new("unsigned int *")
+        res = self._backend._lib.Cryptography_HMAC_CTX_copy_mac(
+            self._ctx, data, len(data), buf, outlen
+        )
+        assert res != 0
+        assert outlen[0] == self.algorithm.digest_size
+        return self._backend._ffi.buffer(buf)[:outlen[0]]
+
+    def mac_many(self, messages):
+        return _mac_many(
+            self._backend, self._backend._lib.Cryptography_HMAC_CTX_mac_many,
+            self._ctx, self.algorithm.digest_size, messages
+        )
+
+    def verify_many(self, messages, signatures):
+        return _mac_many(
+            self._backend, self._backend._lib.Cryptography_HMAC_CTX_mac_many,
+            self._ctx, self.algorithm.digest_size, messages, signatures
+        )
+
     def verify(self, signature):
         digest = self.finalize()
         if not constant_time.bytes_eq(digest, signature):
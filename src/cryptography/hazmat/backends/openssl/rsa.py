@@ -204,8 +204,7 @@ class _RSASignatureContext(object):
         self._hash_ctx.update(data)
 
     def finalize(self):
-        evp_md = self._backend._lib.EVP_get_digestbyname(
-            self._algorithm.name.encode("ascii"))
+        evp_md = self._backend._evp_md(self._algorithm)
         assert evp_md != self._backend._ffi.NULL
 
         return self._finalize_method(evp_md)
@@ -239,8 +238,8 @@ class _RSASignatureContext(object):
 
             if self._backend._lib.Cryptography_HAS_MGF1_MD:
                 # MGF1 MD is configurable in OpenSSL 1.0.1+
-                mgf1_md = self._backend._lib.EVP_get_digestbyname(
-                    self._padding._mgf._algorithm.name.encode("ascii"))
+                mgf1_md = self._backend._evp_md(
+                    self._padding._mgf._algorithm)
                 assert mgf1_md != self._backend._ffi.NULL
                 res = self._backend._lib.EVP_PKEY_CTX_set_rsa_mgf1_md(
                     pkey_ctx, mgf1_md
@@ -395,8 +394,7 @@ class _RSAVerificationContext(object):
         self._hash_ctx.update(data)
 
     def verify(self):
-        evp_md = self._backend._lib.EVP_get_digestbyname(
-            self._algorithm.name.encode("ascii"))
+        evp_md = self._backend._evp_md(self._algorithm)
         assert evp_md != self._backend._ffi.NULL
 
         self._verify_method(evp_md)
@@ -429,8 +427,8 @@ class _RSAVerificationContext(object):
             assert res > 0
             if self._backend._lib.Cryptography_HAS_MGF1_MD:
                 # MGF1 MD is configurable in OpenSSL 1.0.1+
-                mgf1_md = self._backend._lib.EVP_get_digestbyname(
-                    self._padding._mgf._algorithm.name.encode("ascii"))
+                mgf1_md = self._backend._evp_md(
+                    self._padding._mgf._algorithm)
                 assert mgf1_md != self._backend._ffi.NULL
                 res = self._backend._lib.EVP_PKEY_CTX_set_rsa_mgf1_md(
                     pkey_ctx, mgf1_md
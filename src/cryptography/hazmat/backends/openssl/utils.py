@@ -6,6 +6,8 @@ from __future__ import absolute_import, division, print_function
 
 import six
 
+from cryptography import utils
+
 
 def _truncate_digest(digest, order_bits):
     digest_len = len(digest)
@@ -24,3 +26,37 @@ def _truncate_digest(digest, order_bits):
         digest = digest[:-1] + six.int2byte(six.indexbytes(digest, -1) & mask)
 
     return digest
+
+
+def _mac_many(backend, func, ctx, mac_size, messages, signatures=None):
+    """
+    Runs one of the Cryptography_*_CTX_mac_many bindings over messages. With
+    signatures it returns whether each message matches its signature,
+    otherwise the MACs.
+    """
+    if not messages:
+        return []
+
+    ffi = backend._ffi
+    # The buffers must stay referenced until the C loop has run.
+    buffers = [utils._from_buffer(ffi, m) for m in messages]
+    data = ffi.new("const void *[]", buffers)
+    lengths = ffi.new("size_t[]", [len(b) for b in buffers])
+    if signatures is None:
+        tags = tag_lengths = ffi.NULL
+        out = ffi.new("unsigned char[]", len(messages) * mac_size)
+    else:
+        tag_buffers = [utils._from_buffer(ffi, s) for s in signatures]
+        tags = ffi.new("const void *[]", tag_buffers)
+        tag_lengths = ffi.new("size_t[]", [len(b) for b in tag_buffers])
+        out = ffi.new("unsigned char[]", len(messages))
+
+    res = func(
+        ctx, data, lengths, len(messages), tags, tag_lengths, out, mac_size
+    )
+    assert res == 1
+
+    if signatures is not None:
+        return [result == 1 for result in out]
+    macs = ffi.buffer(out)[:]
+    return [macs[i:i + mac_size] for i in range(0, len(macs), mac_size)]
@@ -80,6 +80,7 @@ class Binding(object):
         "err",
         "evp",
         "hmac",
+        "mac",
         "nid",
         "objects",
         "opensslv",
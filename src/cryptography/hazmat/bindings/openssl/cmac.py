@@ -25,6 +25,9 @@ int CMAC_Update(CMAC_CTX *, const void *, size_t);
 int CMAC_Final(CMAC_CTX *, unsigned char *, size_t *);
 int CMAC_CTX_copy(CMAC_CTX *, const CMAC_CTX *);
 void CMAC_CTX_free(CMAC_CTX *);
+int Cryptography_CMAC_CTX_mac_many(const CMAC_CTX *, const void **,
+                                   const size_t *, size_t, const void **,
+                                   const size_t *, unsigned char *, size_t);
 """
 
 CUSTOMIZATIONS = """
@@ -39,8 +42,41 @@ int (*CMAC_Update)(CMAC_CTX *, const void *, size_t) = NULL;
 int (*CMAC_Final)(CMAC_CTX *, unsigned char *, size_t *) = NULL;
 int (*CMAC_CTX_copy)(CMAC_CTX *, const CMAC_CTX *) = NULL;
 void (*CMAC_CTX_free)(CMAC_CTX *) = NULL;
+int (*Cryptography_CMAC_CTX_mac_many)(const CMAC_CTX *, const void **,
+                                      const size_t *, size_t, const void **,
+                                      const size_t *, unsigned char *,
+                                      size_t) = NULL;
 #else
 static const long Cryptography_HAS_CMAC = 1;
+
+static int Cryptography_CMAC_CTX_remac(void *ctx, const void *data,
+                                       size_t data_len, unsigned char *mac,
+                                       size_t *outlen) {
+    /* Restarting keeps the expanded key and subkeys. */
+    return CMAC_Init(ctx, NULL, 0, NULL, NULL) &&
+           CMAC_Update(ctx, data, data_len) &&
+           CMAC_Final(ctx, mac, outlen);
+}
+
+/* Runs Cryptography_MAC_many with a copy of template. */
+int Cryptography_CMAC_CTX_mac_many(const CMAC_CTX *template,
+                                   const void **data, const size_t *lengths,
+                                   size_t count, const void **tags,
+                                   const size_t *tag_lengths,
+                                   unsigned char *out, size_t mac_size) {
+    CMAC_CTX *ctx = CMAC_CTX_new();
+    int res;
+
+    if (ctx == NULL) {
+        return 0;
+    }
+    res = CMAC_CTX_copy(ctx, template) &&
+          Cryptography_MAC_many(ctx, Cryptography_CMAC_CTX_remac, data,
+                                lengths, count, tags, tag_lengths, out,
+                                mac_size);
+    CMAC_CTX_free(ctx);
+    return res;
+}
 #endif
 """
 
@@ -52,5 +88,6 @@ CONDITIONAL_NAMES = {
         "CMAC_Final",
         "CMAC_CTX_copy",
         "CMAC_CTX_free",
+        "Cryptography_CMAC_CTX_mac_many",
     ],
 }
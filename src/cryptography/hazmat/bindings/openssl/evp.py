@@ -35,6 +35,10 @@ static const int EVP_CTRL_GCM_GET_TAG;
 static const int EVP_CTRL_GCM_SET_TAG;
 
 static const int Cryptography_HAS_GCM;
+static const int Cryptography_HAS_CHACHA20_POLY1305;
+static const int Cryptography_HAS_DIGEST_FINAL_XOF;
+static const int Cryptography_HAS_DIGEST_SQUEEZE;
+static const int Cryptography_HAS_SCRYPT;
 static const int Cryptography_HAS_PBKDF2_HMAC;
 static const int Cryptography_HAS_PKEY_CTX;
 """
@@ -69,6 +73,11 @@ int EVP_DigestInit_ex(EVP_MD_CTX *, const EVP_MD *, ENGINE *);
 int EVP_DigestUpdate(EVP_MD_CTX *, const void *, size_t);
 int EVP_DigestFinal_ex(EVP_MD_CTX *, unsigned char *, unsigned int *);
 int EVP_MD_CTX_cleanup(EVP_MD_CTX *);
+int EVP_Digest(const void *, size_t, unsigned char *, unsigned int *,
+               const EVP_MD *, ENGINE *);
+int Cryptography_EVP_Digest_many(EVP_MD_CTX *, const EVP_MD *,
+                                 const void **, const size_t *, size_t,
+                                 unsigned char *);
 void EVP_MD_CTX_destroy(EVP_MD_CTX *);
 const EVP_MD *EVP_get_digestbyname(const char *);
 
@@ -127,6 +136,20 @@ int EVP_PKEY_set1_EC_KEY(EVP_PKEY *, EC_KEY *);
 int EVP_CIPHER_CTX_block_size(const EVP_CIPHER_CTX *);
 int EVP_CIPHER_CTX_ctrl(EVP_CIPHER_CTX *, int, int, void *);
 
+/* Only available in OpenSSL 1.1.0+ */
+const EVP_CIPHER *EVP_chacha20_poly1305(void);
+
+/* Only available in OpenSSL 1.1.1+ */
+int EVP_DigestFinalXOF(EVP_MD_CTX *, unsigned char *, size_t);
+
+/* Only available in OpenSSL 3.3+ */
+int EVP_DigestSqueeze(EVP_MD_CTX *, unsigned char *, size_t);
+
+/* Only available in OpenSSL 1.1.0+ */
+int EVP_PBE_scrypt(const char *, size_t, const unsigned char *, size_t,
+                   uint64_t, uint64_t, uint64_t, uint64_t, unsigned char *,
+                   size_t);
+
 int PKCS5_PBKDF2_HMAC(const char *, int, const unsigned char *, int, int,
                       const EVP_MD *, int, unsigned char *);
 
@@ -164,6 +187,24 @@ int Cryptography_EVP_PKEY_decrypt(EVP_PKEY_CTX *ctx, unsigned char *out,
 """
 
 CUSTOMIZATIONS = """
+/* Hashes count messages with one context, writing the digests one after
+   another into out. */
+int Cryptography_EVP_Digest_many(EVP_MD_CTX *ctx, const EVP_MD *md,
+                                 const void **data, const size_t *lengths,
+                                 size_t count, unsigned char *out) {
+    size_t i;
+    size_t size = (size_t)EVP_MD_size(md);
+
+    for (i = 0; i < count; i++) {
+        if (!EVP_DigestInit_ex(ctx, md, NULL) ||
+            !EVP_DigestUpdate(ctx, data[i], lengths[i]) ||
+            !EVP_DigestFinal_ex(ctx, out + i * size, NULL)) {
+            return 0;
+        }
+    }
+    return 1;
+}
+
 #ifdef EVP_CTRL_GCM_SET_TAG
 const long Cryptography_HAS_GCM = 1;
 #else
@@ -172,6 +213,33 @@ const long EVP_CTRL_GCM_GET_TAG = -1;
 const long EVP_CTRL_GCM_SET_TAG = -1;
 const long EVP_CTRL_GCM_SET_IVLEN = -1;
 #endif
+#if OPENSSL_VERSION_NUMBER >= 0x10100000L && !defined(OPENSSL_NO_CHACHA) && \
+    !defined(OPENSSL_NO_POLY1305)
+const long Cryptography_HAS_CHACHA20_POLY1305 = 1;
+#else
+const long Cryptography_HAS_CHACHA20_POLY1305 = 0;
+const EVP_CIPHER *(*EVP_chacha20_poly1305)(void) = NULL;
+#endif
+#if OPENSSL_VERSION_NUMBER >= 0x10101000L
+const long Cryptography_HAS_DIGEST_FINAL_XOF = 1;
+#else
+const long Cryptography_HAS_DIGEST_FINAL_XOF = 0;
+int (*EVP_DigestFinalXOF)(EVP_MD_CTX *, unsigned char *, size_t) = NULL;
+#endif
+#if OPENSSL_VERSION_NUMBER >= 0x30300000L
+const long Cryptography_HAS_DIGEST_SQUEEZE = 1;
+#else
+const long Cryptography_HAS_DIGEST_SQUEEZE = 0;
+int (*EVP_DigestSqueeze)(EVP_MD_CTX *, unsigned char *, size_t) = NULL;
+#endif
+#if OPENSSL_VERSION_NUMBER >= 0x10100000L && !defined(OPENSSL_NO_SCRYPT)
+const long Cryptography_HAS_SCRYPT = 1;
+#else
+const long Cryptography_HAS_SCRYPT = 0;
+int (*EVP_PBE_scrypt)(const char *, size_t, const unsigned char *, size_t,
+                      uint64_t, uint64_t, uint64_t, uint64_t, unsigned char *,
+                      size_t) = NULL;
+#endif
 #if OPENSSL_VERSION_NUMBER >= 0x10000000L
 const long Cryptography_HAS_PBKDF2_HMAC = 1;
 const long Cryptography_HAS_PKEY_CTX = 1;
@@ -228,6 +296,18 @@ CONDITIONAL_NAMES = {
         "EVP_CTRL_GCM_SET_TAG",
         "EVP_CTRL_GCM_SET_IVLEN",
     ],
+    "Cryptography_HAS_CHACHA20_POLY1305": [
+        "EVP_chacha20_poly1305",
+    ],
+    "Cryptography_HAS_DIGEST_FINAL_XOF": [
+        "EVP_DigestFinalXOF",
+    ],
+    "Cryptography_HAS_DIGEST_SQUEEZE": [
+        "EVP_DigestSqueeze",
+    ],
+    "Cryptography_HAS_SCRYPT": [
+        "EVP_PBE_scrypt",
+    ],
     "Cryptography_HAS_PBKDF2_HMAC": [
         "PKCS5_PBKDF2_HMAC"
     ],
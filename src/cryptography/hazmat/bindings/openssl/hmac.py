@@ -21,6 +21,14 @@ int Cryptography_HMAC_Init_ex(HMAC_CTX *, const void *, int, const EVP_MD *,
 int Cryptography_HMAC_Update(HMAC_CTX *, const unsigned char *, size_t);
 int Cryptography_HMAC_Final(HMAC_CTX *, unsigned char *, unsigned int *);
 int Cryptography_HMAC_CTX_copy(HMAC_CTX *, HMAC_CTX *);
+int Cryptography_HMAC_CTX_copy_mac(HMAC_CTX *, const unsigned char *, size_t,
+                                   unsigned char *, unsigned int *);
+int Cryptography_HMAC_CTX_mac_many(HMAC_CTX *, const void **, const size_t *,
+                                   size_t, const void **, const size_t *,
+                                   unsigned char *, size_t);
+int Cryptography_PBKDF2_HMAC_block(const char *, int, const unsigned char *,
+                                   int, int, const EVP_MD *, unsigned long,
+                                   unsigned char *);
 """
 
 MACROS = """
@@ -80,6 +88,100 @@ int Cryptography_HMAC_CTX_copy(HMAC_CTX *dst_ctx, HMAC_CTX *src_ctx) {
         return 0;
 #endif
 }
+
+int Cryptography_HMAC_CTX_copy_mac(HMAC_CTX *template,
+                                   const unsigned char *data, size_t data_len,
+                                   unsigned char *digest,
+                                   unsigned int *outlen) {
+    HMAC_CTX ctx;
+    int res;
+
+    HMAC_CTX_init(&ctx);
+    res = Cryptography_HMAC_CTX_copy(&ctx, template) &&
+          Cryptography_HMAC_Update(&ctx, data, data_len) &&
+          Cryptography_HMAC_Final(&ctx, digest, outlen);
+    HMAC_CTX_cleanup(&ctx);
+    return res;
+}
+
+static int Cryptography_HMAC_CTX_remac(void *ctx, const void *data,
+                                       size_t data_len, unsigned char *digest,
+                                       size_t *outlen) {
+    unsigned int len;
+
+    /* Rewinding to the keyed state reuses the key pads. */
+    if (!Cryptography_HMAC_Init_ex(ctx, NULL, 0, NULL, NULL) ||
+            !Cryptography_HMAC_Update(ctx, data, data_len) ||
+            !Cryptography_HMAC_Final(ctx, digest, &len)) {
+        return 0;
+    }
+    *outlen = len;
+    return 1;
+}
+
+/* Runs Cryptography_MAC_many with a copy of template. */
+int Cryptography_HMAC_CTX_mac_many(HMAC_CTX *template, const void **data,
+                                   const size_t *lengths, size_t count,
+                                   const void **tags,
+                                   const size_t *tag_lengths,
+                                   unsigned char *out, size_t mac_size) {
+    HMAC_CTX ctx;
+    int res;
+
+    HMAC_CTX_init(&ctx);
+    res = Cryptography_HMAC_CTX_copy(&ctx, template) &&
+          Cryptography_MAC_many(&ctx, Cryptography_HMAC_CTX_remac, data,
+                                lengths, count, tags, tag_lengths, out,
+                                mac_size);
+    HMAC_CTX_cleanup(&ctx);
+    return res;
+}
+
+/* Computes block number block (counting from 1) of PBKDF2 with HMAC using
+   md, which is the EVP_MD_size(md) bytes of the derived key starting at
+   (block - 1) * EVP_MD_size(md). The blocks do not depend on each other, so
+   they can be computed on separate threads. */
+int Cryptography_PBKDF2_HMAC_block(const char *pass, int pass_len,
+                                   const unsigned char *salt, int salt_len,
+                                   int iterations, const EVP_MD *md,
+                                   unsigned long block, unsigned char *out) {
+    HMAC_CTX ctx;
+    unsigned char digest[EVP_MAX_MD_SIZE];
+    unsigned char counter[4];
+    unsigned int outlen;
+    int size = EVP_MD_size(md);
+    int i, j;
+    int res;
+
+    counter[0] = (unsigned char)((block >> 24) & 0xff);
+    counter[1] = (unsigned char)((block >> 16) & 0xff);
+    counter[2] = (unsigned char)((block >> 8) & 0xff);
+    counter[3] = (unsigned char)(block & 0xff);
+
+    HMAC_CTX_init(&ctx);
+    res = Cryptography_HMAC_Init_ex(&ctx, pass, pass_len, md, NULL) &&
+          Cryptography_HMAC_Update(&ctx, salt, salt_len) &&
+          Cryptography_HMAC_Update(&ctx, counter, 4) &&
+          Cryptography_HMAC_Final(&ctx, digest, &outlen);
+    if (res) {
+        memcpy(out, digest, size);
+    }
+    for (i = 1; res && i < iterations; i++) {
+        /* Rewinding to the keyed state reuses the key pads. */
+        res = Cryptography_HMAC_Init_ex(&ctx, NULL, 0, NULL, NULL) &&
+              Cryptography_HMAC_Update(&ctx, digest, size) &&
+              Cryptography_HMAC_Final(&ctx, digest, &outlen);
+        if (!res) {
+            break;
+        }
+        for (j = 0; j < size; j++) {
+            out[j] ^= digest[j];
+        }
+    }
+    OPENSSL_cleanse(digest, sizeof(digest));
+    HMAC_CTX_cleanup(&ctx);
+    return res;
+}
 """
 
 CONDITIONAL_NAMES = {}
@@ -0,0 +1,81 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+INCLUDES = """
+#include <string.h>
+#include <openssl/crypto.h>
+#include <openssl/evp.h>
+"""
+
+TYPES = """
+"""
+
+FUNCTIONS = """
+int Cryptography_MAC_many(void *,
+                          int (*)(void *, const void *, size_t,
+                                  unsigned char *, size_t *),
+                          const void **, const size_t *, size_t,
+                          const void **, const size_t *, unsigned char *,
+                          size_t);
+"""
+
+MACROS = """
+"""
+
+CUSTOMIZATIONS = """
+/* Calls mac on each of the count messages. mac must compute the MAC of one
+   message from the keyed state held in ctx and leave ctx ready for the next
+   message.
+
+   If tags is NULL the MACs, each mac_size bytes long, are written back to
+   back into out. Otherwise out[i] is set to 1 if the MAC of data[i] matches
+   tags[i] and 0 if it does not. The comparison time does not depend on the
+   tag contents. */
+int Cryptography_MAC_many(void *ctx,
+                          int (*mac)(void *, const void *, size_t,
+                                     unsigned char *, size_t *),
+                          const void **data, const size_t *lengths,
+                          size_t count, const void **tags,
+                          const size_t *tag_lengths, unsigned char *out,
+                          size_t mac_size) {
+    unsigned char digest[EVP_MAX_MD_SIZE];
+    unsigned char mismatch;
+    const unsigned char *tag;
+    size_t outlen;
+    size_t i, j;
+    int res = mac_size <= sizeof(digest);
+
+    for (i = 0; res && i < count; i++) {
+        res = mac(ctx, data[i], lengths[i], digest, &outlen) &&
+              outlen == mac_size;
+        if (!res) {
+            break;
+        }
+        if (tags == NULL) {
+            memcpy(out + i * mac_size, digest, mac_size);
+            continue;
+        }
+        if (tag_lengths[i] != mac_size) {
+            out[i] = 0;
+            continue;
+        }
+        tag = tags[i];
+        mismatch = 0;
+        for (j = 0; j < mac_size; j++) {
+            mismatch |= digest[j] ^ tag[j];
+        }
+        /* Make sure any bits set are copied to the lowest bit */
+        mismatch |= mismatch >> 4;
+        mismatch |= mismatch >> 2;
+        mismatch |= mismatch >> 1;
+        out[i] = (mismatch & 1) == 0;
+    }
+    OPENSSL_cleanse(digest, sizeof(digest));
+    return res;
+}
+"""
+
+CONDITIONAL_NAMES = {}
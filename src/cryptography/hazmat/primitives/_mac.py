@@ -0,0 +1,68 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import constant_time
+
+
+class _MACKey(object):
+    """
+    Holds a keyed MAC context and clones it for every message. Subclasses
+    validate their arguments and pass the backend's keyed context in.
+    """
+    def __init__(self, ctx):
+        self._ctx = ctx
+        # Backends may offer a one-shot that clones the template and MACs a
+        # message without building an intermediate context object.
+        self._mac = getattr(self._ctx, "mac", None)
+
+    def mac(self, data):
+        if not isinstance(data, bytes):
+            raise TypeError("data must be bytes.")
+        if self._mac is not None:
+            return self._mac(data)
+
+        ctx = self._ctx.copy()
+        ctx.update(data)
+        return ctx.finalize()
+
+    def verify(self, data, signature):
+        if not isinstance(signature, bytes):
+            raise TypeError("signature must be bytes.")
+        if not constant_time.bytes_eq(self.mac(data), signature):
+            raise InvalidSignature("Signature did not match digest.")
+
+    def mac_many(self, messages):
+        messages = list(messages)
+        for message in messages:
+            if not isinstance(message, bytes):
+                raise TypeError("messages must be bytes.")
+
+        mac_many = getattr(self._ctx, "mac_many", None)
+        if mac_many is not None:
+            return mac_many(messages)
+
+        return [self.mac(message) for message in messages]
+
+    def verify_many(self, pairs):
+        messages = []
+        signatures = []
+        for message, signature in pairs:
+            if not isinstance(message, bytes):
+                raise TypeError("messages must be bytes.")
+            if not isinstance(signature, bytes):
+                raise TypeError("signatures must be bytes.")
+            messages.append(message)
+            signatures.append(signature)
+
+        verify_many = getattr(self._ctx, "verify_many", None)
+        if verify_many is not None:
+            return verify_many(messages, signatures)
+
+        return [
+            constant_time.bytes_eq(self.mac(message), signature)
+            for message, signature in zip(messages, signatures)
+        ]
@@ -5,8 +5,19 @@
 from __future__ import absolute_import, division, print_function
 
 from cryptography.hazmat.primitives.ciphers.base import Cipher
+from cryptography.hazmat.primitives.ciphers.files import (
+    CipherFileStats, decrypt_file, encrypt_file
+)
+from cryptography.hazmat.primitives.ciphers.sectors import (
+    decrypt_sectors, encrypt_sectors
+)
 
 
 __all__ = [
     "Cipher",
+    "CipherFileStats",
+    "decrypt_file",
+    "decrypt_sectors",
+    "encrypt_file",
+    "encrypt_sectors",
 ]
@@ -0,0 +1,119 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import os
+
+from cryptography import utils
+from cryptography.exceptions import UnsupportedAlgorithm, _Reasons
+from cryptography.hazmat.backends.interfaces import AEADBackend
+from cryptography.hazmat.primitives import interfaces
+from cryptography.hazmat.primitives.ciphers import algorithms, modes
+
+
+def _check_backend(backend):
+    if not isinstance(backend, AEADBackend):
+        raise UnsupportedAlgorithm(
+            "Backend object does not implement AEADBackend.",
+            _Reasons.BACKEND_MISSING_INTERFACE
+        )
+
+
+def _check_params(nonce, data, associated_data):
+    if associated_data is None:
+        associated_data = b""
+
+    if not isinstance(nonce, bytes):
+        raise TypeError("nonce must be bytes.")
+    if not isinstance(data, bytes):
+        raise TypeError("data must be bytes.")
+    if not isinstance(associated_data, bytes):
+        raise TypeError("associated_data must be bytes.")
+
+    return associated_data
+
+
+@utils.register_interface(interfaces.CipherAlgorithm)
+class _ChaCha20Poly1305Algorithm(object):
+    """
+    The cipher passed to AEADBackend for ChaCha20Poly1305. It has no mode and
+    is deliberately not usable as a Cipher algorithm, since ChaCha20 without
+    Poly1305 would be unauthenticated.
+    """
+    name = "ChaCha20Poly1305"
+    key_size = 256
+
+    def __init__(self, key):
+        self.key = key
+
+
+class ChaCha20Poly1305(object):
+    def __init__(self, key, backend):
+        _check_backend(backend)
+
+        if not isinstance(key, bytes):
+            raise TypeError("key must be bytes.")
+
+        if len(key) != 32:
+            raise ValueError("ChaCha20Poly1305 key must be 32 bytes.")
+
+        self._ctx = backend.create_aead_ctx(
+            _ChaCha20Poly1305Algorithm(key), None
+        )
+
+    @classmethod
+    def generate_key(cls):
+        return os.urandom(32)
+
+    def encrypt(self, nonce, data, associated_data):
+        associated_data = _check_params(nonce, data, associated_data)
+        self._check_nonce(nonce)
+        return self._ctx.encrypt(nonce, data, associated_data)
+
+    def decrypt(self, nonce, data, associated_data):
+        associated_data = _check_params(nonce, data, associated_data)
+        self._check_nonce(nonce)
+        return self._ctx.decrypt(nonce, data, associated_data)
+
+    def _check_nonce(self, nonce):
+        if len(nonce) != 12:
+            raise ValueError("Nonce must be 12 bytes.")
+
+
+class AESGCM(object):
+    def __init__(self, key, backend):
+        _check_backend(backend)
+
+        if not isinstance(key, bytes):
+            raise TypeError("key must be bytes.")
+
+        if len(key) not in (16, 24, 32):
+            raise ValueError("AESGCM key must be 128, 192, or 256 bits.")
+
+        self._ctx = backend.create_aead_ctx(algorithms.AES(key), modes.GCM)
+
+    @classmethod
+    def generate_key(cls, bit_length):
+        if not isinstance(bit_length, int):
+            raise TypeError("bit_length must be an integer.")
+
+        if bit_length not in (128, 192, 256):
+            raise ValueError("bit_length must be 128, 192, or 256.")
+
+        return os.urandom(bit_length // 8)
+
+    def encrypt(self, nonce, data, associated_data):
+        associated_data = _check_params(nonce, data, associated_data)
+        self._check_nonce(nonce)
+        return self._ctx.encrypt(nonce, data, associated_data)
+
+    def decrypt(self, nonce, data, associated_data):
+        associated_data = _check_params(nonce, data, associated_data)
+        self._check_nonce(nonce)
+        return self._ctx.decrypt(nonce, data, associated_data)
+
+    def _check_nonce(self, nonce):
+        if len(nonce) < 8 or len(nonce) > 128:
+            raise ValueError("Nonce must be between 8 and 128 bytes.")
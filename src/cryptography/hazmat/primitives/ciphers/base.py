@@ -4,6 +4,10 @@
 
 from __future__ import absolute_import, division, print_function
 
+import binascii
+
+import six
+
 from cryptography import utils
 from cryptography.exceptions import (
     AlreadyFinalized, AlreadyUpdated, NotYetFinalized, UnsupportedAlgorithm,
@@ -11,6 +15,7 @@ from cryptography.exceptions import (
 )
 from cryptography.hazmat.backends.interfaces import CipherBackend
 from cryptography.hazmat.primitives import interfaces
+from cryptography.hazmat.primitives.ciphers import modes
 
 
 class Cipher(object):
@@ -55,6 +60,48 @@ class Cipher(object):
         )
         return self._wrap_ctx(ctx, encrypt=False)
 
+    def decryptor_at(self, offset, unauthenticated=False):
+        if not isinstance(offset, six.integer_types):
+            raise TypeError("offset must be an integer.")
+
+        if offset < 0:
+            raise ValueError("offset must be non-negative.")
+
+        if isinstance(self.mode, modes.CTR):
+            block_size = self.algorithm.block_size // 8
+            counter = _int_from_bytes(self.mode.nonce) + offset // block_size
+            counter %= 1 << (block_size * 8)
+            nonce = _int_to_bytes(counter, block_size)
+        elif isinstance(self.mode, modes.GCM):
+            if not unauthenticated:
+                raise ValueError(
+                    "Seeking in GCM mode skips tag verification and must be "
+                    "requested with unauthenticated=True."
+                )
+            if len(self.mode.initialization_vector) != 12:
+                raise ValueError(
+                    "Seeking in GCM mode requires a 96-bit initialization "
+                    "vector."
+                )
+            # With a 96-bit IV the GCM keystream is CTR mode starting from
+            # IV || 2 (IV || 1 encrypts the tag).
+            block_size = 16
+            counter = offset // block_size + 2
+            if counter >= 1 << 32:
+                raise ValueError("offset is past the GCM message size limit.")
+            nonce = self.mode.initialization_vector + _int_to_bytes(counter, 4)
+        else:
+            raise ValueError(
+                "decryptor_at is only supported for CTR and GCM modes."
+            )
+
+        ctx = self._backend.create_symmetric_decryption_ctx(
+            self.algorithm, modes.CTR(nonce)
+        )
+        ctx = _CipherContext(ctx)
+        ctx.update(b"\x00" * (offset % block_size))
+        return ctx
+
     def _wrap_ctx(self, ctx, encrypt):
         if isinstance(self.mode, interfaces.ModeWithAuthenticationTag):
             if encrypt:
@@ -65,6 +112,15 @@ class Cipher(object):
             return _CipherContext(ctx)
 
 
+def _int_from_bytes(data):
+    return int(binascii.hexlify(data), 16)
+
+
+def _int_to_bytes(integer, length):
+    hex_string = "{0:0{1}x}".format(integer, length * 2)
+    return binascii.unhexlify(hex_string.encode("ascii"))
+
+
 @utils.register_interface(interfaces.CipherContext)
 class _CipherContext(object):
     def __init__(self, ctx):
@@ -75,6 +131,11 @@ class _CipherContext(object):
             raise AlreadyFinalized("Context was already finalized.")
         return self._ctx.update(data)
 
+    def update_into(self, data, buf):
+        if self._ctx is None:
+            raise AlreadyFinalized("Context was already finalized.")
+        return self._ctx.update_into(data, buf)
+
     def finalize(self):
         if self._ctx is None:
             raise AlreadyFinalized("Context was already finalized.")
@@ -97,6 +158,12 @@ class _AEADCipherContext(object):
         self._updated = True
         return self._ctx.update(data)
 
+    def update_into(self, data, buf):
+        if self._ctx is None:
+            raise AlreadyFinalized("Context was already finalized.")
+        self._updated = True
+        return self._ctx.update_into(data, buf)
+
     def finalize(self):
         if self._ctx is None:
             raise AlreadyFinalized("Context was already finalized.")
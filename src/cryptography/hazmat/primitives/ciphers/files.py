@@ -0,0 +1,125 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import os
+import time
+
+import six
+
+from cryptography import utils
+from cryptography.hazmat.primitives import interfaces
+
+
+_MIN_CHUNK_SIZE = 64 * 1024
+_MAX_CHUNK_SIZE = 8 * 1024 * 1024
+_DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class CipherFileStats(object):
+    def __init__(self, bytes_read, bytes_written, seconds, tag=None):
+        self._bytes_read = bytes_read
+        self._bytes_written = bytes_written
+        self._seconds = seconds
+        self._tag = tag
+
+    bytes_read = utils.read_only_property("_bytes_read")
+    bytes_written = utils.read_only_property("_bytes_written")
+    seconds = utils.read_only_property("_seconds")
+    tag = utils.read_only_property("_tag")
+
+    @property
+    def throughput(self):
+        if self._seconds <= 0:
+            return float("inf")
+        return self._bytes_read / self._seconds
+
+
+def encrypt_file(src, dst, cipher, chunk_size=None):
+    return _process_file(src, dst, cipher, cipher.encryptor(), chunk_size)
+
+
+def decrypt_file(src, dst, cipher, chunk_size=None):
+    return _process_file(src, dst, cipher, cipher.decryptor(), chunk_size)
+
+
+def _choose_chunk_size(src):
+    try:
+        size = os.fstat(src.fileno()).st_size
+    except (AttributeError, OSError, IOError, ValueError):
+        return _DEFAULT_CHUNK_SIZE
+
+    # Small files don't need a large buffer; large files use big chunks so
+    # that backends can spread each update across several cores.
+    chunk_size = max(_MIN_CHUNK_SIZE, min(size, _MAX_CHUNK_SIZE))
+    return chunk_size + -chunk_size % 4096
+
+
+def _write_all(dst, data):
+    # Raw streams may write fewer bytes than they were given, while most
+    # other file objects write everything and return None or the length.
+    while len(data):
+        written = dst.write(data)
+        if written is None:
+            return
+        data = data[written:]
+
+
+def _process_file(src, dst, cipher, ctx, chunk_size):
+    if chunk_size is None:
+        chunk_size = _choose_chunk_size(src)
+
+    if not isinstance(chunk_size, six.integer_types):
+        raise TypeError("chunk_size must be an integer.")
+
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive.")
+
+    if isinstance(cipher.algorithm, interfaces.BlockCipherAlgorithm):
+        block_size = cipher.algorithm.block_size // 8
+    else:
+        block_size = 1
+
+    readinto = getattr(src, "readinto", None)
+    in_buf = bytearray(chunk_size)
+    # A block cipher context may hold back up to a block of input, so
+    # update_into needs room for one more block than it is given.
+    out_buf = bytearray(chunk_size + block_size - 1)
+    bytes_read = 0
+    bytes_written = 0
+
+    start = time.time()
+    while True:
+        if readinto is not None:
+            count = readinto(in_buf)
+        else:
+            data = src.read(chunk_size)
+            count = None if data is None else len(data)
+        # Non-blocking streams return None when no data is ready yet, which
+        # must not be mistaken for the end of the input.
+        if count is None:
+            raise ValueError("src must be a blocking stream.")
+        if not count:
+            break
+        if readinto is not None:
+            data = utils._buffer_prefix(in_buf, count)
+
+        bytes_read += count
+        written = ctx.update_into(data, out_buf)
+        if written:
+            _write_all(dst, utils._buffer_prefix(out_buf, written))
+            bytes_written += written
+
+    final = ctx.finalize()
+    if final:
+        _write_all(dst, final)
+        bytes_written += len(final)
+    seconds = time.time() - start
+
+    tag = None
+    if isinstance(ctx, interfaces.AEADEncryptionContext):
+        tag = ctx.tag
+
+    return CipherFileStats(bytes_read, bytes_written, seconds, tag)
@@ -0,0 +1,84 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import binascii
+
+import six
+
+from cryptography import utils
+from cryptography.hazmat.primitives.ciphers.base import Cipher
+from cryptography.hazmat.primitives.ciphers.modes import XTS
+
+
+# Batches smaller than this are processed on the calling thread, where the
+# cost of handing work to the thread pool would outweigh the gain.
+_PARALLEL_SECTORS_THRESHOLD = 1024 * 1024
+
+
+def encrypt_sectors(algorithm, sectors, backend, first_sector=0):
+    return _process_sectors(
+        algorithm, sectors, backend, first_sector, Cipher.encryptor
+    )
+
+
+def decrypt_sectors(algorithm, sectors, backend, first_sector=0):
+    return _process_sectors(
+        algorithm, sectors, backend, first_sector, Cipher.decryptor
+    )
+
+
+def _sector_tweak(sector_number):
+    # IEEE 1619 encodes the data unit sequence number as a 128-bit little
+    # endian integer.
+    tweak = "{0:032x}".format(sector_number).encode("ascii")
+    return binascii.unhexlify(tweak)[::-1]
+
+
+def _process_sectors(algorithm, sectors, backend, first_sector, make_ctx):
+    if not isinstance(first_sector, six.integer_types):
+        raise TypeError("first_sector must be an integer.")
+
+    sectors = list(sectors)
+    if first_sector < 0 or first_sector + len(sectors) > 1 << 128:
+        raise ValueError("Sector numbers must be in the range [0, 2 ** 128).")
+
+    block_size = algorithm.block_size // 8
+    for sector in sectors:
+        if not isinstance(sector, bytes):
+            raise TypeError("sectors must be bytes.")
+        if len(sector) < block_size:
+            raise ValueError(
+                "sectors must be at least {0} bytes.".format(block_size)
+            )
+
+    # Validating the key up front means a bad key raises on the calling
+    # thread rather than part way through a batch.
+    XTS(b"\x00" * 16).validate_for_algorithm(algorithm)
+
+    def process(indexes):
+        result = []
+        for i in indexes:
+            cipher = Cipher(
+                algorithm, XTS(_sector_tweak(first_sector + i)), backend
+            )
+            ctx = make_ctx(cipher)
+            result.append(ctx.update(sectors[i]) + ctx.finalize())
+        return result
+
+    total = sum(len(sector) for sector in sectors)
+    workers = utils._cpu_count()
+    if total < _PARALLEL_SECTORS_THRESHOLD or workers <= 1:
+        return process(range(len(sectors)))
+
+    # Each worker handles an interleaved share of the sectors so that the
+    # work stays balanced when sector sizes vary.
+    batches = utils._parallel_map(
+        process, [range(i, len(sectors), workers) for i in range(workers)]
+    )
+    result = [None] * len(sectors)
+    for i, batch in enumerate(batches):
+        result[i::workers] = batch
+    return result
@@ -10,6 +10,19 @@ from cryptography.exceptions import (
 )
 from cryptography.hazmat.backends.interfaces import CMACBackend
 from cryptography.hazmat.primitives import interfaces
+from cryptography.hazmat.primitives._mac import _MACKey
+
+
+def _check_algorithm(algorithm):
+    if not isinstance(algorithm, interfaces.BlockCipherAlgorithm):
+        raise TypeError(
+            "Expected instance of interfaces.BlockCipherAlgorithm."
+        )
+    # 512-bit AES keys are only meaningful for XTS mode.
+    if algorithm.name == "AES" and algorithm.key_size > 256:
+        raise ValueError(
+            "Only 128, 192, and 256 bit keys are allowed for AES CMAC."
+        )
 
 
 @utils.register_interface(interfaces.MACContext)
@@ -21,10 +34,7 @@ class CMAC(object):
                 _Reasons.BACKEND_MISSING_INTERFACE
             )
 
-        if not isinstance(algorithm, interfaces.BlockCipherAlgorithm):
-            raise TypeError(
-                "Expected instance of interfaces.BlockCipherAlgorithm."
-            )
+        _check_algorithm(algorithm)
         self._algorithm = algorithm
 
         self._backend = backend
@@ -64,3 +74,37 @@ class CMAC(object):
             backend=self._backend,
             ctx=self._ctx.copy()
         )
+
+
+class CMACKey(_MACKey):
+    """
+    Keys a CMAC context once and clones it for every message, so the key
+    schedule and subkeys are not derived again each time the key is used.
+    """
+    def __init__(self, algorithm, backend):
+        if not isinstance(backend, CMACBackend):
+            raise UnsupportedAlgorithm(
+                "Backend object does not implement CMACBackend.",
+                _Reasons.BACKEND_MISSING_INTERFACE
+            )
+
+        _check_algorithm(algorithm)
+        self._algorithm = algorithm
+
+        self._backend = backend
+        super(CMACKey, self).__init__(
+            self._backend.create_cmac_ctx(self._algorithm)
+        )
+
+    algorithm = utils.read_only_property("_algorithm")
+
+    def cmac(self):
+        return CMAC(self._algorithm, self._backend, ctx=self._ctx.copy())
+
+
+def mac_many(algorithm, messages, backend):
+    return CMACKey(algorithm, backend).mac_many(messages)
+
+
+def verify_many(algorithm, pairs, backend):
+    return CMACKey(algorithm, backend).verify_many(pairs)
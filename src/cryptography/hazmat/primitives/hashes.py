@@ -4,11 +4,17 @@
 
 from __future__ import absolute_import, division, print_function
 
+import mmap
+
+import six
+
 from cryptography import utils
 from cryptography.exceptions import (
-    AlreadyFinalized, UnsupportedAlgorithm, _Reasons
+    AlreadyFinalized, InvalidSignature, UnsupportedAlgorithm, _Reasons
+)
+from cryptography.hazmat.backends.interfaces import (
+    HashBackend, HashDigestBackend, XOFBackend
 )
-from cryptography.hazmat.backends.interfaces import HashBackend
 from cryptography.hazmat.primitives import interfaces
 
 
@@ -32,13 +38,16 @@ class Hash(object):
         else:
             self._ctx = ctx
 
+        # The finalized backend context is kept so that reset() can reuse it.
+        self._finalized_ctx = None
+
     algorithm = utils.read_only_property("_algorithm")
 
     def update(self, data):
         if self._ctx is None:
             raise AlreadyFinalized("Context was already finalized.")
-        if not isinstance(data, bytes):
-            raise TypeError("data must be bytes.")
+        if isinstance(data, six.text_type):
+            raise TypeError("data must be bytes or a buffer.")
         self._ctx.update(data)
 
     def copy(self):
@@ -52,9 +61,374 @@ class Hash(object):
         if self._ctx is None:
             raise AlreadyFinalized("Context was already finalized.")
         digest = self._ctx.finalize()
-        self._ctx = None
+        self._finalized_ctx, self._ctx = self._ctx, None
         return digest
 
+    def reset(self):
+        ctx = self._ctx if self._ctx is not None else self._finalized_ctx
+        # Backend contexts that can re-initialize themselves are reused,
+        # anything else is replaced with a fresh context.
+        reset = getattr(ctx, "reset", None)
+        if reset is not None:
+            reset()
+        else:
+            ctx = self._backend.create_hash_ctx(self.algorithm)
+        self._ctx = ctx
+        self._finalized_ctx = None
+
+
+@utils.register_interface(interfaces.XOFContext)
+class XOFHash(object):
+    def __init__(self, algorithm, backend, ctx=None):
+        if not isinstance(backend, XOFBackend):
+            raise UnsupportedAlgorithm(
+                "Backend object does not implement XOFBackend.",
+                _Reasons.BACKEND_MISSING_INTERFACE
+            )
+
+        if not isinstance(algorithm, interfaces.ExtendableOutputFunction):
+            raise TypeError(
+                "Expected instance of interfaces.ExtendableOutputFunction."
+            )
+        self._algorithm = algorithm
+
+        self._backend = backend
+
+        if ctx is None:
+            self._ctx = self._backend.create_xof_ctx(self.algorithm)
+        else:
+            self._ctx = ctx
+
+        self._squeezed = False
+
+    algorithm = utils.read_only_property("_algorithm")
+
+    def update(self, data):
+        if self._squeezed:
+            raise AlreadyFinalized("Output was already squeezed.")
+        if isinstance(data, six.text_type):
+            raise TypeError("data must be bytes or a buffer.")
+        self._ctx.update(data)
+
+    def copy(self):
+        if self._squeezed:
+            raise AlreadyFinalized("Output was already squeezed.")
+        return XOFHash(
+            self.algorithm, backend=self._backend, ctx=self._ctx.copy()
+        )
+
+    def squeeze(self, length):
+        if not isinstance(length, six.integer_types):
+            raise TypeError("length must be an integer.")
+
+        if length < 0:
+            raise ValueError("length must not be negative.")
+
+        buf = bytearray(length)
+        self.squeeze_into(buf)
+        return bytes(buf)
+
+    def squeeze_into(self, buf):
+        if isinstance(buf, (bytes, six.text_type)):
+            raise TypeError("buf must be a writable buffer.")
+        self._squeezed = True
+        return self._ctx.squeeze_into(buf)
+
+
+def digest(algorithm, data, backend):
+    if not isinstance(algorithm, interfaces.HashAlgorithm):
+        raise TypeError("Expected instance of interfaces.HashAlgorithm.")
+
+    if isinstance(data, six.text_type):
+        raise TypeError("data must be bytes or a buffer.")
+
+    # ABC instance checks are relatively expensive compared to hashing a
+    # short message, so the one-shot interface is checked first.
+    if isinstance(backend, HashDigestBackend):
+        return backend.hash_digest(algorithm, data)
+
+    h = Hash(algorithm, backend)
+    h.update(data)
+    return h.finalize()
+
+
+def digest_many(algorithm, messages, backend):
+    if not isinstance(algorithm, interfaces.HashAlgorithm):
+        raise TypeError("Expected instance of interfaces.HashAlgorithm.")
+
+    messages = list(messages)
+    for message in messages:
+        if isinstance(message, six.text_type):
+            raise TypeError("messages must be bytes or buffers.")
+
+    if isinstance(backend, HashDigestBackend):
+        return backend.hash_digest_many(algorithm, messages)
+
+    if not isinstance(backend, HashBackend):
+        raise UnsupportedAlgorithm(
+            "Backend object does not implement HashBackend.",
+            _Reasons.BACKEND_MISSING_INTERFACE
+        )
+
+    return [digest(algorithm, message, backend) for message in messages]
+
+
+# Stream chunks are kept small enough to stay in the CPU cache between being
+# read and being hashed.
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def hash_stream(fileobj, algorithm, backend, chunk_size=None):
+    if chunk_size is None:
+        chunk_size = _STREAM_CHUNK_SIZE
+
+    if not isinstance(chunk_size, six.integer_types):
+        raise TypeError("chunk_size must be an integer.")
+
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive.")
+
+    h = Hash(algorithm, backend)
+    readinto = getattr(fileobj, "readinto", None)
+    buf = bytearray(chunk_size)
+    while True:
+        if readinto is not None:
+            count = readinto(buf)
+        else:
+            data = fileobj.read(chunk_size)
+            count = None if data is None else len(data)
+        # Non-blocking streams return None when no data is ready yet, which
+        # must not be mistaken for the end of the stream.
+        if count is None:
+            raise ValueError("fileobj must be a blocking stream.")
+        if not count:
+            break
+        if readinto is not None:
+            h.update(utils._buffer_prefix(buf, count))
+        else:
+            h.update(data)
+
+    return h.finalize()
+
+
+def hash_file(path_or_fileobj, algorithm, backend):
+    if not isinstance(path_or_fileobj, (six.text_type, bytes)):
+        return hash_stream(path_or_fileobj, algorithm, backend)
+
+    with open(path_or_fileobj, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (EnvironmentError, ValueError, OverflowError):
+            # Empty files, special files and files too large for the address
+            # space can't be mapped.
+            return hash_stream(f, algorithm, backend)
+
+        try:
+            return digest(algorithm, mapped, backend)
+        finally:
+            mapped.close()
+
+
+# RFC 6962 domain separation prefixes for leaf and interior node hashes.
+_MERKLE_LEAF_PREFIX = b"\x00"
+_MERKLE_NODE_PREFIX = b"\x01"
+
+
+def _merkle_digests(algorithm, messages, backend):
+    # Setting up a batch costs more than hashing a single short message.
+    if len(messages) == 1:
+        return [digest(algorithm, messages[0], backend)]
+    elif messages:
+        return digest_many(algorithm, messages, backend)
+    else:
+        return []
+
+
+def _merkle_leaf_hashes(algorithm, leaves, backend):
+    messages = []
+    for leaf in leaves:
+        if isinstance(leaf, six.text_type):
+            raise TypeError("leaves must be bytes or buffers.")
+        messages.append(b"".join([_MERKLE_LEAF_PREFIX, leaf]))
+    return _merkle_digests(algorithm, messages, backend)
+
+
+def _merkle_node_hashes(algorithm, pairs, backend):
+    return _merkle_digests(
+        algorithm,
+        [_MERKLE_NODE_PREFIX + left + right for left, right in pairs],
+        backend
+    )
+
+
+class MerkleTree(object):
+    def __init__(self, algorithm, backend, keep_nodes=True):
+        if not isinstance(backend, HashBackend):
+            raise UnsupportedAlgorithm(
+                "Backend object does not implement HashBackend.",
+                _Reasons.BACKEND_MISSING_INTERFACE
+            )
+
+        if not isinstance(algorithm, interfaces.HashAlgorithm):
+            raise TypeError("Expected instance of interfaces.HashAlgorithm.")
+
+        if not backend.hash_supported(algorithm):
+            raise UnsupportedAlgorithm(
+                "{0} is not a supported hash on this backend.".format(
+                    algorithm.name),
+                _Reasons.UNSUPPORTED_HASH
+            )
+
+        self._algorithm = algorithm
+        self._backend = backend
+        self._keep_nodes = keep_nodes
+        self._size = 0
+        # _levels[h] holds node hashes of the perfect subtrees with 2 ** h
+        # leaves, starting with the one at index _offsets[h]. Without
+        # keep_nodes, nodes are dropped once their parent has been computed,
+        # so each level holds at most one node.
+        self._levels = []
+        self._offsets = []
+
+    algorithm = utils.read_only_property("_algorithm")
+
+    def __len__(self):
+        return self._size
+
+    def append(self, leaf):
+        self.extend([leaf])
+
+    def extend(self, leaves):
+        nodes = _merkle_leaf_hashes(self.algorithm, leaves, self._backend)
+        self._size += len(nodes)
+        height = 0
+        # Each level of new interior nodes is hashed in a single batch.
+        while nodes:
+            if height == len(self._levels):
+                self._levels.append([])
+                self._offsets.append(0)
+
+            level = self._levels[height]
+            level.extend(nodes)
+            parents = self._level_size(height + 1)
+            start = 2 * parents - self._offsets[height]
+            end = start + 2 * ((self._level_size(height) // 2) - parents)
+            nodes = _merkle_node_hashes(
+                self.algorithm,
+                zip(level[start:end:2], level[start + 1:end:2]),
+                self._backend
+            )
+            if not self._keep_nodes:
+                del level[:end]
+                self._offsets[height] += end
+            height += 1
+
+    def root(self):
+        if self._size == 0:
+            return digest(self.algorithm, b"", self._backend)
+
+        # The tree is a sequence of perfect subtrees, one for each bit set in
+        # its size, with the largest on the left. The root of the one with
+        # 2 ** h leaves is the last node at level h.
+        root = None
+        for height, level in enumerate(self._levels):
+            if self._level_size(height) % 2:
+                if root is None:
+                    root = level[-1]
+                else:
+                    root = _merkle_node_hashes(
+                        self.algorithm, [(level[-1], root)], self._backend
+                    )[0]
+        return root
+
+    def proof(self, index):
+        if not self._keep_nodes:
+            raise ValueError(
+                "Proofs are only available when keep_nodes is True."
+            )
+
+        if not isinstance(index, six.integer_types):
+            raise TypeError("index must be an integer.")
+
+        if not 0 <= index < self._size:
+            raise ValueError("index must be in the range [0, len(tree)).")
+
+        return self._path(index, 0, self._size)
+
+    def _level_size(self, height):
+        if height == len(self._levels):
+            return 0
+        return self._offsets[height] + len(self._levels[height])
+
+    def _path(self, index, start, end):
+        # The audit path from RFC 6962, section 2.1.1.
+        if end - start == 1:
+            return []
+        split = start + _largest_power_of_two_below(end - start)
+        if index < split:
+            path = self._path(index, start, split)
+            path.append(self._subtree_root(split, end))
+        else:
+            path = self._path(index, split, end)
+            path.append(self._subtree_root(start, split))
+        return path
+
+    def _subtree_root(self, start, end):
+        size = end - start
+        if size & (size - 1) == 0:
+            height = utils.bit_length(size) - 1
+            return self._levels[height][start >> height]
+
+        split = start + _largest_power_of_two_below(size)
+        left = self._subtree_root(start, split)
+        right = self._subtree_root(split, end)
+        return _merkle_node_hashes(
+            self.algorithm, [(left, right)], self._backend
+        )[0]
+
+
+def _largest_power_of_two_below(n):
+    return 1 << (utils.bit_length(n - 1) - 1)
+
+
+def verify_merkle_proof(algorithm, leaf, index, tree_size, proof, root,
+                        backend):
+    if not isinstance(index, six.integer_types):
+        raise TypeError("index must be an integer.")
+
+    if not isinstance(tree_size, six.integer_types):
+        raise TypeError("tree_size must be an integer.")
+
+    if not 0 <= index < tree_size:
+        raise InvalidSignature("Index is outside of the tree.")
+
+    # The inclusion proof verification algorithm from RFC 9162, section
+    # 2.1.3.2.
+    node = _merkle_leaf_hashes(algorithm, [leaf], backend)[0]
+    position = index
+    last = tree_size - 1
+    for sibling in proof:
+        if last == 0:
+            raise InvalidSignature("Proof is too long.")
+
+        if position % 2 or position == last:
+            node = _merkle_node_hashes(
+                algorithm, [(sibling, node)], backend
+            )[0]
+            if position % 2 == 0:
+                while position % 2 == 0 and position != 0:
+                    position >>= 1
+                    last >>= 1
+        else:
+            node = _merkle_node_hashes(
+                algorithm, [(node, sibling)], backend
+            )[0]
+        position >>= 1
+        last >>= 1
+
+    if last != 0 or node != root:
+        raise InvalidSignature("Proof does not match the root.")
+
 
 @utils.register_interface(interfaces.HashAlgorithm)
 class SHA1(object):
@@ -110,3 +484,101 @@ class MD5(object):
     name = "md5"
     digest_size = 16
     block_size = 64
+
+
+@utils.register_interface(interfaces.HashAlgorithm)
+class BLAKE2b(object):
+    name = "blake2b"
+    _max_digest_size = 64
+    block_size = 128
+
+    def __init__(self, digest_size):
+        if digest_size != self._max_digest_size:
+            raise ValueError("Digest size must be {0}.".format(
+                self._max_digest_size
+            ))
+
+        self._digest_size = digest_size
+
+    digest_size = utils.read_only_property("_digest_size")
+
+
+@utils.register_interface(interfaces.HashAlgorithm)
+class BLAKE2s(object):
+    name = "blake2s"
+    _max_digest_size = 32
+    block_size = 64
+
+    def __init__(self, digest_size):
+        if digest_size != self._max_digest_size:
+            raise ValueError("Digest size must be {0}.".format(
+                self._max_digest_size
+            ))
+
+        self._digest_size = digest_size
+
+    digest_size = utils.read_only_property("_digest_size")
+
+
+@utils.register_interface(interfaces.HashAlgorithm)
+class SHA3_224(object):  # noqa: N801
+    name = "sha3-224"
+    digest_size = 28
+    block_size = 144
+
+
+@utils.register_interface(interfaces.HashAlgorithm)
+class SHA3_256(object):  # noqa: N801
+    name = "sha3-256"
+    digest_size = 32
+    block_size = 136
+
+
+@utils.register_interface(interfaces.HashAlgorithm)
+class SHA3_384(object):  # noqa: N801
+    name = "sha3-384"
+    digest_size = 48
+    block_size = 104
+
+
+@utils.register_interface(interfaces.HashAlgorithm)
+class SHA3_512(object):  # noqa: N801
+    name = "sha3-512"
+    digest_size = 64
+    block_size = 72
+
+
+@utils.register_interface(interfaces.ExtendableOutputFunction)
+@utils.register_interface(interfaces.HashAlgorithm)
+class SHAKE128(object):
+    name = "shake128"
+    block_size = 168
+
+    def __init__(self, digest_size):
+        if not isinstance(digest_size, six.integer_types):
+            raise TypeError("digest_size must be an integer.")
+
+        if digest_size < 1:
+            raise ValueError("digest_size must be a positive integer.")
+
+        self._digest_size = digest_size
+
+    digest_size = utils.read_only_property("_digest_size")
+
+
+@utils.register_interface(interfaces.ExtendableOutputFunction)
+@utils.register_interface(interfaces.HashAlgorithm)
+class SHAKE256(object):
+    name = "shake256"
+    block_size = 136
+
+    def __init__(self, digest_size):
+        if not isinstance(digest_size, six.integer_types):
+            raise TypeError("digest_size must be an integer.")
+
+        if digest_size < 1:
+            raise ValueError("digest_size must be a positive integer.")
+
+        self._digest_size = digest_size
+
+    digest_size = utils.read_only_property("_digest_size")
@@ -10,6 +10,7 @@ from cryptography.exceptions import (
 )
 from cryptography.hazmat.backends.interfaces import HMACBackend
 from cryptography.hazmat.primitives import interfaces
+from cryptography.hazmat.primitives._mac import _MACKey
 
 
 @utils.register_interface(interfaces.MACContext)
@@ -67,3 +68,44 @@ class HMAC(object):
 
         ctx, self._ctx = self._ctx, None
         ctx.verify(signature)
+
+
+class HMACKey(_MACKey):
+    """
+    Keys an HMAC context once and clones it for every message, so the inner
+    and outer key pads are not recomputed each time the key is used.
+    """
+    def __init__(self, key, algorithm, backend):
+        if not isinstance(backend, HMACBackend):
+            raise UnsupportedAlgorithm(
+                "Backend object does not implement HMACBackend.",
+                _Reasons.BACKEND_MISSING_INTERFACE
+            )
+
+        if not isinstance(algorithm, interfaces.HashAlgorithm):
+            raise TypeError("Expected instance of interfaces.HashAlgorithm.")
+        self._algorithm = algorithm
+
+        self._backend = backend
+        self._key = key
+        super(HMACKey, self).__init__(
+            self._backend.create_hmac_ctx(key, self.algorithm)
+        )
+
+    algorithm = utils.read_only_property("_algorithm")
+
+    def hmac(self):
+        return HMAC(
+            self._key,
+            self.algorithm,
+            backend=self._backend,
+            ctx=self._ctx.copy()
+        )
+
+
+def mac_many(key, algorithm, messages, backend):
+    return HMACKey(key, algorithm, backend).mac_many(messages)
+
+
+def verify_many(key, algorithm, pairs, backend):
+    return HMACKey(key, algorithm, backend).verify_many(pairs)
@@ -67,6 +67,15 @@ class ModeWithNonce(object):
         """
 
 
+@six.add_metaclass(abc.ABCMeta)
+class ModeWithTweak(object):
+    @abc.abstractproperty
+    def tweak(self):
+        """
+        The value of the tweak for this mode as bytes.
+        """
+
+
 @six.add_metaclass(abc.ABCMeta)
 class ModeWithAuthenticationTag(object):
     @abc.abstractproperty
@@ -85,6 +94,13 @@ class CipherContext(object):
         as bytes.
         """
 
+    @abc.abstractmethod
+    def update_into(self, data, buf):
+        """
+        Processes the provided bytes and writes the resulting data into the
+        provided buffer. Returns the number of bytes written.
+        """
+
     @abc.abstractmethod
     def finalize(self):
         """
@@ -147,6 +163,13 @@ class HashAlgorithm(object):
         """
 
 
+@six.add_metaclass(abc.ABCMeta)
+class ExtendableOutputFunction(object):
+    """
+    A HashAlgorithm whose output can be extended to any length.
+    """
+
+
 @six.add_metaclass(abc.ABCMeta)
 class HashContext(object):
     @abc.abstractproperty
@@ -174,6 +197,34 @@ class HashContext(object):
         """
 
 
+@six.add_metaclass(abc.ABCMeta)
+class XOFContext(object):
+    @abc.abstractproperty
+    def algorithm(self):
+        """
+        An ExtendableOutputFunction that will be used by this context.
+        """
+
+    @abc.abstractmethod
+    def update(self, data):
+        """
+        Processes the provided bytes through the function.
+        """
+
+    @abc.abstractmethod
+    def squeeze_into(self, buf):
+        """
+        Writes the next len(buf) bytes of output into the provided buffer and
+        returns the number of bytes written.
+        """
+
+    @abc.abstractmethod
+    def copy(self):
+        """
+        Return an XOFContext that is a copy of the current context.
+        """
+
+
 @six.add_metaclass(abc.ABCMeta)
 class RSAPrivateKey(object):
     @abc.abstractmethod
@@ -87,18 +87,8 @@ class HKDFExpand(object):
         self._used = False
 
     def _expand(self, key_material):
-        output = [b""]
-        counter = 1
-
-        while (self._algorithm.digest_size // 8) * len(output) < self._length:
-            h = hmac.HMAC(key_material, self._algorithm, backend=self._backend)
-            h.update(output[-1])
-            h.update(self._info)
-            h.update(six.int2byte(counter))
-            output.append(h.finalize())
-            counter += 1
-
-        return b"".join(output)[:self._length]
+        key = hmac.HMACKey(key_material, self._algorithm, self._backend)
+        return _expand(key, self._info, self._length)
 
     def derive(self, key_material):
         if not isinstance(key_material, bytes):
@@ -113,3 +103,55 @@ class HKDFExpand(object):
     def verify(self, key_material, expected_key):
         if not constant_time.bytes_eq(self.derive(key_material), expected_key):
             raise InvalidKey
+
+
+def _expand(key, info, length):
+    # Only the blocks that contribute to the output are computed, each with
+    # a clone of the same keyed HMAC state.
+    blocks = -(-length // key.algorithm.digest_size)
+    output = []
+    block = b""
+    for counter in six.moves.range(1, blocks + 1):
+        block = key.mac(block + info + six.int2byte(counter))
+        output.append(block)
+
+    return b"".join(output)[:length]
+
+
+def derive_many(algorithm, salt, key_material, infos, backend):
+    if not isinstance(backend, HMACBackend):
+        raise UnsupportedAlgorithm(
+            "Backend object does not implement HMACBackend.",
+            _Reasons.BACKEND_MISSING_INTERFACE
+        )
+
+    if not isinstance(salt, bytes) and salt is not None:
+        raise TypeError("salt must be bytes.")
+
+    if salt is None:
+        salt = b"\x00" * (algorithm.digest_size // 8)
+
+    if not isinstance(key_material, bytes):
+        raise TypeError("key_material must be bytes.")
+
+    max_length = 255 * (algorithm.digest_size // 8)
+    infos = dict(infos)
+    for info, length in infos.items():
+        if not isinstance(info, bytes):
+            raise TypeError("info must be bytes.")
+
+        if not isinstance(length, six.integer_types):
+            raise TypeError("length must be an integer.")
+
+        if length < 0 or length > max_length:
+            raise ValueError(
+                "Can not derive keys larger than {0} octets.".format(
+                    max_length
+                ))
+
+    prk = hmac.HMACKey(salt, algorithm, backend).mac(key_material)
+    key = hmac.HMACKey(prk, algorithm, backend)
+    return dict(
+        (info, _expand(key, info, length))
+        for info, length in infos.items()
+    )
@@ -4,6 +4,10 @@
 
 from __future__ import absolute_import, division, print_function
 
+import timeit
+
+import six
+
 from cryptography import utils
 from cryptography.exceptions import (
     AlreadyFinalized, InvalidKey, UnsupportedAlgorithm, _Reasons
@@ -12,21 +16,43 @@ from cryptography.hazmat.backends.interfaces import PBKDF2HMACBackend
 from cryptography.hazmat.primitives import constant_time, interfaces
 
 
+# Calibration doubles the iteration count until a single derivation takes at
+# least this long, so that timer resolution does not skew the measured rate.
+_CALIBRATION_MIN_SECONDS = 0.05
+_CALIBRATION_START_ITERATIONS = 1000
+
+# Measured iterations per second, keyed by (backend, algorithm name, length).
+_calibrated_rates = {}
+
+_clock = timeit.default_timer
+
+
+def _check_params(algorithm, length, backend):
+    if not isinstance(backend, PBKDF2HMACBackend):
+        raise UnsupportedAlgorithm(
+            "Backend object does not implement PBKDF2HMACBackend.",
+            _Reasons.BACKEND_MISSING_INTERFACE
+        )
+
+    if not backend.pbkdf2_hmac_supported(algorithm):
+        raise UnsupportedAlgorithm(
+            "{0} is not supported for PBKDF2 by this backend.".format(
+                algorithm.name),
+            _Reasons.UNSUPPORTED_HASH
+        )
+
+    # RFC 2898 limits the derived key to 2**32 - 1 blocks.
+    max_length = (2 ** 32 - 1) * algorithm.digest_size
+    if length > max_length:
+        raise ValueError(
+            "Can not derive keys larger than {0} octets.".format(max_length)
+        )
+
+
 @utils.register_interface(interfaces.KeyDerivationFunction)
 class PBKDF2HMAC(object):
     def __init__(self, algorithm, length, salt, iterations, backend):
-        if not isinstance(backend, PBKDF2HMACBackend):
-            raise UnsupportedAlgorithm(
-                "Backend object does not implement PBKDF2HMACBackend.",
-                _Reasons.BACKEND_MISSING_INTERFACE
-            )
-
-        if not backend.pbkdf2_hmac_supported(algorithm):
-            raise UnsupportedAlgorithm(
-                "{0} is not supported for PBKDF2 by this backend.".format(
-                    algorithm.name),
-                _Reasons.UNSUPPORTED_HASH
-            )
+        _check_params(algorithm, length, backend)
         self._used = False
         self._algorithm = algorithm
         self._length = length
@@ -36,6 +62,25 @@ class PBKDF2HMAC(object):
         self._iterations = iterations
         self._backend = backend
 
+    @classmethod
+    def calibrate(cls, algorithm, length, target_seconds, backend):
+        _check_params(algorithm, length, backend)
+
+        if not isinstance(target_seconds, six.integer_types + (float,)):
+            raise TypeError("target_seconds must be a number.")
+
+        if target_seconds <= 0:
+            raise ValueError("target_seconds must be positive.")
+
+        key = (backend, algorithm.name, length)
+        rate = _calibrated_rates.get(key)
+        if rate is None:
+            rate = _calibrated_rates[key] = _measure_rate(
+                algorithm, length, backend
+            )
+
+        return max(1, int(rate * target_seconds))
+
     def derive(self, key_material):
         if self._used:
             raise AlreadyFinalized("PBKDF2 instances can only be used once.")
@@ -55,3 +100,50 @@ class PBKDF2HMAC(object):
         derived_key = self.derive(key_material)
         if not constant_time.bytes_eq(derived_key, expected_key):
             raise InvalidKey("Keys do not match.")
+
+
+def _measure_rate(algorithm, length, backend):
+    iterations = _CALIBRATION_START_ITERATIONS
+    while True:
+        start = _clock()
+        backend.derive_pbkdf2_hmac(
+            algorithm, length, b"\x00" * 16, iterations, b"calibration"
+        )
+        elapsed = _clock() - start
+        if elapsed >= _CALIBRATION_MIN_SECONDS:
+            return iterations / elapsed
+        iterations *= 2
+
+
+def derive_many(algorithm, length, iterations, pairs, backend, workers=None,
+                progress=None):
+    _check_params(algorithm, length, backend)
+
+    if workers is not None:
+        if not isinstance(workers, six.integer_types):
+            raise TypeError("workers must be an integer.")
+        if workers < 1:
+            raise ValueError("workers must be at least 1.")
+
+    pairs = list(pairs)
+    for key_material, salt in pairs:
+        if not isinstance(key_material, bytes):
+            raise TypeError("key_material must be bytes.")
+        if not isinstance(salt, bytes):
+            raise TypeError("salt must be bytes.")
+
+    def derive(pair):
+        key_material, salt = pair
+        return backend.derive_pbkdf2_hmac(
+            algorithm, length, salt, iterations, key_material
+        )
+
+    # Each derivation spends nearly all of its time in a single call into
+    # the backend, which cffi makes without holding the GIL.
+    keys = []
+    for key in utils._parallel_imap(derive, pairs, workers):
+        keys.append(key)
+        if progress is not None:
+            progress(len(keys), len(pairs))
+
+    return keys
@@ -0,0 +1,88 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import six
+
+from cryptography import utils
+from cryptography.exceptions import (
+    AlreadyFinalized, InvalidKey, UnsupportedAlgorithm, _Reasons
+)
+from cryptography.hazmat.backends.interfaces import ScryptBackend
+from cryptography.hazmat.primitives import constant_time, interfaces
+
+
+# The same default memory limit as OpenSSL's EVP_PBE_scrypt.
+_DEFAULT_MAXMEM = 32 * 1024 * 1024
+
+
+@utils.register_interface(interfaces.KeyDerivationFunction)
+class Scrypt(object):
+    def __init__(self, salt, length, n, r, p, backend, maxmem=None):
+        if not isinstance(backend, ScryptBackend):
+            raise UnsupportedAlgorithm(
+                "Backend object does not implement ScryptBackend.",
+                _Reasons.BACKEND_MISSING_INTERFACE
+            )
+
+        if not isinstance(salt, bytes):
+            raise TypeError("salt must be bytes.")
+
+        for name, value in [("length", length), ("n", n), ("r", r), ("p", p)]:
+            if not isinstance(value, six.integer_types):
+                raise TypeError("{0} must be an integer.".format(name))
+
+        if n < 2 or (n & (n - 1)) != 0:
+            raise ValueError("n must be greater than 1 and be a power of 2.")
+
+        if r < 1:
+            raise ValueError("r must be greater than or equal to 1.")
+
+        if p < 1:
+            raise ValueError("p must be greater than or equal to 1.")
+
+        if n >= 1 << (16 * r):
+            raise ValueError("n must be less than 2 ** (16 * r).")
+
+        if maxmem is None:
+            maxmem = _DEFAULT_MAXMEM
+
+        if not isinstance(maxmem, six.integer_types):
+            raise TypeError("maxmem must be an integer.")
+
+        # Checking the memory cost up front means that parameters which would
+        # exhaust memory are rejected before any work is done.
+        memory = 128 * r * (n + 2) + 128 * r * p
+        if memory > maxmem:
+            raise ValueError(
+                "These parameters require {0} bytes of memory, which is more "
+                "than maxmem ({1}).".format(memory, maxmem)
+            )
+
+        self._used = False
+        self._salt = salt
+        self._length = length
+        self._n = n
+        self._r = r
+        self._p = p
+        self._maxmem = maxmem
+        self._backend = backend
+
+    def derive(self, key_material):
+        if self._used:
+            raise AlreadyFinalized("Scrypt instances can only be used once.")
+        self._used = True
+
+        if not isinstance(key_material, bytes):
+            raise TypeError("key_material must be bytes.")
+        return self._backend.derive_scrypt(
+            key_material, self._salt, self._length, self._n, self._r,
+            self._p, self._maxmem
+        )
+
+    def verify(self, key_material, expected_key):
+        derived_key = self.derive(key_material)
+        if not constant_time.bytes_eq(derived_key, expected_key):
+            raise InvalidKey("Keys do not match.")
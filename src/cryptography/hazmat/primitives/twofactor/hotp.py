@@ -40,6 +40,7 @@ class HOTP(object):
         self._length = length
         self._algorithm = algorithm
         self._backend = backend
+        self._hmac_key = hmac.HMACKey(key, algorithm, backend)
 
     def generate(self, counter):
         truncated_value = self._dynamic_truncate(counter)
@@ -51,9 +52,7 @@ class HOTP(object):
             raise InvalidToken("Supplied HOTP value does not match.")
 
     def _dynamic_truncate(self, counter):
-        ctx = hmac.HMAC(self._key, self._algorithm, self._backend)
-        ctx.update(struct.pack(">Q", counter))
-        hmac_value = ctx.finalize()
+        hmac_value = self._hmac_key.mac(struct.pack(">Q", counter))
 
         offset = six.indexbytes(hmac_value, len(hmac_value) - 1) & 0b1111
         p = hmac_value[offset:offset + 4]
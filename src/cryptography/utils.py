@@ -5,8 +5,13 @@
 from __future__ import absolute_import, division, print_function
 
 import abc
+import atexit
 import inspect
+import multiprocessing
+import os
 import sys
+import threading
+from multiprocessing.pool import ThreadPool
 
 
 DeprecatedIn06 = DeprecationWarning
@@ -53,3 +58,136 @@ def bit_length(x):
         return x.bit_length()
     else:
         return len(bin(x)) - (2 + (x <= 0))
+
+
+def _from_buffer(ffi, data):
+    """
+    Returns a cdata view of a buffer protocol object without copying it. The
+    length of the view is the size of the buffer in bytes, which differs from
+    len(data) for buffers whose items are wider than one byte.
+    """
+    try:
+        return ffi.from_buffer(data)
+    except TypeError:
+        # cffi before 1.8 refuses to expose the contents of a bytes object.
+        if not isinstance(data, bytes):
+            raise
+        return ffi.new("char[{0}]".format(len(data)), data)
+
+
+def _from_writable_buffer(ffi, buf):
+    """
+    Returns a cdata view of a writable buffer protocol object, raising
+    TypeError if it is read-only so that C code never writes into immutable
+    objects such as bytes.
+    """
+    if isinstance(buf, bytes) or memoryview(buf).readonly:
+        raise TypeError("buf must be a writable buffer.")
+    return ffi.from_buffer(buf)
+
+
+def _buffer_prefix(buf, length):
+    """
+    Returns the first length bytes of buf, without copying where possible.
+    """
+    if length == len(buf):
+        return buf
+    try:
+        return memoryview(buf)[:length]
+    except NameError:
+        # Python 2.6 has no memoryview.
+        return buf[:length]
+
+
+_thread_pool = None
+_thread_pool_lock = threading.Lock()
+_thread_pool_pid = None
+_worker_state = threading.local()
+
+
+def _cpu_count():
+    try:
+        return multiprocessing.cpu_count()
+    except NotImplementedError:
+        return 1
+
+
+def _get_thread_pool():
+    global _thread_pool, _thread_pool_lock, _thread_pool_pid
+
+    pid = os.getpid()
+    if _thread_pool_pid is not None and _thread_pool_pid != pid:
+        # A forked child inherits the pool but none of its threads, and the
+        # lock may have been held by a thread that no longer exists.
+        _thread_pool = None
+        _thread_pool_lock = threading.Lock()
+        _thread_pool_pid = None
+
+    with _thread_pool_lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPool(_cpu_count())
+            _thread_pool_pid = pid
+            atexit.register(_thread_pool.close)
+        return _thread_pool
+
+
+def _parallel_enabled():
+    """
+    Returns whether _parallel_map would spread work over more than one
+    thread. Work submitted from one of the pool's own threads runs serially,
+    since waiting on the fixed size pool from inside it could deadlock.
+    """
+    return _cpu_count() > 1 and not getattr(_worker_state, "active", False)
+
+
+def _parallel_map(func, iterable):
+    """
+    Calls func on each item of iterable using a shared pool of threads and
+    returns the results in order. cffi releases the GIL for the duration of
+    each call into C, so CPU bound work done by a backend runs concurrently.
+    """
+    items = list(iterable)
+    if len(items) <= 1 or not _parallel_enabled():
+        return [func(item) for item in items]
+
+    return _get_thread_pool().map(_in_worker(func), items)
+
+
+def _parallel_imap(func, iterable, workers=None):
+    """
+    Like _parallel_map, but yields the results in order as they become
+    available so that the caller can report progress. If workers is given a
+    pool of that many threads is used for this call instead of the shared
+    pool.
+    """
+    items = list(iterable)
+    if workers is None:
+        workers = _cpu_count()
+    if (len(items) <= 1 or workers <= 1 or
+            getattr(_worker_state, "active", False)):
+        for item in items:
+            yield func(item)
+        return
+
+    if workers == _cpu_count():
+        for result in _get_thread_pool().imap(_in_worker(func), items):
+            yield result
+        return
+
+    pool = ThreadPool(workers)
+    try:
+        for result in pool.imap(_in_worker(func), items):
+            yield result
+    finally:
+        pool.terminate()
+
+
+def _in_worker(func):
+    def call(item):
+        _worker_state.active = True
+        try:
+            return func(item)
+        finally:
+            _worker_state.active = False
+
+    return call
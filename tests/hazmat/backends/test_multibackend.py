@@ -4,6 +4,8 @@
 
 from __future__ import absolute_import, division, print_function
 
+import pretend
+
 import pytest
 
 from cryptography import utils
@@ -11,15 +13,17 @@ from cryptography.exceptions import (
     UnsupportedAlgorithm, _Reasons
 )
 from cryptography.hazmat.backends.interfaces import (
-    CMACBackend, CipherBackend, DSABackend, EllipticCurveBackend, HMACBackend,
-    HashBackend, PBKDF2HMACBackend, PEMSerializationBackend,
-    PKCS8SerializationBackend, RSABackend,
-    TraditionalOpenSSLSerializationBackend, X509Backend
+    AEADBackend, CBCHMACBackend, CMACBackend, CipherBackend, DSABackend,
+    EllipticCurveBackend, HMACBackend, HashBackend, HashDigestBackend,
+    PBKDF2HMACBackend, PEMSerializationBackend, PKCS8SerializationBackend,
+    RSABackend, ScryptBackend, TraditionalOpenSSLSerializationBackend,
+    X509Backend, XOFBackend
 )
 from cryptography.hazmat.backends.multibackend import MultiBackend
 from cryptography.hazmat.primitives import cmac, hashes, hmac
 from cryptography.hazmat.primitives.asymmetric import ec, padding
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 from ...utils import raises_unsupported_algorithm
 
@@ -41,6 +45,33 @@ class DummyCipherBackend(object):
             raise UnsupportedAlgorithm("", _Reasons.UNSUPPORTED_CIPHER)
 
 
+@utils.register_interface(AEADBackend)
+class DummyAEADBackend(object):
+    def __init__(self, supported_ciphers):
+        self._ciphers = supported_ciphers
+
+    def aead_cipher_supported(self, cipher, mode):
+        return (type(cipher), mode) in self._ciphers
+
+    def create_aead_ctx(self, cipher, mode):
+        if not self.aead_cipher_supported(cipher, mode):
+            raise UnsupportedAlgorithm("", _Reasons.UNSUPPORTED_CIPHER)
+
+
+@utils.register_interface(CBCHMACBackend)
+class DummyCBCHMACBackend(object):
+    def __init__(self, supported):
+        self._supported = supported
+
+    def cbc_hmac_supported(self, cipher, algorithm):
+        return (type(cipher), type(algorithm)) in self._supported
+
+    def cbc_hmac_encrypt(self, cipher, iv, mac_key, algorithm,
+                         associated_data, data):
+        if not self.cbc_hmac_supported(cipher, algorithm):
+            raise UnsupportedAlgorithm("", _Reasons.UNSUPPORTED_CIPHER)
+
+
 @utils.register_interface(HashBackend)
 class DummyHashBackend(object):
     def __init__(self, supported_algorithms):
@@ -54,6 +85,28 @@ class DummyHashBackend(object):
             raise UnsupportedAlgorithm("", _Reasons.UNSUPPORTED_HASH)
 
 
+@utils.register_interface(HashDigestBackend)
+class DummyHashDigestBackend(DummyHashBackend):
+    def hash_digest(self, algorithm, data):
+        if not self.hash_supported(algorithm):
+            raise UnsupportedAlgorithm("", _Reasons.UNSUPPORTED_HASH)
+        return b"one-shot"
+
+    def hash_digest_many(self, algorithm, messages):
+        return [self.hash_digest(algorithm, m) for m in messages]
+
+
+@utils.register_interface(XOFBackend)
+class DummyXOFBackend(DummyHashBackend):
+    def xof_supported(self, algorithm):
+        return self.hash_supported(algorithm)
+
+    def create_xof_ctx(self, algorithm):
+        if not self.xof_supported(algorithm):
+            raise UnsupportedAlgorithm("", _Reasons.UNSUPPORTED_HASH)
+        return pretend.stub(algorithm=algorithm)
+
+
 @utils.register_interface(HMACBackend)
 class DummyHMACBackend(object):
     def __init__(self, supported_algorithms):
@@ -81,6 +134,12 @@ class DummyPBKDF2HMACBackend(object):
             raise UnsupportedAlgorithm("", _Reasons.UNSUPPORTED_HASH)
 
 
+@utils.register_interface(ScryptBackend)
+class DummyScryptBackend(object):
+    def derive_scrypt(self, key_material, salt, length, n, r, p, maxmem):
+        return b"\x00" * length
+
+
 @utils.register_interface(RSABackend)
 class DummyRSABackend(object):
     def generate_rsa_private_key(self, public_exponent, key_size):
@@ -242,6 +301,47 @@ class TestMultiBackend(object):
         with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_CIPHER):
             cipher.decryptor()
 
+    def test_aead(self):
+        backend = MultiBackend([
+            DummyAEADBackend([
+                (algorithms.AES, modes.GCM),
+            ])
+        ])
+        assert backend.aead_cipher_supported(
+            algorithms.AES(b"\x00" * 16), modes.GCM
+        )
+        assert not backend.aead_cipher_supported(
+            algorithms.Camellia(b"\x00" * 16), modes.GCM
+        )
+
+        AESGCM(b"\x00" * 16, backend)
+
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_CIPHER):
+            backend.create_aead_ctx(algorithms.Camellia(b"\x00" * 16),
+                                    modes.GCM)
+
+    def test_cbc_hmac(self):
+        backend = MultiBackend([
+            DummyCBCHMACBackend([(algorithms.AES, hashes.SHA256)])
+        ])
+        assert backend.cbc_hmac_supported(
+            algorithms.AES(b"\x00" * 16), hashes.SHA256()
+        )
+        assert not backend.cbc_hmac_supported(
+            algorithms.AES(b"\x00" * 16), hashes.SHA1()
+        )
+
+        backend.cbc_hmac_encrypt(
+            algorithms.AES(b"\x00" * 16), b"\x00" * 16, b"key",
+            hashes.SHA256(), b"", b"data"
+        )
+
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_CIPHER):
+            backend.cbc_hmac_encrypt(
+                algorithms.AES(b"\x00" * 16), b"\x00" * 16, b"key",
+                hashes.SHA1(), b"", b"data"
+            )
+
     def test_hashes(self):
         backend = MultiBackend([
             DummyHashBackend([hashes.MD5])
@@ -253,6 +353,43 @@ class TestMultiBackend(object):
         with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
             hashes.Hash(hashes.SHA1(), backend=backend)
 
+    def test_hash_digest(self):
+        ctx = pretend.stub(
+            update=lambda data: None, finalize=lambda: b"context"
+        )
+        context_backend = DummyHashBackend([hashes.MD5])
+        context_backend.create_hash_ctx = lambda algorithm: ctx
+        backend = MultiBackend([
+            context_backend, DummyHashDigestBackend([hashes.MD5, hashes.SHA1])
+        ])
+        assert hashes.digest(hashes.MD5(), b"", backend) == b"context"
+        assert hashes.digest(hashes.SHA1(), b"", backend) == b"one-shot"
+        assert hashes.digest_many(
+            hashes.MD5(), [b"", b""], backend
+        ) == [b"context"] * 2
+        assert hashes.digest_many(
+            hashes.SHA1(), [b""], backend
+        ) == [b"one-shot"]
+
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hashes.digest(hashes.SHA256(), b"", backend)
+
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hashes.digest_many(hashes.SHA256(), [b""], backend)
+
+    def test_xof(self):
+        backend = MultiBackend([
+            DummyHashBackend([hashes.SHAKE128]),
+            DummyXOFBackend([hashes.SHAKE256]),
+        ])
+        assert backend.xof_supported(hashes.SHAKE256(32))
+        assert not backend.xof_supported(hashes.SHAKE128(32))
+        h = hashes.XOFHash(hashes.SHAKE256(32), backend)
+        assert h._ctx.algorithm is h.algorithm
+
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hashes.XOFHash(hashes.SHAKE128(32), backend)
+
     def test_hmac(self):
         backend = MultiBackend([
             DummyHMACBackend([hashes.MD5])
@@ -275,6 +412,18 @@ class TestMultiBackend(object):
         with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
             backend.derive_pbkdf2_hmac(hashes.SHA1(), 10, b"", 10, b"")
 
+    def test_scrypt(self):
+        backend = MultiBackend([DummyScryptBackend()])
+        assert backend.derive_scrypt(
+            b"", b"", 10, 16, 1, 1, 1024 * 1024
+        ) == b"\x00" * 10
+
+        backend = MultiBackend([])
+        with raises_unsupported_algorithm(
+            _Reasons.BACKEND_MISSING_INTERFACE
+        ):
+            backend.derive_scrypt(b"", b"", 10, 16, 1, 1, 1024 * 1024)
+
     def test_rsa(self):
         backend = MultiBackend([
             DummyRSABackend()
@@ -4,28 +4,45 @@
 
 from __future__ import absolute_import, division, print_function
 
+import array
+import binascii
 import os
+import signal
 import subprocess
 import sys
 import textwrap
+import time
 
 import pretend
 
 import pytest
 
+import six
+
 from cryptography import utils
-from cryptography.exceptions import InternalError, _Reasons
+from cryptography.exceptions import InternalError, InvalidTag, _Reasons
 from cryptography.hazmat.backends.interfaces import EllipticCurveBackend
+from cryptography.hazmat.backends.openssl import cbc_hmac
+from cryptography.hazmat.backends.openssl import hashes as openssl_hashes
 from cryptography.hazmat.backends.openssl.backend import (
     Backend, backend
 )
+from cryptography.hazmat.backends.openssl.ciphers import (
+    _CipherContext, _CipherContextPool
+)
 from cryptography.hazmat.backends.openssl.ec import _sn_to_elliptic_curve
-from cryptography.hazmat.primitives import hashes, interfaces
+from cryptography.hazmat.primitives import hashes, hmac, interfaces
 from cryptography.hazmat.primitives.asymmetric import dsa, ec, padding
 from cryptography.hazmat.primitives.ciphers import Cipher
-from cryptography.hazmat.primitives.ciphers.algorithms import AES
-from cryptography.hazmat.primitives.ciphers.modes import CBC, CTR
+from cryptography.hazmat.primitives.ciphers.aead import (
+    _ChaCha20Poly1305Algorithm
+)
+from cryptography.hazmat.primitives.ciphers.algorithms import (
+    AES, ARC4, Camellia
+)
+from cryptography.hazmat.primitives.ciphers.modes import CBC, CTR, GCM
 from cryptography.hazmat.primitives.interfaces import BlockCipherAlgorithm
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
 
 from ..primitives.fixtures_rsa import RSA_KEY_512
 from ..primitives.test_ec import _skip_curve_unsupported
@@ -85,6 +102,56 @@ class TestOpenSSL(object):
         assert backend.cipher_supported(AES(b"\x00" * 16),
                                         CTR(b"\x00" * 16)) is True
 
+    def test_evp_cipher_cached(self):
+        b = Backend()
+        calls = []
+
+        def adapter(backend, cipher, mode):
+            calls.append((cipher, mode))
+            return backend._lib.EVP_get_cipherbyname(b"aes-128-cbc")
+
+        b.register_cipher_adapter(DummyCipher, DummyMode, adapter)
+        evp_cipher = b._evp_cipher(DummyCipher(), DummyMode())
+        assert evp_cipher != b._ffi.NULL
+        assert b._evp_cipher(DummyCipher(), DummyMode) == evp_cipher
+        assert len(calls) == 1
+
+    def test_evp_cipher_null_not_cached(self):
+        b = Backend()
+        calls = []
+
+        def adapter(backend, cipher, mode):
+            calls.append((cipher, mode))
+            return backend._ffi.NULL
+
+        b.register_cipher_adapter(DummyCipher, DummyMode, adapter)
+        assert b._evp_cipher(DummyCipher(), DummyMode()) == b._ffi.NULL
+        assert b._evp_cipher(DummyCipher(), DummyMode()) == b._ffi.NULL
+        assert len(calls) == 2
+
+    def test_evp_md_cached(self):
+        b = Backend()
+        evp_md = b._evp_md(hashes.SHA256())
+        assert evp_md != b._ffi.NULL
+        assert b._evp_md(hashes.SHA256()) == evp_md
+        assert b._evp_md_cache == {"sha256": evp_md}
+        assert b._evp_md(DummyHash()) == b._ffi.NULL
+        assert "dummy-hash" not in b._evp_md_cache
+
+    @pytest.mark.parametrize(
+        ("algorithm", "name"),
+        [
+            (hashes.BLAKE2b(64), b"blake2b512"),
+            (hashes.BLAKE2s(32), b"blake2s256"),
+        ]
+    )
+    def test_blake2_names(self, algorithm, name):
+        expected = backend._lib.EVP_get_digestbyname(name)
+        assert backend._evp_md(algorithm) == expected
+        assert backend.hash_supported(algorithm) is (
+            expected != backend._ffi.NULL
+        )
+
     def test_register_duplicate_cipher_adapter(self):
         with pytest.raises(ValueError):
             backend.register_cipher_adapter(AES, CBC, None)
@@ -436,6 +503,437 @@ class TestOpenSSLCMAC(object):
             backend.create_cmac_ctx(FakeAlgorithm())
 
 
+class TestOpenSSLMACMany(object):
+    def _contexts(self):
+        contexts = [backend.create_hmac_ctx(b"k" * 16, hashes.SHA256())]
+        if backend.cmac_algorithm_supported(AES(b"k" * 16)):
+            contexts.append(backend.create_cmac_ctx(AES(b"k" * 16)))
+        return contexts
+
+    def test_lengths_from_buffers(self):
+        words = array.array("I", range(8))
+        for ctx in self._contexts():
+            copy = ctx.copy()
+            copy.update(words.tobytes())
+            mac = copy.finalize()
+            assert ctx.mac_many([words, b""])[0] == mac
+            assert ctx.verify_many(
+                [words, words], [mac, bytearray(mac[:-1])]
+            ) == [True, False]
+
+    def test_empty(self):
+        for ctx in self._contexts():
+            assert ctx.mac_many([]) == []
+            assert ctx.verify_many([], []) == []
+
+
+class TestOpenSSLChaCha20Poly1305(object):
+    def test_not_a_cipher(self):
+        algorithm = _ChaCha20Poly1305Algorithm(b"\x00" * 32)
+        assert backend.cipher_supported(algorithm, None) is False
+        cipher = Cipher(algorithm, None, backend=backend)
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_CIPHER):
+            cipher.encryptor()
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_CIPHER):
+            cipher.decryptor()
+
+
+class TestOpenSSLScrypt(object):
+    def test_requires_evp_pbe_scrypt(self, monkeypatch):
+        monkeypatch.setattr(backend._lib, "Cryptography_HAS_SCRYPT", 0)
+        assert backend.scrypt_supported() is False
+        scrypt = Scrypt(b"salt", 64, 1024, 8, 1, backend)
+        with raises_unsupported_algorithm(None):
+            scrypt.derive(b"password")
+
+
+class TestOpenSSLCipherContextPool(object):
+    def test_pool_info(self):
+        pool = _CipherContextPool(maxsize=2)
+        assert pool.info() == (0, 0, 2, 0)
+        assert pool.acquire("key") is None
+        pool.release("key", "ctx")
+        assert pool.acquire("key") == "ctx"
+        info = pool.info()
+        assert info.hits == 1
+        assert info.misses == 1
+        assert info.maxsize == 2
+        assert info.currsize == 0
+
+    def test_lru_eviction(self):
+        pool = _CipherContextPool(maxsize=2)
+        pool.release("a", "ctx-a")
+        pool.release("b", "ctx-b")
+        assert pool.acquire("a") == "ctx-a"
+        pool.release("a", "ctx-a")
+        pool.release("c", "ctx-c")
+        assert pool.info().currsize == 2
+        assert pool.acquire("b") is None
+        assert pool.acquire("a") == "ctx-a"
+        assert pool.acquire("c") == "ctx-c"
+
+    def test_evict_after_draining_key(self):
+        pool = _CipherContextPool(maxsize=1)
+        pool.release("a", "ctx-a")
+        assert pool.acquire("a") == "ctx-a"
+        pool.release("b", "ctx-b")
+        pool.release("c", "ctx-c")
+        assert pool.info().currsize == 1
+        assert pool.acquire("c") == "ctx-c"
+
+    def test_disabled_pool(self):
+        pool = _CipherContextPool(maxsize=0)
+        pool.release("a", "ctx-a")
+        assert pool.info().currsize == 0
+        assert pool.acquire("a") is None
+
+    def test_clear(self):
+        pool = _CipherContextPool()
+        pool.release("a", "ctx-a")
+        pool.clear()
+        assert pool.info().currsize == 0
+        assert pool.acquire("a") is None
+
+    def test_not_poolable(self):
+        assert _CipherContextPool.key_for(
+            ARC4(b"\x00" * 16), None, 1
+        ) is None
+        assert _CipherContextPool.key_for(
+            AES(b"\x00" * 16), CBC(b"\x00" * 16), 1
+        ) is not None
+
+    def test_context_reused(self):
+        key = os.urandom(16)
+        cipher = Cipher(AES(key), CBC(b"\x00" * 16), backend=backend)
+        enc = cipher.encryptor()
+        ct1 = enc.update(b"\x01" * 32) + enc.finalize()
+
+        before = backend.cipher_context_pool_info()
+        cipher = Cipher(AES(key), CBC(b"\x02" * 16), backend=backend)
+        enc = cipher.encryptor()
+        ct2 = enc.update(b"\x01" * 32) + enc.finalize()
+        after = backend.cipher_context_pool_info()
+        assert after.hits == before.hits + 1
+
+        cipher = Cipher(AES(key), CBC(b"\x02" * 16), backend=backend)
+        dec = cipher.decryptor()
+        assert dec.update(ct2) + dec.finalize() == b"\x01" * 32
+        cipher = Cipher(AES(key), CBC(b"\x00" * 16), backend=backend)
+        dec = cipher.decryptor()
+        assert dec.update(ct1) + dec.finalize() == b"\x01" * 32
+
+    def test_partial_context_not_reused(self):
+        key = os.urandom(16)
+        cipher = Cipher(AES(key), CBC(b"\x00" * 16), backend=backend)
+        enc = cipher.encryptor()
+        enc.update(b"\x01" * 15)
+        with pytest.raises(ValueError):
+            enc.finalize()
+
+        enc = cipher.encryptor()
+        ct = enc.update(b"\x01" * 16) + enc.finalize()
+        enc = cipher.encryptor()
+        assert enc.update(b"\x01" * 16) + enc.finalize() == ct
+
+    def test_gcm_context_reused(self):
+        key = os.urandom(16)
+        messages = []
+        for iv in [b"\x00" * 12, b"\x01" * 16, b"\x02" * 12]:
+            cipher = Cipher(AES(key), GCM(iv), backend=backend)
+            enc = cipher.encryptor()
+            enc.authenticate_additional_data(b"aad")
+            ct = enc.update(b"plaintext") + enc.finalize()
+            messages.append((iv, ct, enc.tag))
+
+        for iv, ct, tag in messages:
+            cipher = Cipher(AES(key), GCM(iv, tag), backend=backend)
+            dec = cipher.decryptor()
+            dec.authenticate_additional_data(b"aad")
+            assert dec.update(ct) + dec.finalize() == b"plaintext"
+
+        iv, ct, tag = messages[0]
+        cipher = Cipher(AES(key), GCM(iv, b"\x00" * 16), backend=backend)
+        dec = cipher.decryptor()
+        dec.authenticate_additional_data(b"aad")
+        dec.update(ct)
+        with pytest.raises(InvalidTag):
+            dec.finalize()
+
+        cipher = Cipher(AES(key), GCM(iv, tag), backend=backend)
+        dec = cipher.decryptor()
+        dec.authenticate_additional_data(b"aad")
+        assert dec.update(ct) + dec.finalize() == b"plaintext"
+
+
+class TestFromBuffer(object):
+    def test_buffer_protocol(self):
+        buf = bytearray(b"abc")
+        assert backend._ffi.buffer(
+            utils._from_buffer(backend._ffi, buf)
+        )[:] == b"abc"
+
+    def test_bytes_on_old_cffi(self):
+        def from_buffer(data):
+            raise TypeError("from_buffer() cannot return the address of the "
+                            "raw string within a bytes or unicode object")
+
+        ffi = pretend.stub(from_buffer=from_buffer, new=backend._ffi.new)
+        ptr = utils._from_buffer(ffi, b"abc")
+        assert len(ptr) == 3
+        assert backend._ffi.buffer(ptr)[:] == b"abc"
+        with pytest.raises(TypeError):
+            utils._from_buffer(ffi, u"abc")
+
+
+class TestOpenSSLHashContext(object):
+    def test_reset_reuses_context(self):
+        ctx = backend.create_hash_ctx(hashes.SHA256())
+        native_ctx = ctx._ctx
+        ctx.update(b"abc")
+        ctx.finalize()
+        ctx.reset()
+        ctx.update(b"123")
+        assert ctx.finalize() == backend.hash_digest(hashes.SHA256(), b"123")
+        assert ctx._ctx == native_ctx
+
+
+class TestOpenSSLXOF(object):
+    def test_no_hmac(self):
+        assert backend.hmac_supported(hashes.SHAKE128(32)) is False
+
+    def test_requires_digest_squeeze(self, monkeypatch):
+        monkeypatch.setattr(backend._lib, "Cryptography_HAS_DIGEST_SQUEEZE", 0)
+        assert backend.xof_supported(hashes.SHAKE128(32)) is False
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            backend.create_xof_ctx(hashes.SHAKE128(32))
+
+    def test_not_an_xof(self):
+        assert backend.xof_supported(hashes.SHA256()) is False
+
+    @pytest.mark.skipif(
+        not backend.xof_supported(hashes.SHAKE128(32)),
+        reason="Does not support incremental SHAKE128 output"
+    )
+    def test_squeeze_into_read_only_buffer(self):
+        ctx = backend.create_xof_ctx(hashes.SHAKE128(32))
+        buf = memoryview(b"\x00" * 16)
+        with pytest.raises(TypeError):
+            ctx.squeeze_into(buf)
+        assert bytes(buf) == b"\x00" * 16
+
+
+class TestOpenSSLDigestMany(object):
+    @pytest.mark.parametrize("workers", [2, 3, 16])
+    def test_parallel(self, monkeypatch, workers):
+        monkeypatch.setattr(openssl_hashes, "_PARALLEL_DIGEST_THRESHOLD", 1)
+        monkeypatch.setattr(utils, "_cpu_count", lambda: workers)
+        messages = [os.urandom(i) for i in range(10)]
+        assert backend.hash_digest_many(hashes.SHA256(), messages) == [
+            backend.hash_digest(hashes.SHA256(), m) for m in messages
+        ]
+
+    @pytest.mark.skipif(
+        not hasattr(os, "fork"), reason="Requires os.fork"
+    )
+    def test_parallel_after_fork(self, monkeypatch):
+        monkeypatch.setattr(openssl_hashes, "_PARALLEL_DIGEST_THRESHOLD", 1)
+        monkeypatch.setattr(utils, "_cpu_count", lambda: 4)
+        messages = [six.int2byte(i) * 1024 for i in range(16)]
+        expected = [
+            backend.hash_digest(hashes.SHA256(), m) for m in messages
+        ]
+        assert backend.hash_digest_many(hashes.SHA256(), messages) == expected
+
+        pid = os.fork()
+        if pid == 0:
+            ok = False
+            try:
+                ok = backend.hash_digest_many(
+                    hashes.SHA256(), messages
+                ) == expected
+            finally:
+                os._exit(0 if ok else 1)
+
+        # The child hangs on a pool without threads if it is not rebuilt.
+        deadline = time.time() + 30
+        while True:
+            done, status = os.waitpid(pid, os.WNOHANG)
+            if done:
+                break
+            if time.time() > deadline:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+                pytest.fail("forked child did not finish")
+            time.sleep(0.01)
+        assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+
+
+class TestOpenSSLCBCHMAC(object):
+    def _three_pass(self, key, iv, mac_key, algorithm, aad, data):
+        pad = 16 - len(data) % 16
+        padded = data + six.int2byte(pad) * pad
+        enc = Cipher(AES(key), CBC(iv), backend=backend).encryptor()
+        ct = enc.update(padded) + enc.finalize()
+        h = hmac.HMAC(mac_key, algorithm, backend=backend)
+        h.update(aad + ct)
+        return aad + ct + h.finalize()
+
+    @pytest.mark.parametrize("size", [0, 15, 16, 17, 1000])
+    @pytest.mark.parametrize("algorithm", [hashes.SHA1(), hashes.SHA256()])
+    def test_matches_three_pass(self, monkeypatch, size, algorithm):
+        monkeypatch.setattr(cbc_hmac, "_CHUNK_SIZE", 64)
+        key = os.urandom(16)
+        iv = os.urandom(16)
+        mac_key = os.urandom(16)
+        data = os.urandom(size)
+        assert backend.cbc_hmac_encrypt(
+            AES(key), iv, mac_key, algorithm, b"header", data
+        ) == self._three_pass(key, iv, mac_key, algorithm, b"header", data)
+
+    def test_unsupported(self):
+        assert not backend.cbc_hmac_supported(
+            ARC4(b"\x00" * 16), hashes.SHA1()
+        )
+        assert not backend.cbc_hmac_supported(
+            AES(b"\x00" * 16), DummyHash()
+        )
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_CIPHER):
+            backend.cbc_hmac_encrypt(
+                ARC4(b"\x00" * 16), b"\x00" * 16, b"key", hashes.SHA1(),
+                b"", b"data"
+            )
+
+    def test_other_block_cipher(self):
+        key = os.urandom(16)
+        iv = os.urandom(16)
+        out = backend.cbc_hmac_encrypt(
+            Camellia(key), iv, b"key", hashes.SHA1(), b"", b"data"
+        )
+        dec = Cipher(Camellia(key), CBC(iv), backend=backend).decryptor()
+        assert dec.update(out[:16]) + dec.finalize() == b"data" + b"\x0c" * 12
+
+
+class TestOpenSSLParallelCTR(object):
+    @pytest.fixture
+    def parallel(self, monkeypatch):
+        monkeypatch.setattr(_CipherContext, "_PARALLEL_CTR_THRESHOLD", 64)
+        monkeypatch.setattr(_CipherContext, "_PARALLEL_CTR_MIN_SEGMENT", 32)
+        monkeypatch.setattr(utils, "_cpu_count", lambda: 4)
+
+    def _serial_ctr(self, key, nonce, data):
+        cipher = Cipher(AES(key), CTR(nonce), backend=backend)
+        enc = cipher.encryptor()
+        return enc.update(data) + enc.finalize()
+
+    @pytest.mark.parametrize(
+        "nonce", [b"\x00" * 16, b"\xff" * 16, b"\x00" * 8 + b"\xff" * 8]
+    )
+    def test_matches_serial(self, parallel, nonce):
+        key = os.urandom(16)
+        data = os.urandom(1000)
+        expected = self._serial_ctr(key, nonce, data)
+
+        cipher = Cipher(AES(key), CTR(nonce), backend=backend)
+        enc = cipher.encryptor()
+        ct = b""
+        pos = 0
+        for size in [5, 300, 3, 517, 175]:
+            ct += enc.update(data[pos:pos + size])
+            pos += size
+        ct += enc.finalize()
+        assert ct == expected
+
+        dec = cipher.decryptor()
+        assert dec.update(ct) + dec.finalize() == data
+
+    def test_update_into(self, parallel):
+        key = os.urandom(32)
+        nonce = os.urandom(16)
+        data = os.urandom(513)
+        buf = bytearray(len(data) + 15)
+        cipher = Cipher(AES(key), CTR(nonce), backend=backend)
+        enc = cipher.encryptor()
+        assert enc.update_into(data, buf) == len(data)
+        assert enc.update(b"\x00" * 7) == self._serial_ctr(
+            key, nonce, data + b"\x00" * 7
+        )[len(data):]
+        assert bytes(buf[:len(data)]) == self._serial_ctr(key, nonce, data)
+
+
+class TestOpenSSLPBKDF2Blocks(object):
+    @pytest.fixture
+    def parallel(self, monkeypatch):
+        monkeypatch.setattr(
+            sys.modules[Backend.__module__],
+            "_PARALLEL_PBKDF2_MIN_ITERATIONS",
+            1
+        )
+        monkeypatch.setattr(utils, "_cpu_count", lambda: 4)
+
+    def _serial_pbkdf2(self, algorithm, length, salt, iterations, password):
+        evp_md = backend._evp_md(algorithm)
+        buf = backend._ffi.new("unsigned char[]", length)
+        res = backend._lib.PKCS5_PBKDF2_HMAC(
+            password, len(password), salt, len(salt), iterations, evp_md,
+            length, buf
+        )
+        assert res == 1
+        return backend._ffi.buffer(buf)[:]
+
+    @pytest.mark.parametrize(
+        ("algorithm", "length"),
+        [
+            (hashes.SHA1(), 25),
+            (hashes.SHA256(), 32),
+            (hashes.SHA256(), 33),
+            (hashes.SHA256(), 96),
+            (hashes.SHA512(), 200),
+        ]
+    )
+    @pytest.mark.parametrize("iterations", [1, 2, 1000])
+    def test_matches_serial(self, parallel, algorithm, length, iterations):
+        if not backend.pbkdf2_hmac_supported(algorithm):
+            pytest.skip("Requires PKCS5_PBKDF2_HMAC")
+        salt = os.urandom(16)
+        password = os.urandom(12)
+        assert backend.derive_pbkdf2_hmac(
+            algorithm, length, salt, iterations, password
+        ) == self._serial_pbkdf2(algorithm, length, salt, iterations, password)
+
+    def test_serial_uses_pkcs5(self, parallel, monkeypatch):
+        if not backend._lib.Cryptography_HAS_PBKDF2_HMAC:
+            pytest.skip("Requires PKCS5_PBKDF2_HMAC")
+        monkeypatch.setattr(
+            backend, "_derive_pbkdf2_hmac_blocks",
+            pretend.raiser(AssertionError("blocks derived separately"))
+        )
+        expected = self._serial_pbkdf2(
+            hashes.SHA256(), 96, b"salt", 10, b"password"
+        )
+
+        monkeypatch.setattr(utils, "_cpu_count", lambda: 1)
+        assert backend.derive_pbkdf2_hmac(
+            hashes.SHA256(), 96, b"salt", 10, b"password"
+        ) == expected
+
+        monkeypatch.setattr(utils, "_cpu_count", lambda: 4)
+        monkeypatch.setattr(utils._worker_state, "active", True, raising=False)
+        assert backend.derive_pbkdf2_hmac(
+            hashes.SHA256(), 96, b"salt", 10, b"password"
+        ) == expected
+
+    def test_rfc_6070_vector(self, parallel):
+        if not backend._lib.Cryptography_HAS_PBKDF2_HMAC:
+            pytest.skip("Requires PKCS5_PBKDF2_HMAC")
+        key = backend.derive_pbkdf2_hmac(
+            hashes.SHA1(), 25, b"saltSALTsaltSALTsaltSALTsaltSALTsalt", 4096,
+            b"passwordPASSWORDpassword"
+        )
+        assert key == binascii.unhexlify(
+            b"3d2eec4fe41c849b80c8d83662c0e44a8b291a964cf2f07038"
+        )
+
+
 class TestOpenSSLSerialisationWithOpenSSL(object):
     def test_pem_password_cb_buffer_too_small(self):
         ffi_cb, cb = backend._pem_password_cb(b"aa")
@@ -0,0 +1,218 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import binascii
+import os
+
+import pytest
+
+from cryptography.exceptions import InvalidTag, _Reasons
+from cryptography.hazmat.backends.interfaces import AEADBackend
+from cryptography.hazmat.primitives.ciphers import algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import (
+    AESGCM, ChaCha20Poly1305, _ChaCha20Poly1305Algorithm
+)
+
+from ...utils import (
+    load_nist_vectors, load_vectors_from_file, raises_unsupported_algorithm
+)
+
+
+def _aes_gcm_vectors():
+    vectors = []
+    for name in [
+        "gcmDecrypt128.rsp",
+        "gcmDecrypt192.rsp",
+        "gcmDecrypt256.rsp",
+        "gcmEncryptExtIV128.rsp",
+        "gcmEncryptExtIV192.rsp",
+        "gcmEncryptExtIV256.rsp",
+    ]:
+        vectors.extend(
+            load_vectors_from_file(
+                os.path.join("ciphers", "AES", "GCM", name),
+                load_nist_vectors
+            )
+        )
+    # AESGCM always uses full length tags and nonces of at least 64 bits.
+    return [
+        vector for vector in vectors
+        if len(vector["tag"]) == 32 and 16 <= len(vector["iv"]) <= 256
+    ]
+
+
+@pytest.mark.supported(
+    only_if=lambda backend: backend.aead_cipher_supported(
+        algorithms.AES(b"\x00" * 16), modes.GCM
+    ),
+    skip_message="Does not support AES GCM one-shot AEAD",
+)
+@pytest.mark.requires_backend_interface(interface=AEADBackend)
+class TestAESGCM(object):
+    @pytest.mark.parametrize("vector", _aes_gcm_vectors())
+    def test_vectors(self, backend, vector):
+        key = binascii.unhexlify(vector["key"])
+        nonce = binascii.unhexlify(vector["iv"])
+        aad = binascii.unhexlify(vector["aad"])
+        ct = binascii.unhexlify(vector["ct"])
+        tag = binascii.unhexlify(vector["tag"])
+        aesgcm = AESGCM(key, backend)
+        if vector.get("fail") is True:
+            with pytest.raises(InvalidTag):
+                aesgcm.decrypt(nonce, ct + tag, aad)
+        else:
+            pt = binascii.unhexlify(vector["pt"])
+            assert aesgcm.encrypt(nonce, pt, aad) == ct + tag
+            assert aesgcm.decrypt(nonce, ct + tag, aad) == pt
+
+    def test_reuse_context(self, backend):
+        key = AESGCM.generate_key(128)
+        aesgcm = AESGCM(key, backend)
+        nonces = [b"\x00" * 12, b"\x01" * 8, b"\x02" * 16, b"\x03" * 12]
+        for i, nonce in enumerate(nonces):
+            data = b"data" * i
+            ct = aesgcm.encrypt(nonce, data, None)
+            assert aesgcm.decrypt(nonce, ct, None) == data
+
+    def test_decrypt_invalid_tag(self, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128), backend)
+        nonce = b"\x00" * 12
+        ct = aesgcm.encrypt(nonce, b"encrypted data", b"aad")
+        with pytest.raises(InvalidTag):
+            aesgcm.decrypt(nonce, ct, b"other aad")
+        with pytest.raises(InvalidTag):
+            aesgcm.decrypt(nonce, ct[:-1] + b"\x00", b"aad")
+        with pytest.raises(InvalidTag):
+            aesgcm.decrypt(nonce, b"\x00" * 15, b"aad")
+        # The context must still be usable after a failed decryption.
+        assert aesgcm.decrypt(nonce, ct, b"aad") == b"encrypted data"
+
+    def test_associated_data_none_equal_to_empty_bytestring(self, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128), backend)
+        nonce = os.urandom(12)
+        ct1 = aesgcm.encrypt(nonce, b"some_data", None)
+        ct2 = aesgcm.encrypt(nonce, b"some_data", b"")
+        assert ct1 == ct2
+        assert aesgcm.decrypt(nonce, ct1, None) == b"some_data"
+
+    @pytest.mark.parametrize(
+        ("nonce", "data", "associated_data"),
+        [
+            [object(), b"data", b""],
+            [b"0" * 12, object(), b""],
+            [b"0" * 12, b"data", object()],
+        ]
+    )
+    def test_params_not_bytes(self, nonce, data, associated_data, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128), backend)
+        with pytest.raises(TypeError):
+            aesgcm.encrypt(nonce, data, associated_data)
+        with pytest.raises(TypeError):
+            aesgcm.decrypt(nonce, data, associated_data)
+
+    @pytest.mark.parametrize("length", [7, 129])
+    def test_invalid_nonce_length(self, length, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128), backend)
+        with pytest.raises(ValueError):
+            aesgcm.encrypt(b"\x00" * length, b"hi", None)
+        with pytest.raises(ValueError):
+            aesgcm.decrypt(b"\x00" * length, b"\x00" * 16, None)
+
+    def test_invalid_key(self, backend):
+        with pytest.raises(TypeError):
+            AESGCM(object(), backend)
+        with pytest.raises(ValueError):
+            AESGCM(b"\x00" * 15, backend)
+
+    def test_bad_generate_key(self):
+        with pytest.raises(TypeError):
+            AESGCM.generate_key(object())
+        with pytest.raises(ValueError):
+            AESGCM.generate_key(129)
+
+
+def _chacha20_poly1305_supported(backend):
+    return backend.aead_cipher_supported(
+        _ChaCha20Poly1305Algorithm(b"\x00" * 32), None
+    )
+
+
+@pytest.mark.supported(
+    only_if=lambda backend: not _chacha20_poly1305_supported(backend),
+    skip_message="Requires a backend without ChaCha20Poly1305 support",
+)
+@pytest.mark.requires_backend_interface(interface=AEADBackend)
+def test_chacha20poly1305_unsupported(backend):
+    with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_CIPHER):
+        ChaCha20Poly1305(ChaCha20Poly1305.generate_key(), backend)
+
+
+@pytest.mark.supported(
+    only_if=_chacha20_poly1305_supported,
+    skip_message="Does not support ChaCha20Poly1305",
+)
+@pytest.mark.requires_backend_interface(interface=AEADBackend)
+class TestChaCha20Poly1305(object):
+    def test_rfc7539_vector(self, backend):
+        # RFC 7539 section 2.8.2
+        key = binascii.unhexlify(
+            b"808182838485868788898a8b8c8d8e8f"
+            b"909192939495969798999a9b9c9d9e9f"
+        )
+        nonce = binascii.unhexlify(b"070000004041424344454647")
+        aad = binascii.unhexlify(b"50515253c0c1c2c3c4c5c6c7")
+        pt = (
+            b"Ladies and Gentlemen of the class of '99: If I could offer you "
+            b"only one tip for the future, sunscreen would be it."
+        )
+        ct = binascii.unhexlify(
+            b"d31a8d34648e60db7b86afbc53ef7ec2a4aded51296e08fea9e2b5a736ee62d6"
+            b"3dbea45e8ca9671282fafb69da92728b1a71de0a9e060b2905d6a5b67ecd3b36"
+            b"92ddbd7f2d778b8c9803aee328091b58fab324e4fad675945585808b4831d7bc"
+            b"3ff4def08e4b7a9de576d26586cec64b6116"
+            b"1ae10b594f09e26a7e902ecbd0600691"
+        )
+        chacha = ChaCha20Poly1305(key, backend)
+        assert chacha.encrypt(nonce, pt, aad) == ct
+        assert chacha.decrypt(nonce, ct, aad) == pt
+
+    def test_decrypt_invalid_tag(self, backend):
+        chacha = ChaCha20Poly1305(ChaCha20Poly1305.generate_key(), backend)
+        nonce = os.urandom(12)
+        ct = chacha.encrypt(nonce, b"encrypted data", None)
+        with pytest.raises(InvalidTag):
+            chacha.decrypt(nonce, ct, b"aad")
+        with pytest.raises(InvalidTag):
+            chacha.decrypt(nonce, ct[:-1] + b"\x00", None)
+        assert chacha.decrypt(nonce, ct, None) == b"encrypted data"
+
+    def test_invalid_nonce_length(self, backend):
+        chacha = ChaCha20Poly1305(ChaCha20Poly1305.generate_key(), backend)
+        with pytest.raises(ValueError):
+            chacha.encrypt(b"\x00" * 8, b"data", None)
+        with pytest.raises(ValueError):
+            chacha.decrypt(b"\x00" * 16, b"\x00" * 16, None)
+
+    def test_params_not_bytes(self, backend):
+        chacha = ChaCha20Poly1305(ChaCha20Poly1305.generate_key(), backend)
+        with pytest.raises(TypeError):
+            chacha.encrypt(b"\x00" * 12, object(), None)
+
+
+@pytest.mark.requires_backend_interface(interface=AEADBackend)
+def test_chacha20poly1305_invalid_key(backend):
+    with pytest.raises(TypeError):
+        ChaCha20Poly1305(object(), backend)
+    with pytest.raises(ValueError):
+        ChaCha20Poly1305(b"\x00" * 16, backend)
+
+
+@pytest.mark.parametrize("cls", [AESGCM, ChaCha20Poly1305])
+def test_invalid_backend(cls):
+    pretend_backend = object()
+
+    with raises_unsupported_algorithm(_Reasons.BACKEND_MISSING_INTERFACE):
+        cls(b"\x00" * 32, pretend_backend)
@@ -10,12 +10,25 @@ import os
 import pytest
 
 from cryptography.hazmat.backends.interfaces import CipherBackend
-from cryptography.hazmat.primitives.ciphers import algorithms, base, modes
+from cryptography.hazmat.primitives.ciphers import (
+    algorithms, base, decrypt_sectors, encrypt_sectors, modes
+)
 
-from .utils import generate_aead_test, generate_encrypt_test
+from .utils import _load_all_params, generate_aead_test, generate_encrypt_test
 from ...utils import load_nist_vectors
 
 
+def _load_xts_vectors(tweak_type):
+    params = _load_all_params(
+        os.path.join("ciphers", "AES", "XTS", tweak_type),
+        ["XTSGenAES128.rsp", "XTSGenAES256.rsp"],
+        load_nist_vectors
+    )
+    # Data units that aren't a whole number of bytes can't be expressed
+    # through this API.
+    return [x for x in params if int(x["dataunitlen"]) % 8 == 0]
+
+
 @pytest.mark.supported(
     only_if=lambda backend: backend.cipher_supported(
         algorithms.AES("\x00" * 16), modes.CBC("\x00" * 16)
@@ -82,6 +95,82 @@ class TestAESModeECB(object):
     )
 
 
+@pytest.mark.supported(
+    only_if=lambda backend: backend.cipher_supported(
+        algorithms.AES(b"\x00" * 32), modes.XTS(b"\x00" * 16)
+    ),
+    skip_message="Does not support AES XTS",
+)
+@pytest.mark.requires_backend_interface(interface=CipherBackend)
+class TestAESModeXTS(object):
+    @pytest.mark.parametrize("params", _load_xts_vectors("tweak-128hexstr"))
+    def test_xts_vectors(self, backend, params):
+        key = binascii.unhexlify(params["key"])
+        tweak = binascii.unhexlify(params["i"])
+        pt = binascii.unhexlify(params["pt"])
+        ct = binascii.unhexlify(params["ct"])
+        cipher = base.Cipher(
+            algorithms.AES(key), modes.XTS(tweak), backend=backend
+        )
+        enc = cipher.encryptor()
+        assert enc.update(pt) + enc.finalize() == ct
+        dec = cipher.decryptor()
+        assert dec.update(ct) + dec.finalize() == pt
+
+    @pytest.mark.parametrize(
+        "params", _load_xts_vectors("tweak-dataunitseqno")
+    )
+    def test_xts_sector_vectors(self, backend, params):
+        key = binascii.unhexlify(params["key"])
+        sector = int(params["dataunitseqnumber"])
+        pt = binascii.unhexlify(params["pt"])
+        ct = binascii.unhexlify(params["ct"])
+        algorithm = algorithms.AES(key)
+        assert encrypt_sectors(algorithm, [pt], backend, sector) == [ct]
+        assert decrypt_sectors(algorithm, [ct], backend, sector) == [pt]
+
+    @pytest.mark.parametrize("size", [0, 1, 15])
+    def test_xts_too_short(self, backend, size):
+        cipher = base.Cipher(
+            algorithms.AES(os.urandom(32)), modes.XTS(b"\x00" * 16),
+            backend=backend
+        )
+        with pytest.raises(ValueError):
+            cipher.encryptor().update(b"\x00" * size)
+        with pytest.raises(ValueError):
+            cipher.decryptor().update_into(b"\x00" * size, bytearray(32))
+
+    def test_xts_single_update(self, backend):
+        cipher = base.Cipher(
+            algorithms.AES(os.urandom(64)), modes.XTS(os.urandom(16)),
+            backend=backend
+        )
+        enc = cipher.encryptor()
+        assert len(enc.update(b"\x00" * 17)) == 17
+        with pytest.raises(ValueError):
+            enc.update(b"\x00" * 16)
+        assert enc.finalize() == b""
+
+    def test_xts_invalid_tweak(self):
+        with pytest.raises(ValueError):
+            modes.XTS(b"\x00" * 15)
+
+    @pytest.mark.parametrize("size", [16, 24])
+    def test_xts_invalid_key_size(self, backend, size):
+        with pytest.raises(ValueError):
+            base.Cipher(
+                algorithms.AES(b"\x00" * size), modes.XTS(b"\x00" * 16),
+                backend
+            )
+
+    def test_xts_identical_key_halves(self, backend):
+        with pytest.raises(ValueError):
+            base.Cipher(
+                algorithms.AES(b"\x01" * 32), modes.XTS(b"\x00" * 16),
+                backend
+            )
+
+
 @pytest.mark.supported(
     only_if=lambda backend: backend.cipher_supported(
         algorithms.AES("\x00" * 16), modes.OFB("\x00" * 16)
@@ -4,7 +4,9 @@
 
 from __future__ import absolute_import, division, print_function
 
+import array
 import binascii
+import os
 
 import pytest
 
@@ -105,6 +107,74 @@ class TestCipherContext(object):
         assert pt == b"a" * 80
         decryptor.finalize()
 
+    def test_update_into(self, backend):
+        cipher = Cipher(
+            algorithms.AES(binascii.unhexlify(b"0" * 32)),
+            modes.CBC(binascii.unhexlify(b"0" * 32)),
+            backend
+        )
+        encryptor = cipher.encryptor()
+        ct = encryptor.update(b"a" * 48) + encryptor.finalize()
+        encryptor = cipher.encryptor()
+        buf = bytearray(63)
+        length = encryptor.update_into(bytearray(b"a" * 48), buf)
+        assert length == 48
+        assert bytes(buf[:length]) + encryptor.finalize() == ct
+
+    def test_update_into_buffer_too_small(self, backend):
+        cipher = Cipher(
+            algorithms.AES(binascii.unhexlify(b"0" * 32)),
+            modes.CBC(binascii.unhexlify(b"0" * 32)),
+            backend
+        )
+        encryptor = cipher.encryptor()
+        with pytest.raises(ValueError):
+            encryptor.update_into(b"a" * 16, bytearray(16))
+
+    def test_multi_byte_item_buffers(self, backend):
+        cipher = Cipher(
+            algorithms.AES(binascii.unhexlify(b"0" * 32)),
+            modes.CBC(binascii.unhexlify(b"0" * 32)),
+            backend
+        )
+        raw = os.urandom(32)
+        encryptor = cipher.encryptor()
+        ct = encryptor.update(raw) + encryptor.finalize()
+
+        encryptor = cipher.encryptor()
+        assert encryptor.update(array.array("I", raw)) == ct
+        assert encryptor.finalize() == b""
+
+        encryptor = cipher.encryptor()
+        buf = array.array("I", b"\x00" * 48)
+        assert encryptor.update_into(array.array("I", raw), buf) == 32
+        assert array.array("I", ct) == buf[:8]
+
+    @pytest.mark.parametrize(
+        "buf", [b"\x00" * 31, memoryview(b"\x00" * 31)]
+    )
+    def test_update_into_read_only_buffer(self, backend, buf):
+        cipher = Cipher(
+            algorithms.AES(binascii.unhexlify(b"0" * 32)),
+            modes.CBC(binascii.unhexlify(b"0" * 32)),
+            backend
+        )
+        encryptor = cipher.encryptor()
+        with pytest.raises(TypeError):
+            encryptor.update_into(b"a" * 16, buf)
+        assert bytes(buf) == b"\x00" * 31
+
+    def test_update_into_after_finalize(self, backend):
+        cipher = Cipher(
+            algorithms.AES(binascii.unhexlify(b"0" * 32)),
+            modes.CBC(binascii.unhexlify(b"0" * 32)),
+            backend
+        )
+        encryptor = cipher.encryptor()
+        encryptor.finalize()
+        with pytest.raises(AlreadyFinalized):
+            encryptor.update_into(b"a" * 16, bytearray(31))
+
     @pytest.mark.parametrize("mode", [DummyMode(), None])
     def test_nonexistent_cipher(self, backend, mode):
         cipher = Cipher(
@@ -151,6 +221,94 @@ class TestAEADCipherContext(object):
     )
 
 
+@pytest.mark.supported(
+    only_if=lambda backend: backend.cipher_supported(
+        algorithms.AES("\x00" * 16), modes.CTR("\x00" * 16)
+    ),
+    skip_message="Does not support AES CTR",
+)
+@pytest.mark.requires_backend_interface(interface=CipherBackend)
+class TestDecryptorAt(object):
+    @pytest.mark.parametrize("offset", [0, 1, 15, 16, 17, 100, 255])
+    @pytest.mark.parametrize(
+        "nonce", [b"\x00" * 16, b"\xff" * 16, b"\x00" * 12 + b"\xff" * 4]
+    )
+    def test_ctr(self, backend, offset, nonce):
+        key = binascii.unhexlify(b"2b7e151628aed2a6abf7158809cf4f3c")
+        data = bytes(bytearray(range(256)))
+        cipher = Cipher(algorithms.AES(key), modes.CTR(nonce), backend)
+        encryptor = cipher.encryptor()
+        ct = encryptor.update(data) + encryptor.finalize()
+
+        decryptor = cipher.decryptor_at(offset)
+        assert decryptor.update(ct[offset:offset + 10]) == (
+            data[offset:offset + 10]
+        )
+        assert decryptor.update(ct[offset + 10:]) + decryptor.finalize() == (
+            data[offset + 10:]
+        )
+
+    @pytest.mark.supported(
+        only_if=lambda backend: backend.cipher_supported(
+            algorithms.AES("\x00" * 16), modes.GCM("\x00" * 12)
+        ),
+        skip_message="Does not support AES GCM",
+    )
+    @pytest.mark.parametrize("offset", [0, 1, 16, 33, 255])
+    def test_gcm(self, backend, offset):
+        key = binascii.unhexlify(b"2b7e151628aed2a6abf7158809cf4f3c")
+        iv = binascii.unhexlify(b"cafebabefacedbaddecaf888")
+        data = bytes(bytearray(range(256)))
+        encryptor = Cipher(
+            algorithms.AES(key), modes.GCM(iv), backend
+        ).encryptor()
+        ct = encryptor.update(data) + encryptor.finalize()
+
+        cipher = Cipher(algorithms.AES(key), modes.GCM(iv, encryptor.tag),
+                        backend)
+        decryptor = cipher.decryptor_at(offset, unauthenticated=True)
+        assert decryptor.update(ct[offset:]) + decryptor.finalize() == (
+            data[offset:]
+        )
+
+    def test_gcm_requires_unauthenticated(self, backend):
+        cipher = Cipher(
+            algorithms.AES(b"\x00" * 16), modes.GCM(b"\x00" * 12), backend
+        )
+        with pytest.raises(ValueError):
+            cipher.decryptor_at(16)
+
+    def test_gcm_requires_96_bit_iv(self, backend):
+        cipher = Cipher(
+            algorithms.AES(b"\x00" * 16), modes.GCM(b"\x00" * 16), backend
+        )
+        with pytest.raises(ValueError):
+            cipher.decryptor_at(16, unauthenticated=True)
+
+    def test_gcm_offset_too_large(self, backend):
+        cipher = Cipher(
+            algorithms.AES(b"\x00" * 16), modes.GCM(b"\x00" * 12), backend
+        )
+        with pytest.raises(ValueError):
+            cipher.decryptor_at(16 * (2 ** 32 - 2), unauthenticated=True)
+
+    def test_unsupported_mode(self, backend):
+        cipher = Cipher(
+            algorithms.AES(b"\x00" * 16), modes.CBC(b"\x00" * 16), backend
+        )
+        with pytest.raises(ValueError):
+            cipher.decryptor_at(16)
+
+    def test_invalid_offset(self, backend):
+        cipher = Cipher(
+            algorithms.AES(b"\x00" * 16), modes.CTR(b"\x00" * 16), backend
+        )
+        with pytest.raises(TypeError):
+            cipher.decryptor_at(1.0)
+        with pytest.raises(ValueError):
+            cipher.decryptor_at(-1)
+
+
 @pytest.mark.requires_backend_interface(interface=CipherBackend)
 class TestModeValidation(object):
     def test_cbc(self, backend):
@@ -0,0 +1,197 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import io
+import os
+
+import pytest
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.backends.interfaces import CipherBackend
+from cryptography.hazmat.primitives.ciphers import (
+    Cipher, algorithms, decrypt_file, encrypt_file, modes
+)
+
+
+class ReadOnlyStream(object):
+    """
+    A file-like object without readinto.
+    """
+    def __init__(self, data):
+        self._stream = io.BytesIO(data)
+
+    def read(self, size):
+        return self._stream.read(size)
+
+
+class NonBlockingStream(object):
+    """
+    A non-blocking file-like object with no data ready.
+    """
+    def read(self, size):
+        return None
+
+
+class NonBlockingRawStream(NonBlockingStream):
+    def readinto(self, buf):
+        return None
+
+
+class ShortWriteStream(object):
+    """
+    A raw file-like object that writes at most 5 bytes per call.
+    """
+    def __init__(self):
+        self._stream = io.BytesIO()
+
+    def write(self, data):
+        return self._stream.write(bytes(data[:5]))
+
+    def getvalue(self):
+        return self._stream.getvalue()
+
+
+@pytest.mark.requires_backend_interface(interface=CipherBackend)
+class TestCipherFiles(object):
+    @pytest.mark.parametrize("chunk_size", [None, 1, 15, 16, 4096])
+    @pytest.mark.parametrize("length", [0, 1, 32, 5000])
+    def test_ctr_round_trip(self, backend, chunk_size, length):
+        key = os.urandom(16)
+        nonce = os.urandom(16)
+        data = os.urandom(length)
+        cipher = Cipher(algorithms.AES(key), modes.CTR(nonce), backend)
+        encryptor = cipher.encryptor()
+        expected = encryptor.update(data) + encryptor.finalize()
+
+        dst = io.BytesIO()
+        stats = encrypt_file(io.BytesIO(data), dst, cipher, chunk_size)
+        assert dst.getvalue() == expected
+        assert stats.bytes_read == length
+        assert stats.bytes_written == length
+        assert stats.seconds >= 0
+        assert stats.throughput >= 0
+        assert stats.tag is None
+
+        dst2 = io.BytesIO()
+        decrypt_file(io.BytesIO(expected), dst2, cipher, chunk_size)
+        assert dst2.getvalue() == data
+
+    @pytest.mark.parametrize("chunk_size", [7, 16, 100])
+    def test_cbc_round_trip(self, backend, chunk_size):
+        key = os.urandom(16)
+        iv = os.urandom(16)
+        data = os.urandom(16 * 20)
+        cipher = Cipher(algorithms.AES(key), modes.CBC(iv), backend)
+        encryptor = cipher.encryptor()
+        expected = encryptor.update(data) + encryptor.finalize()
+
+        dst = io.BytesIO()
+        stats = encrypt_file(io.BytesIO(data), dst, cipher, chunk_size)
+        assert dst.getvalue() == expected
+        assert stats.bytes_written == len(expected)
+
+        dst = io.BytesIO()
+        decrypt_file(io.BytesIO(expected), dst, cipher, chunk_size)
+        assert dst.getvalue() == data
+
+    def test_cbc_unaligned(self, backend):
+        cipher = Cipher(
+            algorithms.AES(b"\x00" * 16), modes.CBC(b"\x00" * 16), backend
+        )
+        with pytest.raises(ValueError):
+            encrypt_file(io.BytesIO(b"\x00" * 17), io.BytesIO(), cipher)
+
+    def test_stream_without_readinto(self, backend):
+        data = os.urandom(100)
+        cipher = Cipher(
+            algorithms.AES(b"\x00" * 16), modes.CTR(b"\x00" * 16), backend
+        )
+        dst = io.BytesIO()
+        stats = encrypt_file(ReadOnlyStream(data), dst, cipher, 33)
+        assert stats.bytes_read == 100
+
+        out = io.BytesIO()
+        decrypt_file(ReadOnlyStream(dst.getvalue()), out, cipher, 33)
+        assert out.getvalue() == data
+
+    def test_non_blocking_stream(self, backend):
+        cipher = Cipher(
+            algorithms.AES(b"\x00" * 16), modes.CTR(b"\x00" * 16), backend
+        )
+        with pytest.raises(ValueError):
+            encrypt_file(NonBlockingStream(), io.BytesIO(), cipher)
+        with pytest.raises(ValueError):
+            encrypt_file(NonBlockingRawStream(), io.BytesIO(), cipher)
+
+    def test_short_writes(self, backend):
+        data = os.urandom(100)
+        cipher = Cipher(
+            algorithms.AES(b"\x00" * 16), modes.CTR(b"\x00" * 16), backend
+        )
+        dst = ShortWriteStream()
+        stats = encrypt_file(io.BytesIO(data), dst, cipher, 33)
+        assert stats.bytes_written == 100
+
+        out = io.BytesIO()
+        decrypt_file(io.BytesIO(dst.getvalue()), out, cipher)
+        assert out.getvalue() == data
+
+    def test_real_file(self, backend, tmpdir):
+        data = os.urandom(70000)
+        src = tmpdir.join("plain")
+        src.write(data, mode="wb")
+        cipher = Cipher(
+            algorithms.AES(b"\x00" * 16), modes.CTR(b"\x00" * 16), backend
+        )
+        with src.open("rb") as f:
+            dst = io.BytesIO()
+            stats = encrypt_file(f, dst, cipher)
+        assert stats.bytes_read == len(data)
+
+        out = io.BytesIO()
+        decrypt_file(io.BytesIO(dst.getvalue()), out, cipher)
+        assert out.getvalue() == data
+
+    @pytest.mark.supported(
+        only_if=lambda backend: backend.cipher_supported(
+            algorithms.AES("\x00" * 16), modes.GCM("\x00" * 12)
+        ),
+        skip_message="Does not support AES GCM",
+    )
+    def test_gcm(self, backend):
+        key = os.urandom(16)
+        iv = os.urandom(12)
+        data = os.urandom(1000)
+        dst = io.BytesIO()
+        stats = encrypt_file(
+            io.BytesIO(data), dst,
+            Cipher(algorithms.AES(key), modes.GCM(iv), backend), 64
+        )
+        assert len(stats.tag) == 16
+
+        out = io.BytesIO()
+        decrypt_file(
+            io.BytesIO(dst.getvalue()), out,
+            Cipher(algorithms.AES(key), modes.GCM(iv, stats.tag), backend), 64
+        )
+        assert out.getvalue() == data
+
+        with pytest.raises(InvalidTag):
+            decrypt_file(
+                io.BytesIO(dst.getvalue()), io.BytesIO(),
+                Cipher(
+                    algorithms.AES(key), modes.GCM(iv, b"\x00" * 16), backend
+                )
+            )
+
+    def test_invalid_chunk_size(self, backend):
+        cipher = Cipher(
+            algorithms.AES(b"\x00" * 16), modes.CTR(b"\x00" * 16), backend
+        )
+        with pytest.raises(TypeError):
+            encrypt_file(io.BytesIO(), io.BytesIO(), cipher, 1.5)
+        with pytest.raises(ValueError):
+            encrypt_file(io.BytesIO(), io.BytesIO(), cipher, 0)
@@ -0,0 +1,106 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import os
+
+import pytest
+
+from cryptography import utils
+from cryptography.hazmat.backends.interfaces import CipherBackend
+from cryptography.hazmat.primitives.ciphers import (
+    Cipher, algorithms, decrypt_sectors, encrypt_sectors, modes, sectors
+)
+
+
+def _xts_encrypt(key, tweak, data, backend):
+    cipher = Cipher(algorithms.AES(key), modes.XTS(tweak), backend)
+    encryptor = cipher.encryptor()
+    return encryptor.update(data) + encryptor.finalize()
+
+
+@pytest.mark.supported(
+    only_if=lambda backend: backend.cipher_supported(
+        algorithms.AES(b"\x00" * 32), modes.XTS(b"\x00" * 16)
+    ),
+    skip_message="Does not support AES XTS",
+)
+@pytest.mark.requires_backend_interface(interface=CipherBackend)
+class TestCipherSectors(object):
+    def test_sector_tweak(self):
+        assert sectors._sector_tweak(0) == b"\x00" * 16
+        assert sectors._sector_tweak(0x0102) == b"\x02\x01" + b"\x00" * 14
+        assert sectors._sector_tweak(2 ** 128 - 1) == b"\xff" * 16
+
+    def test_matches_single_sectors(self, backend):
+        key = os.urandom(64)
+        data = [os.urandom(4096) for _ in range(5)] + [os.urandom(17)]
+        ct = encrypt_sectors(algorithms.AES(key), data, backend, 1000)
+        assert ct == [
+            _xts_encrypt(key, sectors._sector_tweak(1000 + i), sector, backend)
+            for i, sector in enumerate(data)
+        ]
+        assert decrypt_sectors(algorithms.AES(key), ct, backend, 1000) == data
+
+    def test_empty(self, backend):
+        algorithm = algorithms.AES(os.urandom(32))
+        assert encrypt_sectors(algorithm, [], backend) == []
+
+    @pytest.mark.parametrize("workers", [2, 3, 8])
+    def test_parallel(self, backend, monkeypatch, workers):
+        monkeypatch.setattr(sectors, "_PARALLEL_SECTORS_THRESHOLD", 64)
+        monkeypatch.setattr(utils, "_cpu_count", lambda: workers)
+        key = os.urandom(32)
+        data = [os.urandom(16 + i) for i in range(7)]
+        ct = encrypt_sectors(algorithms.AES(key), data, backend, 5)
+        assert ct == [
+            _xts_encrypt(key, sectors._sector_tweak(5 + i), sector, backend)
+            for i, sector in enumerate(data)
+        ]
+        assert decrypt_sectors(algorithms.AES(key), ct, backend, 5) == data
+
+    def test_reuses_keyed_contexts(self, backend):
+        info = getattr(backend, "cipher_context_pool_info", None)
+        if info is None:
+            pytest.skip("Backend does not pool cipher contexts")
+
+        algorithm = algorithms.AES(os.urandom(32))
+        encrypt_sectors(algorithm, [b"\x00" * 512] * 4, backend)
+        hits = info().hits
+        encrypt_sectors(algorithm, [b"\x00" * 512] * 4, backend)
+        assert info().hits >= hits + 4
+
+    def test_short_sector(self, backend):
+        algorithm = algorithms.AES(os.urandom(32))
+        with pytest.raises(ValueError):
+            encrypt_sectors(algorithm, [b"\x00" * 16, b"\x00" * 15], backend)
+        with pytest.raises(ValueError):
+            encrypt_sectors(algorithms.AES(os.urandom(64)), [b""], backend)
+
+    def test_invalid_key(self, backend):
+        with pytest.raises(ValueError):
+            encrypt_sectors(
+                algorithms.AES(b"\x00" * 16), [b"\x00" * 16], backend
+            )
+        with pytest.raises(ValueError):
+            encrypt_sectors(
+                algorithms.AES(b"\x00" * 32), [b"\x00" * 16], backend
+            )
+
+    def test_invalid_first_sector(self, backend):
+        algorithm = algorithms.AES(os.urandom(32))
+        with pytest.raises(TypeError):
+            encrypt_sectors(algorithm, [b"\x00" * 16], backend, "0")
+        with pytest.raises(ValueError):
+            encrypt_sectors(algorithm, [b"\x00" * 16], backend, -1)
+        with pytest.raises(ValueError):
+            encrypt_sectors(
+                algorithm, [b"\x00" * 16] * 2, backend, 2 ** 128 - 1
+            )
+
+    def test_sectors_not_bytes(self, backend):
+        algorithm = algorithms.AES(os.urandom(32))
+        with pytest.raises(TypeError):
+            encrypt_sectors(algorithm, [u"text" * 4], backend)
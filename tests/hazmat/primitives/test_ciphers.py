@@ -9,7 +9,9 @@ import binascii
 import pytest
 
 from cryptography.exceptions import _Reasons
+from cryptography.hazmat.backends.interfaces import CipherBackend
 from cryptography.hazmat.primitives import ciphers
+from cryptography.hazmat.primitives.ciphers import modes
 from cryptography.hazmat.primitives.ciphers.algorithms import (
     AES, ARC4, Blowfish, CAST5, Camellia, IDEA, SEED, TripleDES
 )
@@ -23,6 +25,7 @@ class TestAES(object):
         (b"0" * 32, 128),
         (b"0" * 48, 192),
         (b"0" * 64, 256),
+        (b"0" * 128, 512),
     ])
     def test_key_size(self, key, keysize):
         cipher = AES(binascii.unhexlify(key))
@@ -32,6 +35,20 @@ class TestAES(object):
         with pytest.raises(ValueError):
             AES(binascii.unhexlify(b"0" * 12))
 
+    @pytest.mark.requires_backend_interface(interface=CipherBackend)
+    @pytest.mark.parametrize("mode", [
+        modes.CBC(b"0" * 16),
+        modes.ECB(),
+        modes.OFB(b"0" * 16),
+        modes.CFB(b"0" * 16),
+        modes.CFB8(b"0" * 16),
+        modes.CTR(b"0" * 16),
+        modes.GCM(b"0" * 12),
+    ])
+    def test_invalid_key_size_for_mode(self, mode, backend):
+        with pytest.raises(ValueError):
+            ciphers.Cipher(AES(b"0" * 64), mode, backend)
+
 
 class TestCamellia(object):
     @pytest.mark.parametrize(("key", "keysize"), [
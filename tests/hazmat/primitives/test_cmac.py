@@ -16,10 +16,11 @@ from cryptography.exceptions import (
     AlreadyFinalized, InvalidSignature, _Reasons
 )
 from cryptography.hazmat.backends.interfaces import CMACBackend
+from cryptography.hazmat.primitives import cmac as cmac_module
 from cryptography.hazmat.primitives.ciphers.algorithms import (
     AES, ARC4, TripleDES
 )
-from cryptography.hazmat.primitives.cmac import CMAC
+from cryptography.hazmat.primitives.cmac import CMAC, CMACKey
 
 from ..backends.test_multibackend import DummyCMACBackend
 from ...utils import (
@@ -188,6 +189,99 @@ class TestCMAC(object):
         assert cmac.finalize() == copy_cmac.finalize()
 
 
+class _CopyOnlyCMACContext(object):
+    def __init__(self, ctx):
+        self._ctx = ctx
+
+    def copy(self):
+        return self._ctx.copy()
+
+
+@pytest.mark.supported(
+    only_if=lambda backend: backend.cmac_algorithm_supported(AES(fake_key)),
+    skip_message="Does not support CMAC."
+)
+@pytest.mark.requires_backend_interface(interface=CMACBackend)
+class TestCMACKey(object):
+    def test_aes_vectors(self, backend):
+        for params in vectors_aes:
+            algorithm = AES(binascii.unhexlify(params["key"]))
+            message = binascii.unhexlify(params["message"])
+            output = binascii.unhexlify(params["output"])
+            key = CMACKey(algorithm, backend)
+            assert key.mac(message) == output
+            key.verify(message, output)
+            assert key.mac_many([message, message]) == [output, output]
+
+    def test_cmac(self, backend):
+        key = CMACKey(AES(fake_key), backend)
+        cmac = key.cmac()
+        assert isinstance(cmac, CMAC)
+        cmac.update(b"abc")
+        assert cmac.finalize() == key.mac(b"abc")
+        assert key.algorithm.key == fake_key
+
+    def test_mac_many(self, backend):
+        messages = [b"", b"abc", b"\x00" * 1000, b"abc"]
+        expected = []
+        for message in messages:
+            cmac = CMAC(AES(fake_key), backend)
+            cmac.update(message)
+            expected.append(cmac.finalize())
+        assert cmac_module.mac_many(
+            AES(fake_key), iter(messages), backend
+        ) == expected
+
+    def test_verify_many(self, backend):
+        key = CMACKey(AES(fake_key), backend)
+        messages = [b"", b"abc", b"abd", b"abe"]
+        tags = key.mac_many(messages)
+        tags[1] = tags[1][:-1] + six.int2byte(six.indexbytes(tags[1], -1) ^ 1)
+        tags[2] = tags[2][:-1]
+        assert cmac_module.verify_many(
+            AES(fake_key), zip(messages, tags), backend
+        ) == [True, False, False, True]
+
+    def test_invalid_verify(self, backend):
+        key = CMACKey(AES(fake_key), backend)
+        with pytest.raises(InvalidSignature):
+            key.verify(b"abc", key.mac(b"abd"))
+
+    def test_fallback(self, backend):
+        key = CMACKey(AES(fake_key), backend)
+        messages = [b"abc", b"def"]
+        tags = key.mac_many(messages)
+        key._ctx = _CopyOnlyCMACContext(key._ctx)
+        key._mac = None
+        assert key.mac(b"abc") == tags[0]
+        assert key.mac_many(messages) == tags
+        assert key.verify_many(
+            [(b"abc", tags[0]), (b"def", tags[0])]
+        ) == [True, False]
+
+    def test_empty(self, backend):
+        key = CMACKey(AES(fake_key), backend)
+        assert key.mac_many([]) == []
+        assert key.verify_many([]) == []
+
+    def test_reject_unicode(self, backend):
+        key = CMACKey(AES(fake_key), backend)
+        with pytest.raises(TypeError):
+            key.mac(six.u(""))
+        with pytest.raises(TypeError):
+            key.verify(b"", six.u(""))
+        with pytest.raises(TypeError):
+            key.mac_many([six.u("")])
+        with pytest.raises(TypeError):
+            key.verify_many([(six.u(""), b"")])
+        with pytest.raises(TypeError):
+            key.verify_many([(b"", six.u(""))])
+
+    def test_invalid_algorithm(self, backend):
+        with pytest.raises(TypeError):
+            CMACKey(ARC4(b"0102030405"), backend)
+
+
 def test_copy():
     backend = DummyCMACBackend([AES])
     copied_ctx = pretend.stub()
@@ -199,9 +293,19 @@ def test_copy():
     assert cmac.copy()._backend is backend
 
 
+@pytest.mark.parametrize("cls", [CMAC, CMACKey])
+def test_aes_xts_key_size(cls):
+    backend = DummyCMACBackend([AES])
+    with pytest.raises(ValueError):
+        cls(AES(b"0" * 64), backend)
+
+
 def test_invalid_backend():
     key = b"2b7e151628aed2a6abf7158809cf4f3c"
     pretend_backend = object()
 
     with raises_unsupported_algorithm(_Reasons.BACKEND_MISSING_INTERFACE):
         CMAC(AES(key), pretend_backend)
+
+    with raises_unsupported_algorithm(_Reasons.BACKEND_MISSING_INTERFACE):
+        CMACKey(AES(key), pretend_backend)
@@ -4,6 +4,11 @@
 
 from __future__ import absolute_import, division, print_function
 
+import array
+import binascii
+import io
+import os
+
 import pretend
 
 import pytest
@@ -11,12 +16,14 @@ import pytest
 import six
 
 from cryptography import utils
-from cryptography.exceptions import AlreadyFinalized, _Reasons
-from cryptography.hazmat.backends.interfaces import HashBackend
+from cryptography.exceptions import (
+    AlreadyFinalized, InvalidSignature, _Reasons
+)
+from cryptography.hazmat.backends.interfaces import HashBackend, XOFBackend
 from cryptography.hazmat.primitives import hashes, interfaces
 
 from .utils import generate_base_hash_test
-from ..backends.test_multibackend import DummyHashBackend
+from ..backends.test_multibackend import DummyHashBackend, DummyXOFBackend
 from ...utils import raises_unsupported_algorithm
 
 
@@ -27,6 +34,108 @@ class UnsupportedDummyHash(object):
     digest_size = None
 
 
+@utils.register_interface(HashBackend)
+class ContextOnlyHashBackend(object):
+    def __init__(self, ctx):
+        self._ctx = ctx
+
+    def hash_supported(self, algorithm):
+        return True
+
+    def create_hash_ctx(self, algorithm):
+        return self._ctx
+
+
+@pytest.mark.requires_backend_interface(interface=HashBackend)
+class TestDigest(object):
+    @pytest.mark.parametrize("size", [0, 1, 55, 64, 1000])
+    def test_matches_hash(self, backend, size):
+        data = b"x" * size
+        h = hashes.Hash(hashes.SHA256(), backend=backend)
+        h.update(data)
+        assert hashes.digest(hashes.SHA256(), data, backend) == h.finalize()
+
+    def test_buffer_protocol(self, backend):
+        expected = hashes.digest(hashes.SHA1(), b"abc", backend)
+        assert hashes.digest(
+            hashes.SHA1(), bytearray(b"abc"), backend
+        ) == expected
+
+    def test_reject_unicode(self, backend):
+        with pytest.raises(TypeError):
+            hashes.digest(hashes.SHA1(), six.u("\u00FC"), backend)
+
+    def test_hash_algorithm_instance(self, backend):
+        with pytest.raises(TypeError):
+            hashes.digest(hashes.SHA1, b"abc", backend)
+
+    def test_unsupported_hash(self, backend):
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hashes.digest(UnsupportedDummyHash(), b"abc", backend)
+
+    def test_context_fallback(self):
+        ctx = pretend.stub(
+            update=pretend.call_recorder(lambda data: None),
+            finalize=lambda: b"digest"
+        )
+        backend = ContextOnlyHashBackend(ctx)
+        assert hashes.digest(hashes.SHA1(), b"abc", backend) == b"digest"
+        assert ctx.update.calls == [pretend.call(b"abc")]
+
+
+@pytest.mark.requires_backend_interface(interface=HashBackend)
+class TestDigestMany(object):
+    @pytest.mark.parametrize(
+        "algorithm", [hashes.MD5(), hashes.SHA1(), hashes.SHA512()]
+    )
+    def test_matches_digest(self, backend, algorithm):
+        if not backend.hash_supported(algorithm):
+            pytest.skip("Does not support {0}".format(algorithm.name))
+        messages = [b"x" * size for size in [0, 1, 63, 64, 65, 1000]]
+        assert hashes.digest_many(algorithm, messages, backend) == [
+            hashes.digest(algorithm, message, backend)
+            for message in messages
+        ]
+
+    def test_empty(self, backend):
+        assert hashes.digest_many(hashes.SHA1(), [], backend) == []
+
+    def test_iterable_of_buffers(self, backend):
+        messages = (bytearray(b"abc") for _ in range(3))
+        assert hashes.digest_many(hashes.SHA1(), messages, backend) == [
+            hashes.digest(hashes.SHA1(), b"abc", backend)
+        ] * 3
+
+    def test_multi_byte_item_buffers(self, backend):
+        raw = os.urandom(32)
+        assert hashes.digest_many(
+            hashes.SHA1(), [array.array("I", raw)], backend
+        ) == [hashes.digest(hashes.SHA1(), raw, backend)]
+
+    def test_reject_unicode(self, backend):
+        with pytest.raises(TypeError):
+            hashes.digest_many(
+                hashes.SHA1(), [b"abc", six.u("\u00FC")], backend
+            )
+
+    def test_hash_algorithm_instance(self, backend):
+        with pytest.raises(TypeError):
+            hashes.digest_many(hashes.SHA1, [b"abc"], backend)
+
+    def test_unsupported_hash(self, backend):
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hashes.digest_many(UnsupportedDummyHash(), [b"abc"], backend)
+
+    def test_context_fallback(self):
+        ctx = pretend.stub(
+            update=lambda data: None, finalize=lambda: b"digest"
+        )
+        backend = ContextOnlyHashBackend(ctx)
+        assert hashes.digest_many(
+            hashes.SHA1(), [b"a", b"b"], backend
+        ) == [b"digest", b"digest"]
+
+
 @pytest.mark.requires_backend_interface(interface=HashBackend)
 class TestHashContext(object):
     def test_hash_reject_unicode(self, backend):
@@ -63,6 +172,261 @@ class TestHashContext(object):
         with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
             hashes.Hash(UnsupportedDummyHash(), backend)
 
+    def test_update_accepts_buffers(self, backend):
+        h = hashes.Hash(hashes.SHA1(), backend=backend)
+        h.update(bytearray(b"abc"))
+        h.update(memoryview(b"0123")[1:])
+        assert h.finalize() == hashes.digest(
+            hashes.SHA1(), b"abc123", backend
+        )
+
+    def test_reset(self, backend):
+        h = hashes.Hash(hashes.SHA1(), backend=backend)
+        h.update(b"abc")
+        h.reset()
+        h.update(b"123")
+        assert h.finalize() == hashes.digest(hashes.SHA1(), b"123", backend)
+
+    def test_reset_after_finalize(self, backend):
+        h = hashes.Hash(hashes.SHA1(), backend=backend)
+        for data in [b"", b"abc", b"x" * 1000]:
+            h.reset()
+            h.update(data)
+            assert h.finalize() == hashes.digest(hashes.SHA1(), data, backend)
+
+    def test_reset_does_not_affect_copy(self, backend):
+        h = hashes.Hash(hashes.SHA1(), backend=backend)
+        h.update(b"abc")
+        copy = h.copy()
+        h.reset()
+        assert copy.finalize() == hashes.digest(hashes.SHA1(), b"abc", backend)
+
+    def test_reset_without_context_support(self):
+        ctx = pretend.stub(finalize=lambda: b"digest")
+        backend = ContextOnlyHashBackend(pretend.stub())
+        h = hashes.Hash(hashes.SHA1(), backend=backend, ctx=ctx)
+        h.finalize()
+        h.reset()
+        assert h._ctx is backend._ctx
+
+
+class ReadOnlyStream(object):
+    """
+    A file-like object without readinto.
+    """
+    def __init__(self, data):
+        self._stream = io.BytesIO(data)
+
+    def read(self, size):
+        return self._stream.read(size)
+
+
+class NonBlockingStream(object):
+    """
+    A non-blocking file-like object with no data ready.
+    """
+    def read(self, size):
+        return None
+
+
+class NonBlockingRawStream(NonBlockingStream):
+    def readinto(self, buf):
+        return None
+
+
+@pytest.mark.requires_backend_interface(interface=HashBackend)
+class TestHashFile(object):
+    @pytest.mark.parametrize("length", [0, 1, 5000])
+    def test_path(self, backend, tmpdir, length):
+        data = os.urandom(length)
+        path = tmpdir.join("data")
+        path.write(data, mode="wb")
+        expected = hashes.digest(hashes.SHA256(), data, backend)
+        digest = hashes.hash_file(str(path), hashes.SHA256(), backend)
+        assert digest == expected
+
+    @pytest.mark.parametrize("chunk_size", [None, 1, 64, 4096])
+    @pytest.mark.parametrize("length", [0, 1, 5000])
+    def test_stream(self, backend, chunk_size, length):
+        data = os.urandom(length)
+        expected = hashes.digest(hashes.SHA256(), data, backend)
+        assert hashes.hash_stream(
+            io.BytesIO(data), hashes.SHA256(), backend, chunk_size
+        ) == expected
+        assert hashes.hash_stream(
+            ReadOnlyStream(data), hashes.SHA256(), backend, chunk_size
+        ) == expected
+
+    def test_non_blocking_stream(self, backend):
+        with pytest.raises(ValueError):
+            hashes.hash_stream(NonBlockingStream(), hashes.SHA256(), backend)
+        with pytest.raises(ValueError):
+            hashes.hash_stream(
+                NonBlockingRawStream(), hashes.SHA256(), backend
+            )
+
+    def test_file_object(self, backend):
+        stream = io.BytesIO(b"skip" + b"x" * 100)
+        stream.seek(4)
+        assert hashes.hash_file(stream, hashes.SHA256(), backend) == (
+            hashes.digest(hashes.SHA256(), b"x" * 100, backend)
+        )
+
+    def test_invalid_chunk_size(self, backend):
+        with pytest.raises(TypeError):
+            hashes.hash_stream(io.BytesIO(), hashes.SHA1(), backend, "1")
+        with pytest.raises(ValueError):
+            hashes.hash_stream(io.BytesIO(), hashes.SHA1(), backend, 0)
+
+    def test_unsupported_hash(self, backend, tmpdir):
+        path = tmpdir.join("data")
+        path.write(b"data", mode="wb")
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hashes.hash_file(str(path), UnsupportedDummyHash(), backend)
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hashes.hash_stream(io.BytesIO(), UnsupportedDummyHash(), backend)
+
+
+# The leaves and roots used by the Certificate Transparency reference
+# implementation's Merkle tree tests.
+CT_LEAVES = [
+    b"",
+    b"\x00",
+    b"\x10",
+    b"\x20\x21",
+    b"\x30\x31",
+    b"\x40\x41\x42\x43",
+    b"\x50\x51\x52\x53\x54\x55\x56\x57",
+    b"\x60\x61\x62\x63\x64\x65\x66\x67"
+    b"\x68\x69\x6a\x6b\x6c\x6d\x6e\x6f",
+]
+
+CT_ROOTS = [
+    b"6e340b9cffb37a989ca544e6bb780a2c78901d3fb33738768511a30617afa01d",
+    b"fac54203e7cc696cf0dfcb42c92a1d9dbaf70ad9e621f4bd8d98662f00e3c125",
+    b"aeb6bcfe274b70a14fb067a5e5578264db0fa9b51af5e0ba159158f329e06e77",
+    b"d37ee418976dd95753c1c73862b9398fa2a2cf9b4ff0fdfe8b30cd95209614b7",
+    b"4e3bbb1f7b478dcfe71fb631631519a3bca12c9aefca1612bfce4c13a86264d4",
+    b"76e67dadbcdf1e10e1b74ddc608abd2f98dfb16fbce75277b5232a127f2087ef",
+    b"ddb89be403809e325750d3d263cd78929c2942b7942a34b77e122c9594a74c8c",
+    b"5dc9da79a70659a9ad559cb701ded9a2ab9d823aad2f4960cfe370eff4604328",
+]
+
+
+@pytest.mark.supported(
+    only_if=lambda backend: backend.hash_supported(hashes.SHA256()),
+    skip_message="Does not support SHA256",
+)
+@pytest.mark.requires_backend_interface(interface=HashBackend)
+class TestMerkleTree(object):
+    def test_ct_roots(self, backend):
+        tree = hashes.MerkleTree(hashes.SHA256(), backend)
+        stream = hashes.MerkleTree(hashes.SHA256(), backend, keep_nodes=False)
+        for leaf, root in zip(CT_LEAVES, CT_ROOTS):
+            tree.append(leaf)
+            stream.append(leaf)
+            assert tree.root() == binascii.unhexlify(root)
+            assert stream.root() == binascii.unhexlify(root)
+
+    def test_ct_proof(self, backend):
+        tree = hashes.MerkleTree(hashes.SHA256(), backend)
+        tree.extend(CT_LEAVES)
+        assert tree.proof(0) == [
+            binascii.unhexlify(node) for node in [
+                b"96a296d224f285c67bee93c30f8a309157f0daa35dc5b87e410b78630a0"
+                b"9cfc7",
+                b"5f083f0a1a33ca076a95279832580db3e0ef4584bdff1f54c8a360f50de"
+                b"3031e",
+                b"6b47aaf29ee3c2af9af889bc1fb9254dabd31177f16232dd6aab035ca39"
+                b"bf6e4",
+            ]
+        ]
+
+    def test_empty(self, backend):
+        tree = hashes.MerkleTree(hashes.SHA256(), backend)
+        assert len(tree) == 0
+        assert tree.root() == hashes.digest(hashes.SHA256(), b"", backend)
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 8, 9, 33])
+    def test_proofs(self, backend, size):
+        leaves = [os.urandom(i % 40) for i in range(size)]
+        tree = hashes.MerkleTree(hashes.SHA256(), backend)
+        tree.extend(leaves)
+        root = tree.root()
+        for index, leaf in enumerate(leaves):
+            proof = tree.proof(index)
+            hashes.verify_merkle_proof(
+                hashes.SHA256(), leaf, index, size, proof, root, backend
+            )
+            with pytest.raises(InvalidSignature):
+                hashes.verify_merkle_proof(
+                    hashes.SHA256(), leaf + b"\x00", index, size, proof, root,
+                    backend
+                )
+            with pytest.raises(InvalidSignature):
+                hashes.verify_merkle_proof(
+                    hashes.SHA256(), leaf, index, size, proof + [root], root,
+                    backend
+                )
+
+    def test_batches_match_appends(self, backend):
+        leaves = [os.urandom(16) for _ in range(50)]
+        batched = hashes.MerkleTree(hashes.SHA256(), backend)
+        stream = hashes.MerkleTree(hashes.SHA256(), backend, keep_nodes=False)
+        for start, end in [(0, 1), (1, 5), (5, 5), (5, 32), (32, 50)]:
+            batched.extend(leaves[start:end])
+            stream.extend(leaves[start:end])
+        appended = hashes.MerkleTree(hashes.SHA256(), backend)
+        for leaf in leaves:
+            appended.append(leaf)
+
+        assert len(batched) == len(stream) == len(appended) == 50
+        assert batched.root() == stream.root() == appended.root()
+        assert batched.proof(37) == appended.proof(37)
+
+    def test_streaming_memory(self, backend):
+        tree = hashes.MerkleTree(hashes.SHA256(), backend, keep_nodes=False)
+        tree.extend([b"leaf"] * 1000)
+        assert all(len(level) <= 1 for level in tree._levels)
+        with pytest.raises(ValueError):
+            tree.proof(0)
+
+    def test_invalid_index(self, backend):
+        tree = hashes.MerkleTree(hashes.SHA256(), backend)
+        tree.extend([b"a", b"b"])
+        with pytest.raises(TypeError):
+            tree.proof("0")
+        with pytest.raises(ValueError):
+            tree.proof(2)
+        with pytest.raises(ValueError):
+            tree.proof(-1)
+
+        with pytest.raises(TypeError):
+            hashes.verify_merkle_proof(
+                hashes.SHA256(), b"a", "0", 2, [], tree.root(), backend
+            )
+        with pytest.raises(TypeError):
+            hashes.verify_merkle_proof(
+                hashes.SHA256(), b"a", 0, "2", [], tree.root(), backend
+            )
+        with pytest.raises(InvalidSignature):
+            hashes.verify_merkle_proof(
+                hashes.SHA256(), b"a", 2, 2, [], tree.root(), backend
+            )
+
+    def test_reject_unicode(self, backend):
+        tree = hashes.MerkleTree(hashes.SHA256(), backend)
+        with pytest.raises(TypeError):
+            tree.append(six.u("\u00FC"))
+
+    def test_hash_algorithm_instance(self, backend):
+        with pytest.raises(TypeError):
+            hashes.MerkleTree(hashes.SHA256, backend)
+
+    def test_unsupported_hash(self, backend):
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hashes.MerkleTree(UnsupportedDummyHash(), backend)
+
 
 @pytest.mark.supported(
     only_if=lambda backend: backend.hash_supported(hashes.SHA1()),
@@ -168,8 +532,219 @@ class TestMD5(object):
     )
 
 
+@pytest.mark.supported(
+    only_if=lambda backend: backend.hash_supported(hashes.BLAKE2b(64)),
+    skip_message="Does not support BLAKE2b",
+)
+@pytest.mark.requires_backend_interface(interface=HashBackend)
+class TestBLAKE2b(object):
+    test_BLAKE2b = generate_base_hash_test(
+        hashes.BLAKE2b(64),
+        digest_size=64,
+        block_size=128,
+    )
+
+
+@pytest.mark.supported(
+    only_if=lambda backend: backend.hash_supported(hashes.BLAKE2s(32)),
+    skip_message="Does not support BLAKE2s",
+)
+@pytest.mark.requires_backend_interface(interface=HashBackend)
+class TestBLAKE2s(object):
+    test_BLAKE2s = generate_base_hash_test(
+        hashes.BLAKE2s(32),
+        digest_size=32,
+        block_size=64,
+    )
+
+
+@pytest.mark.parametrize(
+    ("algorithm", "digest_size"),
+    [
+        (hashes.BLAKE2b, 0),
+        (hashes.BLAKE2b, 32),
+        (hashes.BLAKE2b, 65),
+        (hashes.BLAKE2s, 0),
+        (hashes.BLAKE2s, 16),
+        (hashes.BLAKE2s, 33),
+    ]
+)
+def test_blake2_invalid_digest_size(algorithm, digest_size):
+    with pytest.raises(ValueError):
+        algorithm(digest_size)
+
+
+@pytest.mark.supported(
+    only_if=lambda backend: backend.hash_supported(hashes.SHA3_256()),
+    skip_message="Does not support SHA3-256",
+)
+@pytest.mark.requires_backend_interface(interface=HashBackend)
+class TestSHA3256(object):
+    test_sha3_256 = generate_base_hash_test(
+        hashes.SHA3_256(),
+        digest_size=32,
+        block_size=136,
+    )
+
+
+@pytest.mark.supported(
+    only_if=lambda backend: backend.hash_supported(hashes.SHAKE128(100)),
+    skip_message="Does not support SHAKE128",
+)
+@pytest.mark.requires_backend_interface(interface=HashBackend)
+class TestSHAKE128(object):
+    test_shake128 = generate_base_hash_test(
+        hashes.SHAKE128(100),
+        digest_size=100,
+        block_size=168,
+    )
+
+    def test_long_output(self, backend):
+        # The output may be longer than any fixed-size digest.
+        assert hashes.digest(hashes.SHAKE128(100), b"abc", backend) == (
+            binascii.unhexlify(
+                b"5881092dd818bf5cf8a3ddb793fbcba74097d5c526a6d35f97b83351940f"
+                b"2cc844c50af32acd3f2cdd066568706f509bc1bdde58295dae3f891a9a0f"
+                b"ca5783789a41f8611214ce612394df286a62d1a2252aa94db9c538956c71"
+                b"7dc2bed4f232a0294c85"
+            )
+        )
+
+    def test_digest_many(self, backend):
+        messages = [b"", b"abc"]
+        assert hashes.digest_many(hashes.SHAKE128(100), messages, backend) == [
+            hashes.digest(hashes.SHAKE128(100), m, backend) for m in messages
+        ]
+
+
+@pytest.mark.parametrize("algorithm", [hashes.SHAKE128, hashes.SHAKE256])
+def test_shake_invalid_digest_size(algorithm):
+    with pytest.raises(TypeError):
+        algorithm("16")
+    with pytest.raises(ValueError):
+        algorithm(0)
+
+
+class DummyXOFContext(object):
+    def __init__(self):
+        self.data = b""
+        self.squeezed = 0
+
+    def update(self, data):
+        self.data += data
+
+    def copy(self):
+        copied = DummyXOFContext()
+        copied.data = self.data
+        return copied
+
+    def squeeze_into(self, buf):
+        buf[:] = b"\x01" * len(buf)
+        self.squeezed += len(buf)
+        return len(buf)
+
+
+def _dummy_xof_hash(algorithm):
+    return hashes.XOFHash(
+        algorithm,
+        DummyXOFBackend([hashes.SHAKE128, hashes.SHAKE256]),
+        ctx=DummyXOFContext()
+    )
+
+
+class TestXOFHashState(object):
+    def test_squeeze(self):
+        h = _dummy_xof_hash(hashes.SHAKE128(16))
+        h.update(b"abc")
+        assert h._ctx.data == b"abc"
+        assert h.squeeze(3) == b"\x01" * 3
+        assert h.squeeze(0) == b""
+        buf = bytearray(5)
+        assert h.squeeze_into(buf) == 5
+        assert buf == bytearray(b"\x01" * 5)
+        assert h._ctx.squeezed == 8
+
+    def test_raises_after_squeeze(self):
+        h = _dummy_xof_hash(hashes.SHAKE128(16))
+        h.squeeze(1)
+
+        with pytest.raises(AlreadyFinalized):
+            h.update(b"foo")
+
+        with pytest.raises(AlreadyFinalized):
+            h.copy()
+
+    def test_copy(self):
+        h = _dummy_xof_hash(hashes.SHAKE256(16))
+        h.update(b"abc")
+        copy = h.copy()
+        copy.update(b"123")
+        assert h._ctx.data == b"abc"
+        assert copy._ctx.data == b"abc123"
+        assert copy._backend is h._backend
+
+    def test_invalid_arguments(self):
+        h = _dummy_xof_hash(hashes.SHAKE128(16))
+        with pytest.raises(TypeError):
+            h.update(six.u("\u00FC"))
+        with pytest.raises(TypeError):
+            h.squeeze("1")
+        with pytest.raises(ValueError):
+            h.squeeze(-1)
+        with pytest.raises(TypeError):
+            h.squeeze_into(b"\x00" * 16)
+
+    def test_not_an_xof(self):
+        with pytest.raises(TypeError):
+            hashes.XOFHash(hashes.SHA256(), DummyXOFBackend([hashes.SHA256]))
+
+    def test_invalid_backend(self):
+        with raises_unsupported_algorithm(
+            _Reasons.BACKEND_MISSING_INTERFACE
+        ):
+            hashes.XOFHash(hashes.SHAKE128(16), object())
+
+
+@pytest.mark.parametrize(
+    "algorithm", [hashes.SHAKE128(64), hashes.SHAKE256(64)]
+)
+@pytest.mark.requires_backend_interface(interface=XOFBackend)
+class TestXOFHash(object):
+    def test_squeeze_matches_digest(self, backend, algorithm):
+        if not backend.xof_supported(algorithm):
+            pytest.skip("Does not support {0}".format(algorithm.name))
+
+        h = hashes.XOFHash(algorithm, backend)
+        h.update(b"abc")
+        h.update(bytearray(b"123"))
+        expected = hashes.digest(algorithm, b"abc123", backend)
+        assert h.squeeze(64) == expected
+
+    def test_incremental_squeeze(self, backend, algorithm):
+        if not backend.xof_supported(algorithm):
+            pytest.skip("Does not support {0}".format(algorithm.name))
+
+        expected = hashes.XOFHash(algorithm, backend).squeeze(5000)
+        h = hashes.XOFHash(algorithm, backend)
+        output = b""
+        for length in [0, 1, 7, 200, 1000, 3792]:
+            buf = bytearray(length)
+            assert h.squeeze_into(buf) == length
+            output += bytes(buf)
+        assert output == expected
+
+
 def test_invalid_backend():
     pretend_backend = object()
 
     with raises_unsupported_algorithm(_Reasons.BACKEND_MISSING_INTERFACE):
         hashes.Hash(hashes.SHA1(), pretend_backend)
+
+    with raises_unsupported_algorithm(_Reasons.BACKEND_MISSING_INTERFACE):
+        hashes.digest(hashes.SHA1(), b"abc", pretend_backend)
+
+    with raises_unsupported_algorithm(_Reasons.BACKEND_MISSING_INTERFACE):
+        hashes.digest_many(hashes.SHA1(), [], pretend_backend)
+
+    with raises_unsupported_algorithm(_Reasons.BACKEND_MISSING_INTERFACE):
+        hashes.MerkleTree(hashes.SHA1(), pretend_backend)
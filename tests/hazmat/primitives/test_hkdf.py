@@ -15,7 +15,9 @@ from cryptography.exceptions import (
 )
 from cryptography.hazmat.backends.interfaces import HMACBackend
 from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.hkdf import HKDF, HKDFExpand
+from cryptography.hazmat.primitives.kdf.hkdf import (
+    HKDF, HKDFExpand, derive_many
+)
 
 from ...utils import raises_unsupported_algorithm
 
@@ -201,6 +203,59 @@ class TestHKDFExpand(object):
             hkdf.derive(six.u("first"))
 
 
+@pytest.mark.requires_backend_interface(interface=HMACBackend)
+class TestHKDFDeriveMany(object):
+    def test_derive_many(self, backend):
+        infos = {b"": 42, b"client": 32, b"server": 12, b"long": 100}
+        keys = derive_many(hashes.SHA256(), b"salt", b"secret", infos, backend)
+        assert len(keys) == len(infos)
+        for info, length in infos.items():
+            hkdf = HKDF(hashes.SHA256(), length, b"salt", info, backend)
+            assert keys[info] == hkdf.derive(b"secret")
+
+    def test_rfc5869_vector(self, backend):
+        keys = derive_many(
+            hashes.SHA256(),
+            binascii.unhexlify(b"000102030405060708090a0b0c"),
+            binascii.unhexlify(b"0b" * 22),
+            [(binascii.unhexlify(b"f0f1f2f3f4f5f6f7f8f9"), 42)],
+            backend
+        )
+        assert keys == {
+            binascii.unhexlify(b"f0f1f2f3f4f5f6f7f8f9"): binascii.unhexlify(
+                b"3cb25f25faacd57a90434f64d0362f2a2d2d0a90cf1a5a4c5db02d56ecc4"
+                b"c5bf34007208d5b887185865"
+            )
+        }
+
+    def test_default_salt(self, backend):
+        keys = derive_many(hashes.SHA1(), None, b"secret", {b"": 8}, backend)
+        hkdf = HKDF(hashes.SHA1(), 8, None, None, backend)
+        assert keys[b""] == hkdf.derive(b"secret")
+
+    def test_empty(self, backend):
+        assert derive_many(hashes.SHA256(), None, b"", {}, backend) == {}
+
+    def test_length_limit(self, backend):
+        big_length = 255 * (hashes.SHA256().digest_size // 8) + 1
+        with pytest.raises(ValueError):
+            derive_many(
+                hashes.SHA256(), None, b"", {b"": big_length}, backend
+            )
+        with pytest.raises(ValueError):
+            derive_many(hashes.SHA256(), None, b"", {b"": -1}, backend)
+
+    def test_unicode_typeerror(self, backend):
+        with pytest.raises(TypeError):
+            derive_many(hashes.SHA256(), six.u("salt"), b"", {}, backend)
+        with pytest.raises(TypeError):
+            derive_many(hashes.SHA256(), None, six.u("secret"), {}, backend)
+        with pytest.raises(TypeError):
+            derive_many(hashes.SHA256(), None, b"", {six.u(""): 8}, backend)
+        with pytest.raises(TypeError):
+            derive_many(hashes.SHA256(), None, b"", {b"": 8.0}, backend)
+
+
 def test_invalid_backend():
     pretend_backend = object()
 
@@ -209,3 +264,6 @@ def test_invalid_backend():
 
     with raises_unsupported_algorithm(_Reasons.BACKEND_MISSING_INTERFACE):
         HKDFExpand(hashes.SHA256(), 16, None, pretend_backend)
+
+    with raises_unsupported_algorithm(_Reasons.BACKEND_MISSING_INTERFACE):
+        derive_many(hashes.SHA256(), None, b"", {}, pretend_backend)
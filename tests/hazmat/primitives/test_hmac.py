@@ -4,6 +4,8 @@
 
 from __future__ import absolute_import, division, print_function
 
+import binascii
+
 import pretend
 
 import pytest
@@ -40,6 +42,30 @@ class TestHMACCopy(object):
     )
 
 
+@pytest.mark.parametrize(
+    ("algorithm", "md"),
+    [
+        (
+            hashes.BLAKE2b(64),
+            "92294f92c0dfb9b00ec9ae8bd94d7e7d8a036b885a499f149dfe2fd2199394aa"
+            "af6b8894a1730cccb2cd050f9bcf5062a38b51b0dab33207f8ef35ae2c9df51b"
+        ),
+        (
+            hashes.BLAKE2s(32),
+            "f93215bb90d4af4c3061cd932fb169fb8bb8a91d0b4022baea1271e1323cd9a0"
+        ),
+    ]
+)
+@pytest.mark.requires_backend_interface(interface=HMACBackend)
+def test_hmac_blake2(backend, algorithm, md):
+    if not backend.hmac_supported(algorithm):
+        pytest.skip("Does not support {0}".format(algorithm.name))
+
+    h = hmac.HMAC(b"key", algorithm, backend=backend)
+    h.update(b"The quick brown fox jumps over the lazy dog")
+    assert h.finalize() == binascii.unhexlify(md)
+
+
 @pytest.mark.requires_backend_interface(interface=HMACBackend)
 class TestHMAC(object):
     def test_hmac_reject_unicode(self, backend):
@@ -105,3 +131,127 @@ def test_invalid_backend():
 
     with raises_unsupported_algorithm(_Reasons.BACKEND_MISSING_INTERFACE):
         hmac.HMAC(b"key", hashes.SHA1(), pretend_backend)
+
+
+@pytest.mark.requires_backend_interface(interface=HMACBackend)
+class TestHMACKey(object):
+    def test_mac(self, backend):
+        key = hmac.HMACKey(b"key", hashes.SHA256(), backend)
+        for data in [b"", b"abc", b"\x00" * 1000]:
+            h = hmac.HMAC(b"key", hashes.SHA256(), backend)
+            h.update(data)
+            assert key.mac(data) == h.finalize()
+
+    def test_mac_without_backend_one_shot(self, backend):
+        key = hmac.HMACKey(b"key", hashes.SHA256(), backend)
+        expected = key.mac(b"abc")
+        key._mac = None
+        assert key.mac(b"abc") == expected
+
+    def test_hmac(self, backend):
+        key = hmac.HMACKey(b"key", hashes.SHA1(), backend)
+        h = key.hmac()
+        assert isinstance(h, hmac.HMAC)
+        assert isinstance(h.algorithm, hashes.SHA1)
+        h.update(b"abc")
+        assert h.finalize() == key.mac(b"abc")
+        assert key.hmac().finalize() == key.mac(b"")
+
+    def test_verify(self, backend):
+        key = hmac.HMACKey(b"key", hashes.SHA256(), backend)
+        tag = key.mac(b"abc")
+        key.verify(b"abc", tag)
+        key.verify(b"abc", tag)
+        with pytest.raises(InvalidSignature):
+            key.verify(b"abd", tag)
+        with pytest.raises(InvalidSignature):
+            key.verify(b"abc", tag[:-1])
+
+    def test_reject_unicode(self, backend):
+        key = hmac.HMACKey(b"key", hashes.SHA1(), backend)
+        with pytest.raises(TypeError):
+            key.mac(six.u(""))
+        with pytest.raises(TypeError):
+            key.verify(b"", six.u(""))
+
+    def test_algorithm_instance(self, backend):
+        with pytest.raises(TypeError):
+            hmac.HMACKey(b"key", hashes.SHA1, backend)
+
+    def test_unsupported_hash(self, backend):
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hmac.HMACKey(b"key", UnsupportedDummyHash(), backend)
+
+    def test_invalid_backend(self):
+        with raises_unsupported_algorithm(_Reasons.BACKEND_MISSING_INTERFACE):
+            hmac.HMACKey(b"key", hashes.SHA1(), object())
+
+
+class _CopyOnlyHMACContext(object):
+    def __init__(self, ctx):
+        self._ctx = ctx
+
+    def copy(self):
+        return self._ctx.copy()
+
+
+@pytest.mark.requires_backend_interface(interface=HMACBackend)
+class TestHMACMany(object):
+    def _macs(self, key, messages, backend):
+        return [
+            hmac.HMACKey(key, hashes.SHA256(), backend).mac(message)
+            for message in messages
+        ]
+
+    def test_mac_many(self, backend):
+        messages = [b"", b"abc", b"\x00" * 1000, b"abc"]
+        assert hmac.mac_many(
+            b"key", hashes.SHA256(), messages, backend
+        ) == self._macs(b"key", messages, backend)
+
+    def test_mac_many_iterable(self, backend):
+        messages = [b"a", b"b"]
+        assert hmac.mac_many(
+            b"key", hashes.SHA256(), iter(messages), backend
+        ) == self._macs(b"key", messages, backend)
+
+    def test_verify_many(self, backend):
+        messages = [b"", b"abc", b"\x00" * 1000, b"abd", b"abe"]
+        tags = self._macs(b"key", messages, backend)
+        tags[1] = tags[1][:-1] + six.int2byte(six.indexbytes(tags[1], -1) ^ 1)
+        tags[3] = tags[3][:-1]
+        tags[4] = tags[4] + b"\x00"
+        assert hmac.verify_many(
+            b"key", hashes.SHA256(), zip(messages, tags), backend
+        ) == [True, False, True, False, False]
+
+    def test_fallback(self, backend):
+        key = hmac.HMACKey(b"key", hashes.SHA256(), backend)
+        messages = [b"abc", b"def"]
+        tags = key.mac_many(messages)
+        key._ctx = _CopyOnlyHMACContext(key._ctx)
+        key._mac = None
+        assert key.mac_many(messages) == tags
+        assert key.verify_many(
+            [(b"abc", tags[0]), (b"def", tags[0])]
+        ) == [True, False]
+
+    def test_empty(self, backend):
+        assert hmac.mac_many(b"key", hashes.SHA256(), [], backend) == []
+        assert hmac.verify_many(b"key", hashes.SHA256(), [], backend) == []
+
+    def test_reject_unicode(self, backend):
+        with pytest.raises(TypeError):
+            hmac.mac_many(b"key", hashes.SHA256(), [six.u("abc")], backend)
+        with pytest.raises(TypeError):
+            hmac.verify_many(
+                b"key", hashes.SHA256(), [(six.u("abc"), b"")], backend
+            )
+        with pytest.raises(TypeError):
+            hmac.verify_many(
+                b"key", hashes.SHA256(), [(b"abc", six.u(""))], backend
+            )
+
+    def test_unsupported_hash(self, backend):
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hmac.mac_many(b"key", UnsupportedDummyHash(), [b""], backend)
@@ -13,8 +13,10 @@ from cryptography.exceptions import (
     AlreadyFinalized, InvalidKey, _Reasons
 )
 from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.backends.interfaces import PBKDF2HMACBackend
 from cryptography.hazmat.primitives import hashes, interfaces
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf import pbkdf2
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC, derive_many
 
 from ...utils import raises_unsupported_algorithm
 
@@ -59,14 +61,168 @@ class TestPBKDF2HMAC(object):
         with pytest.raises(TypeError):
             PBKDF2HMAC(hashes.SHA1(), 20, six.u("salt"), 10, default_backend())
 
+    def test_length_limit(self):
+        PBKDF2HMAC(
+            hashes.SHA1(), (2 ** 32 - 1) * 20, b"salt", 10, default_backend()
+        )
+        with pytest.raises(ValueError):
+            PBKDF2HMAC(
+                hashes.SHA1(), (2 ** 32 - 1) * 20 + 1, b"salt", 10,
+                default_backend()
+            )
+
     def test_unicode_error_with_key_material(self):
         kdf = PBKDF2HMAC(hashes.SHA1(), 20, b"salt", 10, default_backend())
         with pytest.raises(TypeError):
             kdf.derive(six.u("unicode here"))
 
 
+@utils.register_interface(PBKDF2HMACBackend)
+class TimedPBKDF2HMACBackend(object):
+    """
+    Advances a fake clock by a fixed time per iteration for each derivation.
+    """
+    def __init__(self, seconds_per_iteration):
+        self.now = 0.0
+        self.derivations = []
+        self._seconds_per_iteration = seconds_per_iteration
+
+    def pbkdf2_hmac_supported(self, algorithm):
+        return isinstance(algorithm, hashes.SHA256)
+
+    def derive_pbkdf2_hmac(self, algorithm, length, salt, iterations,
+                           key_material):
+        self.derivations.append((length, iterations))
+        self.now += iterations * self._seconds_per_iteration
+        return b"\x00" * length
+
+
+class TestPBKDF2Calibrate(object):
+    def test_calibrate(self, monkeypatch):
+        backend = TimedPBKDF2HMACBackend(1e-6)
+        monkeypatch.setattr(pbkdf2, "_calibrated_rates", {})
+        monkeypatch.setattr(pbkdf2, "_clock", lambda: backend.now)
+        iterations = PBKDF2HMAC.calibrate(hashes.SHA256(), 32, 0.5, backend)
+        assert iterations == 500000
+        assert backend.derivations[-1][1] * 1e-6 >= (
+            pbkdf2._CALIBRATION_MIN_SECONDS
+        )
+        assert all(length == 32 for length, _ in backend.derivations)
+
+    def test_cached(self, monkeypatch):
+        backend = TimedPBKDF2HMACBackend(1e-6)
+        monkeypatch.setattr(pbkdf2, "_calibrated_rates", {})
+        monkeypatch.setattr(pbkdf2, "_clock", lambda: backend.now)
+        PBKDF2HMAC.calibrate(hashes.SHA256(), 32, 0.5, backend)
+        count = len(backend.derivations)
+        assert PBKDF2HMAC.calibrate(hashes.SHA256(), 32, 2, backend) == (
+            2000000
+        )
+        assert len(backend.derivations) == count
+        PBKDF2HMAC.calibrate(hashes.SHA256(), 64, 0.5, backend)
+        assert len(backend.derivations) > count
+
+    def test_minimum_one_iteration(self, monkeypatch):
+        backend = TimedPBKDF2HMACBackend(1.0)
+        monkeypatch.setattr(pbkdf2, "_calibrated_rates", {})
+        monkeypatch.setattr(pbkdf2, "_clock", lambda: backend.now)
+        assert PBKDF2HMAC.calibrate(hashes.SHA256(), 32, 1e-9, backend) == 1
+
+    def test_default_backend(self):
+        iterations = PBKDF2HMAC.calibrate(
+            hashes.SHA1(), 20, 0.01, default_backend()
+        )
+        assert iterations >= 1
+        assert PBKDF2HMAC.calibrate(
+            hashes.SHA1(), 20, 0.02, default_backend()
+        ) >= iterations
+
+    def test_invalid_target(self):
+        backend = TimedPBKDF2HMACBackend(1e-6)
+        with pytest.raises(TypeError):
+            PBKDF2HMAC.calibrate(hashes.SHA256(), 32, "1", backend)
+        with pytest.raises(ValueError):
+            PBKDF2HMAC.calibrate(hashes.SHA256(), 32, 0, backend)
+
+    def test_unsupported_algorithm(self):
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            PBKDF2HMAC.calibrate(DummyHash(), 20, 1, default_backend())
+
+
+class TestPBKDF2DeriveMany(object):
+    def _expected(self, pairs):
+        return [
+            PBKDF2HMAC(
+                hashes.SHA1(), 20, salt, 10, default_backend()
+            ).derive(password)
+            for password, salt in pairs
+        ]
+
+    def test_derive_many(self):
+        pairs = [(b"password", b"salt"), (b"", b"salt2"), (b"pw", b"")]
+        assert derive_many(
+            hashes.SHA1(), 20, 10, iter(pairs), default_backend()
+        ) == self._expected(pairs)
+
+    @pytest.mark.parametrize("workers", [None, 1, 2, 3, 8])
+    def test_workers(self, monkeypatch, workers):
+        monkeypatch.setattr(utils, "_cpu_count", lambda: 3)
+        pairs = [(six.int2byte(i) * i, b"salt") for i in range(10)]
+        assert derive_many(
+            hashes.SHA1(), 20, 10, pairs, default_backend(), workers=workers
+        ) == self._expected(pairs)
+
+    def test_progress(self, monkeypatch):
+        monkeypatch.setattr(utils, "_cpu_count", lambda: 2)
+        calls = []
+        pairs = [(b"password", b"salt")] * 5
+        derive_many(
+            hashes.SHA1(), 20, 10, pairs, default_backend(),
+            progress=lambda done, total: calls.append((done, total))
+        )
+        assert calls == [(1, 5), (2, 5), (3, 5), (4, 5), (5, 5)]
+
+    def test_empty(self):
+        assert derive_many(hashes.SHA1(), 20, 10, [], default_backend()) == []
+
+    def test_invalid_workers(self):
+        with pytest.raises(TypeError):
+            derive_many(hashes.SHA1(), 20, 10, [], default_backend(), "2")
+        with pytest.raises(ValueError):
+            derive_many(hashes.SHA1(), 20, 10, [], default_backend(), 0)
+
+    def test_unsupported_algorithm(self):
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            derive_many(DummyHash(), 20, 10, [], default_backend())
+
+    def test_length_limit(self):
+        with pytest.raises(ValueError):
+            derive_many(
+                hashes.SHA1(), (2 ** 32 - 1) * 20 + 1, 10,
+                [(b"password", b"salt")], default_backend()
+            )
+
+    def test_unicode_error(self):
+        with pytest.raises(TypeError):
+            derive_many(
+                hashes.SHA1(), 20, 10, [(six.u("pw"), b"salt")],
+                default_backend()
+            )
+        with pytest.raises(TypeError):
+            derive_many(
+                hashes.SHA1(), 20, 10, [(b"pw", six.u("salt"))],
+                default_backend()
+            )
+
+
 def test_invalid_backend():
     pretend_backend = object()
 
     with raises_unsupported_algorithm(_Reasons.BACKEND_MISSING_INTERFACE):
         PBKDF2HMAC(hashes.SHA1(), 20, b"salt", 10, pretend_backend)
+
+    with raises_unsupported_algorithm(_Reasons.BACKEND_MISSING_INTERFACE):
+        derive_many(hashes.SHA1(), 20, 10, [], pretend_backend)
+
+    with raises_unsupported_algorithm(_Reasons.BACKEND_MISSING_INTERFACE):
+        PBKDF2HMAC.calibrate(hashes.SHA1(), 20, 1, pretend_backend)
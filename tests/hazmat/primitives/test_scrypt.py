@@ -0,0 +1,125 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import binascii
+
+import pytest
+
+import six
+
+from cryptography.exceptions import AlreadyFinalized, InvalidKey, _Reasons
+from cryptography.hazmat.backends.interfaces import ScryptBackend
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt, _DEFAULT_MAXMEM
+
+from ...utils import (
+    load_nist_vectors, load_vectors_from_file, raises_unsupported_algorithm
+)
+
+vectors = load_vectors_from_file("KDF/scrypt.txt", load_nist_vectors)
+
+
+def _memory(params):
+    n, r, p = int(params["n"]), int(params["r"]), int(params["p"])
+    return 128 * r * (n + 2) + 128 * r * p
+
+
+def _derive(params, backend, maxmem=None):
+    scrypt = Scrypt(
+        params["salt"], int(params["length"]), int(params["n"]),
+        int(params["r"]), int(params["p"]), backend, maxmem
+    )
+    return scrypt.derive(params["password"])
+
+
+@pytest.mark.requires_backend_interface(interface=ScryptBackend)
+class TestScrypt(object):
+    @pytest.mark.supported(
+        only_if=lambda backend: backend.scrypt_supported(),
+        skip_message="Does not support scrypt",
+    )
+    @pytest.mark.parametrize(
+        "params",
+        [v for v in vectors if _memory(v) <= _DEFAULT_MAXMEM]
+    )
+    def test_derive(self, backend, params):
+        derived_key = binascii.unhexlify(params["derived_key"])
+        assert _derive(params, backend) == derived_key
+
+        scrypt = Scrypt(
+            params["salt"], int(params["length"]), int(params["n"]),
+            int(params["r"]), int(params["p"]), backend
+        )
+        scrypt.verify(params["password"], derived_key)
+
+    def test_maxmem(self, backend):
+        params = vectors[1]
+        with pytest.raises(ValueError):
+            _derive(params, backend, _memory(params) - 1)
+        with pytest.raises(ValueError):
+            Scrypt(b"salt", 64, 2 ** 20, 8, 1, backend)
+        with pytest.raises(TypeError):
+            Scrypt(b"salt", 64, 1024, 8, 1, backend, "1024")
+
+    @pytest.mark.parametrize("n", [0, 1, 3, 1000])
+    def test_invalid_n(self, backend, n):
+        with pytest.raises(ValueError):
+            Scrypt(b"salt", 64, n, 8, 1, backend)
+
+    def test_invalid_n_for_r(self, backend):
+        Scrypt(b"salt", 64, 2 ** 15, 1, 1, backend)
+        with pytest.raises(ValueError):
+            Scrypt(b"salt", 64, 2 ** 16, 1, 1, backend)
+
+    def test_invalid_r_p(self, backend):
+        with pytest.raises(ValueError):
+            Scrypt(b"salt", 64, 1024, 0, 1, backend)
+        with pytest.raises(ValueError):
+            Scrypt(b"salt", 64, 1024, 8, 0, backend)
+
+    def test_non_integer_parameters(self, backend):
+        with pytest.raises(TypeError):
+            Scrypt(b"salt", 64, 1024.0, 8, 1, backend)
+        with pytest.raises(TypeError):
+            Scrypt(b"salt", 64, 1024, 8, "1", backend)
+
+    @pytest.mark.supported(
+        only_if=lambda backend: backend.scrypt_supported(),
+        skip_message="Does not support scrypt",
+    )
+    def test_already_finalized(self, backend):
+        scrypt = Scrypt(b"salt", 64, 1024, 8, 1, backend)
+        key = scrypt.derive(b"password")
+        with pytest.raises(AlreadyFinalized):
+            scrypt.derive(b"password")
+        with pytest.raises(AlreadyFinalized):
+            scrypt.verify(b"password", key)
+
+    @pytest.mark.supported(
+        only_if=lambda backend: backend.scrypt_supported(),
+        skip_message="Does not support scrypt",
+    )
+    def test_invalid_verify(self, backend):
+        scrypt = Scrypt(b"salt", 64, 1024, 8, 1, backend)
+        key = scrypt.derive(b"password")
+
+        scrypt = Scrypt(b"salt", 64, 1024, 8, 1, backend)
+        with pytest.raises(InvalidKey):
+            scrypt.verify(b"password2", key)
+
+    def test_unicode_error(self, backend):
+        with pytest.raises(TypeError):
+            Scrypt(six.u("salt"), 64, 1024, 8, 1, backend)
+
+        scrypt = Scrypt(b"salt", 64, 1024, 8, 1, backend)
+        with pytest.raises(TypeError):
+            scrypt.derive(six.u("password"))
+
+
+def test_invalid_backend():
+    pretend_backend = object()
+
+    with raises_unsupported_algorithm(_Reasons.BACKEND_MISSING_INTERFACE):
+        Scrypt(b"salt", 64, 1024, 8, 1, pretend_backend)
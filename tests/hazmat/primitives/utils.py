@@ -159,6 +159,9 @@ def hash_test(backend, algorithm, params):
     m.update(binascii.unhexlify(msg))
     expected_md = md.replace(" ", "").lower().encode("ascii")
     assert m.finalize() == binascii.unhexlify(expected_md)
+    assert hashes.digest(
+        algorithm, binascii.unhexlify(msg), backend
+    ) == binascii.unhexlify(expected_md)
 
 
 def generate_base_hash_test(algorithm, digest_size, block_size):
@@ -271,6 +274,8 @@ def aead_exception_test(backend, cipher_factory, mode_factory):
         encryptor.authenticate_additional_data(b"b" * 16)
     with pytest.raises(AlreadyFinalized):
         encryptor.update(b"b" * 16)
+    with pytest.raises(AlreadyFinalized):
+        encryptor.update_into(b"b" * 16, bytearray(31))
     with pytest.raises(AlreadyFinalized):
         encryptor.finalize()
     cipher = Cipher(
@@ -62,6 +62,30 @@ class TestFernet(object):
         )
         assert actual_token == token.encode("ascii")
 
+    @json_parametrize(
+        ("secret", "now", "iv", "src", "token"), "generate.json",
+    )
+    def test_generate_without_cbc_hmac(self, secret, now, iv, src, token,
+                                       backend):
+        f = Fernet(secret.encode("ascii"), backend=backend)
+        f._cbc_hmac = False
+        actual_token = f._encrypt_from_parts(
+            src.encode("ascii"),
+            calendar.timegm(iso8601.parse_date(now).utctimetuple()),
+            b"".join(map(six.int2byte, iv))
+        )
+        assert actual_token == token.encode("ascii")
+
+    @pytest.mark.parametrize("size", [0, 1, 15, 16, 17, 100000])
+    def test_cbc_hmac_matches_fallback(self, backend, size):
+        f = Fernet(Fernet.generate_key(), backend=backend)
+        data = os.urandom(size)
+        iv = os.urandom(16)
+        token = f._encrypt_from_parts(data, 1234567890, iv)
+        f._cbc_hmac = False
+        assert f._encrypt_from_parts(data, 1234567890, iv) == token
+        assert f.decrypt(token) == data
+
     @json_parametrize(
         ("secret", "now", "src", "ttl_sec", "token"), "verify.json",
     )